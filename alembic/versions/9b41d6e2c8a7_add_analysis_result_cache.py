@@ -0,0 +1,36 @@
+"""Add analysis result cache
+
+Revision ID: 9b41d6e2c8a7
+Revises: 3f2c7a9d1b64
+Create Date: 2026-10-17 11:03:27.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9b41d6e2c8a7'
+down_revision: Union[str, None] = '3f2c7a9d1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analysis_results',
+        sa.Column('media_sha256', sa.String(), nullable=False),
+        sa.Column('analyzer', sa.String(), nullable=False),
+        sa.Column('model_version', sa.String(), nullable=False),
+        sa.Column('result', sa.String(), nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=False),
+        sa.Column('last_accessed_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('media_sha256', 'analyzer', 'model_version'),
+    )
+    op.create_index(op.f('ix_analysis_results_last_accessed_at'), 'analysis_results', ['last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analysis_results_last_accessed_at'), table_name='analysis_results')
+    op.drop_table('analysis_results')
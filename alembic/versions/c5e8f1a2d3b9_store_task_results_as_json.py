@@ -0,0 +1,63 @@
+"""Store task results as JSON
+
+Revision ID: c5e8f1a2d3b9
+Revises: 9b41d6e2c8a7
+Create Date: 2026-10-17 13:42:11.318406
+
+Task results used to be saved as str(dict), a Python repr. Existing rows are
+converted to JSON: reprs are parsed with ast.literal_eval (NumPy scalar reprs
+such as np.float32(0.5) are unwrapped first), valid JSON is kept as is, and
+anything else (error messages) becomes {"error": <text>}.
+
+"""
+import ast
+import json
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c5e8f1a2d3b9'
+down_revision: Union[str, None] = '9b41d6e2c8a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_NUMPY_SCALAR = re.compile(r"np\.\w+\(([^()]*)\)")
+
+
+def _to_json(text):
+    if text is None:
+        return None
+    try:
+        return json.dumps(json.loads(text))
+    except ValueError:
+        pass
+    try:
+        value = ast.literal_eval(_NUMPY_SCALAR.sub(r"\1", text))
+        if isinstance(value, dict):
+            return json.dumps(value, default=str)
+    except (ValueError, SyntaxError):
+        pass
+    return json.dumps({"error": text})
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    tasks = sa.table('tasks', sa.column('id', sa.Integer), sa.column('result', sa.String))
+
+    rows = connection.execute(sa.select(tasks.c.id, tasks.c.result).where(tasks.c.result.isnot(None))).fetchall()
+    for task_id, text in rows:
+        converted = _to_json(text)
+        if converted != text:
+            connection.execute(tasks.update().where(tasks.c.id == task_id).values(result=converted))
+
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('result', existing_type=sa.String(), type_=sa.JSON(), existing_nullable=True,
+                              postgresql_using='result::json')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('result', existing_type=sa.JSON(), type_=sa.String(), existing_nullable=True)
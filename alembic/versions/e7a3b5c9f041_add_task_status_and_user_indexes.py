@@ -0,0 +1,33 @@
+"""Add task status and user indexes
+
+Revision ID: e7a3b5c9f041
+Revises: c5e8f1a2d3b9
+Create Date: 2026-10-17 14:25:08.663170
+
+Workers poll for the oldest queued task (status = 'queued' ORDER BY id) and
+listings page by id within a status or user, so both get a composite index.
+(user_id, id) also serves lookups by user_id alone, replacing ix_tasks_user_id.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e7a3b5c9f041'
+down_revision: Union[str, None] = 'c5e8f1a2d3b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_status_id', 'tasks', ['status', 'id'], unique=False)
+    op.create_index('ix_tasks_user_id_id', 'tasks', ['user_id', 'id'], unique=False)
+    op.drop_index('ix_tasks_user_id', table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index('ix_tasks_user_id', 'tasks', ['user_id'], unique=False)
+    op.drop_index('ix_tasks_user_id_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_id', table_name='tasks')
@@ -1 +1,129 @@
+import os
 
+# Eye-tracking inference batching
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))  # Windows per model call
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))  # Max time a window waits for a batch to fill
+
+# Eye-tracking windowing
+# "streaming" (the original per-window path), "vectorized", "pipelined" or "process_pool".
+# Streaming stays the default until the other modes are shown to give the same scores.
+VIDEO_PROCESSING_MODE = os.getenv("VIDEO_PROCESSING_MODE", "streaming")
+VIDEO_WINDOW_STRIDE = int(os.getenv("VIDEO_WINDOW_STRIDE", "0"))  # Frames between window starts, 0 = window length (no overlap)
+VIDEO_PAD_LAST_WINDOW = os.getenv("VIDEO_PAD_LAST_WINDOW", "false").lower() in ("1", "true", "yes")
+
+# Pipelined video processing (VIDEO_PROCESSING_MODE=pipelined)
+VIDEO_DECODE_WORKERS = int(os.getenv("VIDEO_DECODE_WORKERS", "1"))
+VIDEO_LANDMARK_WORKERS = int(os.getenv("VIDEO_LANDMARK_WORKERS", "2"))
+VIDEO_SCORING_WORKERS = int(os.getenv("VIDEO_SCORING_WORKERS", "2"))
+VIDEO_PIPELINE_QUEUE_SIZE = int(os.getenv("VIDEO_PIPELINE_QUEUE_SIZE", "64"))  # Capacity of each inter-stage queue
+
+# Multi-process video processing (VIDEO_PROCESSING_MODE=process_pool)
+VIDEO_POOL_WORKERS = int(os.getenv("VIDEO_POOL_WORKERS", "0"))  # 0 = one worker per CPU core
+VIDEO_POOL_SEGMENT_FRAMES = int(os.getenv("VIDEO_POOL_SEGMENT_FRAMES", "3000"))  # Split longer videos into segments of this many frames, 0 = never split
+
+# Startup and readiness
+# Comma-separated components from app.services.warmup.COMPONENTS
+WARMUP_ON_STARTUP = [name for name in os.getenv("WARMUP_ON_STARTUP", "").split(",") if name]  # Warmed in the background at startup
+READINESS_COMPONENTS = [name for name in os.getenv("READINESS_COMPONENTS", "").split(",") if name]  # Must be warm before /health/ready succeeds
+
+# IPA transcription cache
+IPA_CACHE_SIZE = int(os.getenv("IPA_CACHE_SIZE", "50000"))  # Distinct words kept in the LRU cache
+IPA_PRECOMPUTE_ON_STARTUP = os.getenv("IPA_PRECOMPUTE_ON_STARTUP", "true").lower() in ("1", "true", "yes")  # Transcribe built-in vocabularies in the background at startup
+
+# Speech recognition (app.services.speech_service)
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "google")  # google (remote), sphinx (offline, needs pocketsphinx) or stub
+SPEECH_LANGUAGE = os.getenv("SPEECH_LANGUAGE", "en-US")
+SPEECH_TIMEOUT = float(os.getenv("SPEECH_TIMEOUT", "15"))  # Seconds allowed per recognizer call
+SPEECH_MAX_CONCURRENCY = int(os.getenv("SPEECH_MAX_CONCURRENCY", "4"))  # Recognizer calls in flight across all requests
+SPEECH_SEGMENT_SECONDS = float(os.getenv("SPEECH_SEGMENT_SECONDS", "15"))  # Longer recordings are split at pauses into segments up to this long
+SPEECH_MIN_SILENCE_MS = int(os.getenv("SPEECH_MIN_SILENCE_MS", "300"))  # Shortest pause to split at
+SPEECH_SILENCE_DB = float(os.getenv("SPEECH_SILENCE_DB", "-35"))  # Frames this far below the loudest frame are silence
+SPEECH_STUB_TRANSCRIPT = os.getenv("SPEECH_STUB_TRANSCRIPT", "")  # What the stub backend "hears" in every segment
+
+# Audio preprocessing before speech recognition (app.services.audio_enhancement)
+AUDIO_ENHANCEMENT = os.getenv("AUDIO_ENHANCEMENT", "true").lower() in ("1", "true", "yes")  # Trim, gate and normalize recordings before recognition
+AUDIO_TARGET_DBFS = float(os.getenv("AUDIO_TARGET_DBFS", "-20"))  # RMS level recordings are normalized to
+AUDIO_VAD_DB = float(os.getenv("AUDIO_VAD_DB", "-35"))  # Frames this far below the loudest frame count as silence when trimming
+AUDIO_NOISE_GATE_DB = float(os.getenv("AUDIO_NOISE_GATE_DB", "6"))  # Frames within this many dB of the noise floor are muted
+
+# Phonetic codes (app.utils.phonetic_encoding)
+PHONETIC_CACHE_SIZE = int(os.getenv("PHONETIC_CACHE_SIZE", "200000"))  # (algorithm, word) codes kept in the LRU cache
+
+# Task workers (python -m app.worker)
+TASK_LEASE_SECONDS = float(os.getenv("TASK_LEASE_SECONDS", "120"))  # A task is requeued if its worker misses heartbeats this long
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "3"))  # Claims before a task with expiring leases is marked failed
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))  # Seconds an idle worker waits before polling again
+TASK_CLAIM_BATCH_SIZE = int(os.getenv("TASK_CLAIM_BATCH_SIZE", "1"))  # Tasks a worker claims at once; raise for backlogs of short tasks
+TASK_WRITE_BEHIND = os.getenv("TASK_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")  # Buffer task outcomes and write them in batches
+TASK_WRITE_BEHIND_MAX_DELAY = float(os.getenv("TASK_WRITE_BEHIND_MAX_DELAY", "0.5"))  # Longest an outcome waits in the buffer (seconds)
+TASK_PARTIAL_RESULTS = os.getenv("TASK_PARTIAL_RESULTS", "true").lower() in ("1", "true", "yes")  # Save each analysis's result as soon as it finishes
+MODALITY_WORKERS = int(os.getenv("MODALITY_WORKERS", "8"))  # Threads running blocking analyses (eye tracking, speech) across all tasks
+# Seconds each analysis of a task may take before it is reported as timed out
+MODALITY_TIMEOUTS = {
+    "video_analysis": float(os.getenv("VIDEO_ANALYSIS_TIMEOUT", "900")),
+    "phonetics_analysis": float(os.getenv("PHONETICS_ANALYSIS_TIMEOUT", "300")),
+    "handwriting_analysis": float(os.getenv("HANDWRITING_ANALYSIS_TIMEOUT", "180")),
+}
+
+# In-process task queue (app.services.queue_handler)
+TASK_QUEUE_WORKERS = int(os.getenv("TASK_QUEUE_WORKERS", "4"))  # Worker threads shared by all users
+TASK_QUEUE_MAX_DEPTH = int(os.getenv("TASK_QUEUE_MAX_DEPTH", "1000"))  # Queued tasks across all users before new ones are rejected
+
+# Task progress streaming (app.services.progress, GET /queue/{task_id}/events)
+PROGRESS_SUBSCRIBER_QUEUE = int(os.getenv("PROGRESS_SUBSCRIBER_QUEUE", "256"))  # Events buffered per client; the oldest are dropped for clients that fall behind
+PROGRESS_HISTORY_TASKS = int(os.getenv("PROGRESS_HISTORY_TASKS", "10000"))  # Tasks whose latest events are kept for clients that connect late
+PROGRESS_MIN_INTERVAL = float(os.getenv("PROGRESS_MIN_INTERVAL", "0.25"))  # Seconds between repeated events of a task (frames_decoded, windows_scored)
+PROGRESS_POLL_INTERVAL = float(os.getenv("PROGRESS_POLL_INTERVAL", "1"))  # Seconds between the shared database checks of tasks run by standalone workers
+PROGRESS_HEARTBEAT_SECONDS = float(os.getenv("PROGRESS_HEARTBEAT_SECONDS", "15"))  # Keep-alive comment interval on idle streams
+
+# Uploads
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))  # Larger uploads are rejected with 413
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))  # Read/hash/write granularity
+UPLOAD_STORE_DIR = os.getenv("UPLOAD_STORE_DIR", "app/data/uploads/objects")  # Content-addressed upload store
+
+# Analysis result cache, keyed by (media hash, analyzer, model version)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))  # Least recently used entries are evicted beyond this
+# Bump a version to invalidate cached results after changing that analyzer or its model
+ANALYZER_VERSIONS = {
+    "eye_tracking": os.getenv("EYE_TRACKING_MODEL_VERSION", "lstm-v1"),
+    # The recognizer backend and the audio preprocessing both change transcripts
+    "phonetics": os.getenv("PHONETICS_MODEL_VERSION", f"{SPEECH_BACKEND}-asr-v2{'-enhanced' if AUDIO_ENHANCEMENT else ''}"),
+    "handwriting_api": os.getenv("HANDWRITING_API_MODEL_VERSION", "classify-page-v1"),
+    # OCR preprocessing changes the recognized text; features-v3 adds phonetic_similarity
+    "handwriting_local": os.getenv("HANDWRITING_LOCAL_MODEL_VERSION", "ocr-v2-features-v3"),
+}
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app/data/database.db")  # e.g. postgresql+psycopg2://user:pass@db:5432/detection
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "true").lower() in ("1", "true", "yes")  # Run alembic migrations when the API or a worker starts
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # Connections kept open per process
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # Extra connections allowed under load
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Reconnect connections older than this (seconds)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # WAL lets readers run alongside the writer
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL is safe with WAL and avoids an fsync per commit
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # Wait this long for a lock instead of failing
+
+# External handwriting classification API (app.services.handwriting_api)
+HANDWRITING_API_URL = os.getenv("HANDWRITING_API_URL", "https://api.athul.live/classify-page/")
+HANDWRITING_API_TIMEOUT = float(os.getenv("HANDWRITING_API_TIMEOUT", "30"))  # Seconds per attempt
+HANDWRITING_API_CONNECT_TIMEOUT = float(os.getenv("HANDWRITING_API_CONNECT_TIMEOUT", "5"))
+HANDWRITING_API_MAX_CONCURRENCY = int(os.getenv("HANDWRITING_API_MAX_CONCURRENCY", "8"))  # Requests in flight (and pooled connections)
+HANDWRITING_API_RETRIES = int(os.getenv("HANDWRITING_API_RETRIES", "3"))  # Retries after a timeout, connection error, 429 or 5xx
+HANDWRITING_API_BACKOFF = float(os.getenv("HANDWRITING_API_BACKOFF", "0.5"))  # Base of the jittered exponential backoff (seconds)
+HANDWRITING_API_BACKOFF_MAX = float(os.getenv("HANDWRITING_API_BACKOFF_MAX", "8"))
+HANDWRITING_API_BREAKER_THRESHOLD = int(os.getenv("HANDWRITING_API_BREAKER_THRESHOLD", "5"))  # Consecutive failed requests before failing fast
+HANDWRITING_API_BREAKER_RESET = float(os.getenv("HANDWRITING_API_BREAKER_RESET", "30"))  # Seconds to fail fast before trying again
+
+# Handwriting features (app.services.handwriting_processing)
+HANDWRITING_MAX_DIMENSION = int(os.getenv("HANDWRITING_MAX_DIMENSION", "2000"))  # Longer images are downsampled first; 0 keeps full resolution
+
+# OCR (app.services.ocr_service)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))  # Long-lived OCR engines, one page each at a time
+OCR_PREPROCESSING = [step for step in os.getenv("OCR_PREPROCESSING", "grayscale,deskew,crop,threshold").split(",") if step]  # Applied in order before OCR
+OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")
+OCR_TESSERACT_CONFIG = os.getenv("OCR_TESSERACT_CONFIG", "")  # e.g. "--psm 6"
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", "1024"))  # Pages whose text is kept, keyed by image hash
+
+# Text analysis (app.utils.text_analysis)
+TEXT_CORRECTION_CACHE_SIZE = int(os.getenv("TEXT_CORRECTION_CACHE_SIZE", "50000"))  # Distinct words whose spelling correction is kept
@@ -1,33 +1,62 @@
+import time
+from typing import Iterable, List, Tuple
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
+from app.config import TASK_LEASE_SECONDS, TASK_MAX_ATTEMPTS
 from app.db.models import Task
+from app.db.schemas import task_result
 
-def create_task(db: Session, user_id: str, video_path: str = None, audio_path: str = None, handwriting_image_path: str = None):
+def create_task(
+    db: Session,
+    user_id: str,
+    video_path: str = None,
+    audio_path: str = None,
+    handwriting_image_path: str = None,
+    status: str = "queued",
+    result: dict = None,
+):
     """
-    Add a new task to the database.
+    Add a new task to the database. Tasks whose result is already known are
+    created with status "completed" and their result, so no worker claims them.
     """
     task = Task(
         user_id=user_id,
         video_path=video_path,
         audio_path=audio_path,
         handwriting_image_path=handwriting_image_path,
-        status="queued"
+        status=status,
+        result=result,
     )
     db.add(task)
     db.commit()
     db.refresh(task)
     return task
 
-def update_task_status(db: Session, task_id: int, status: str, result: str = None):
+def update_task_status(db: Session, task_id: int, status: str, result: dict = None) -> bool:
     """
-    Update the status and result of a task.
+    Update the status and result of a task in a single statement. `result` is a
+    dict built with app.db.schemas.task_result. Returns False if there is no such task.
     """
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if task:
-        task.status = status
-        task.result = result
-        db.commit()
-        db.refresh(task)
-    return task
+    updated = db.query(Task).filter(Task.id == task_id).update(
+        {Task.status: status, Task.result: result}, synchronize_session=False
+    )
+    db.commit()
+    return bool(updated)
+
+def update_tasks_status(db: Session, updates: Iterable[Tuple[int, str, dict]]) -> int:
+    """
+    Apply many (task_id, status, result) updates in one transaction.
+    """
+    params = [{"task_id": task_id, "new_status": status, "new_result": result} for task_id, status, result in updates]
+    if not params:
+        return 0
+    tasks = Task.__table__
+    statement = update(tasks).where(tasks.c.id == bindparam("task_id")).values(
+        status=bindparam("new_status"), result=bindparam("new_result")
+    )
+    updated = db.execute(statement, params).rowcount
+    db.commit()
+    return updated
 
 def get_all_tasks(db: Session):
     """
@@ -46,3 +75,210 @@ def get_task_by_id(db: Session, task_id: int):
     Retrieve a specific task by its ID.
     """
     return db.query(Task).filter(Task.id == task_id).first()
+
+def get_task_states(db: Session, task_ids: Iterable[int]) -> List[Tuple[int, str, dict]]:
+    """
+    (id, status, result) of many tasks in one query.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return []
+    rows = db.execute(select(Task.id, Task.status, Task.result).where(Task.id.in_(task_ids))).all()
+    return [(row.id, row.status, row.result) for row in rows]
+
+def claim_tasks(db: Session, worker_id: str, limit: int = 1, lease_seconds: float = TASK_LEASE_SECONDS) -> List[Task]:
+    """
+    Atomically claim up to `limit` of the oldest queued tasks for a worker and lease them.
+
+    The claim is one conditional UPDATE (compare-and-set on status) over the
+    oldest queued ids, returning the claimed rows. On PostgreSQL the candidate
+    rows are locked with SKIP LOCKED, so concurrent workers claim disjoint
+    batches instead of waiting on each other; on SQLite writers are serialized
+    anyway. Returns an empty list when the queue is empty.
+
+    The claimed tasks are detached from the session before the commit, so they
+    keep the values read by the claim instead of being reloaded one by one.
+    """
+    expires_at = time.time() + lease_seconds
+    candidates = (
+        select(Task.id)
+        .where(Task.status == "queued")
+        .order_by(Task.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(Task)
+        .where(Task.id.in_(candidates.scalar_subquery()), Task.status == "queued")
+        .values(
+            status="processing",
+            lease_owner=worker_id,
+            lease_expires_at=expires_at,
+            attempts=Task.attempts + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if db.get_bind().dialect.update_returning:
+        claimed = db.scalars(statement.returning(Task)).all()
+    else:
+        # No UPDATE ... RETURNING (SQLite < 3.35): read back what this claim took
+        db.execute(statement)
+        claimed = db.query(Task).filter(
+            Task.status == "processing", Task.lease_owner == worker_id, Task.lease_expires_at == expires_at
+        ).all()
+    for task in claimed:
+        db.expunge(task)
+    db.commit()
+    return sorted(claimed, key=lambda task: task.id)
+
+def claim_next_task(db: Session, worker_id: str, lease_seconds: float = TASK_LEASE_SECONDS):
+    """
+    Atomically claim the oldest queued task for a worker and lease it.
+    Returns None when the queue is empty.
+    """
+    claimed = claim_tasks(db, worker_id, 1, lease_seconds)
+    return claimed[0] if claimed else None
+
+def heartbeat_task(db: Session, task_id: int, worker_id: str, lease_seconds: float = TASK_LEASE_SECONDS) -> bool:
+    """
+    Extend a worker's lease on a task. Returns False if the lease was lost.
+    """
+    return heartbeat_tasks(db, [task_id], worker_id, lease_seconds) == 1
+
+def heartbeat_tasks(db: Session, task_ids: Iterable[int], worker_id: str, lease_seconds: float = TASK_LEASE_SECONDS) -> int:
+    """
+    Extend a worker's leases on several tasks at once. Returns how many are still held.
+    """
+    extended = db.query(Task).filter(
+        Task.id.in_(list(task_ids)), Task.status == "processing", Task.lease_owner == worker_id
+    ).update({Task.lease_expires_at: time.time() + lease_seconds}, synchronize_session=False)
+    db.commit()
+    return extended
+
+def finish_task(db: Session, task_id: int, worker_id: str, status: str, result: dict = None) -> bool:
+    """
+    Record the outcome of a leased task and release the lease.
+    Ignored (returns False) if the worker no longer holds the lease.
+    """
+    finished = db.query(Task).filter(
+        Task.id == task_id, Task.status == "processing", Task.lease_owner == worker_id
+    ).update(
+        {Task.status: status, Task.result: result, Task.lease_owner: None, Task.lease_expires_at: None},
+        synchronize_session=False,
+    )
+    db.commit()
+    return bool(finished)
+
+def save_partial_result(db: Session, task_id: int, worker_id: str, result: dict) -> bool:
+    """
+    Store the results of the analyses that have finished for a leased task
+    while the others are still running. The task stays in processing.
+    Ignored (returns False) if the worker no longer holds the lease.
+    """
+    saved = db.query(Task).filter(
+        Task.id == task_id, Task.status == "processing", Task.lease_owner == worker_id
+    ).update({Task.result: result}, synchronize_session=False)
+    db.commit()
+    return bool(saved)
+
+def finish_tasks(db: Session, worker_id: str, outcomes: Iterable[Tuple[int, str, dict]]) -> int:
+    """
+    Record many (task_id, status, result) outcomes of leased tasks in one
+    transaction and release their leases. Tasks whose lease the worker no
+    longer holds are skipped. Returns the number of tasks finished.
+    """
+    params = [{"task_id": task_id, "new_status": status, "new_result": result} for task_id, status, result in outcomes]
+    if not params:
+        return 0
+    tasks = Task.__table__
+    statement = (
+        update(tasks)
+        .where(tasks.c.id == bindparam("task_id"), tasks.c.status == "processing", tasks.c.lease_owner == worker_id)
+        .values(status=bindparam("new_status"), result=bindparam("new_result"), lease_owner=None, lease_expires_at=None)
+    )
+    finished = db.execute(statement, params).rowcount
+    db.commit()
+    return finished
+
+def release_tasks(db: Session, task_ids: Iterable[int], worker_id: str) -> int:
+    """
+    Put claimed tasks the worker will not process back in the queue, without
+    counting the claim as an attempt.
+    """
+    released = db.query(Task).filter(
+        Task.id.in_(list(task_ids)), Task.status == "processing", Task.lease_owner == worker_id
+    ).update(
+        {Task.status: "queued", Task.lease_owner: None, Task.lease_expires_at: None, Task.attempts: Task.attempts - 1},
+        synchronize_session=False,
+    )
+    db.commit()
+    return released
+
+def requeue_expired_leases(db: Session, max_attempts: int = TASK_MAX_ATTEMPTS) -> int:
+    """
+    Put tasks whose worker stopped heartbeating back in the queue.
+    Tasks that already used all their attempts are marked failed instead.
+    Returns the number of tasks requeued.
+    """
+    now = time.time()
+    expired = (Task.status == "processing", Task.lease_expires_at < now)
+
+    db.query(Task).filter(*expired, Task.attempts >= max_attempts).update(
+        {
+            Task.status: "failed",
+            Task.result: task_result(error="Lease expired too many times"),
+            Task.lease_owner: None,
+            Task.lease_expires_at: None,
+        },
+        synchronize_session=False,
+    )
+    requeued = db.query(Task).filter(*expired).update(
+        {Task.status: "queued", Task.lease_owner: None, Task.lease_expires_at: None},
+        synchronize_session=False,
+    )
+    db.commit()
+    return requeued
+
+# Columns returned by task listings unless others are requested; `result` can be
+# large, so it is only loaded on request
+TASK_LIST_COLUMNS = ("id", "user_id", "video_path", "audio_path", "handwriting_image_path", "status")
+TASK_COLUMNS = TASK_LIST_COLUMNS + ("result", "lease_owner", "lease_expires_at", "attempts")
+
+def list_tasks(
+    db: Session,
+    status: str = None,
+    user_id: str = None,
+    after_id: int = None,
+    limit: int = 100,
+    columns=TASK_LIST_COLUMNS,
+):
+    """
+    One page of tasks in id order, as rows holding only the requested columns.
+
+    Pagination is keyset based: pass the id of the last task of the previous page
+    as `after_id`. Unlike OFFSET, every page costs the same however deep it is.
+    """
+    query = db.query(*(getattr(Task, column) for column in columns))
+    if status is not None:
+        query = query.filter(Task.status == status)
+    if user_id is not None:
+        query = query.filter(Task.user_id == user_id)
+    if after_id is not None:
+        query = query.filter(Task.id > after_id)
+    return query.order_by(Task.id).limit(limit).all()
+
+def iter_tasks(db: Session, status: str = None, user_id: str = None, columns=TASK_LIST_COLUMNS, batch_size: int = 500):
+    """
+    Yield every matching task, fetched in keyset-paginated batches so memory
+    use does not grow with the size of the table.
+    """
+    if "id" not in columns:
+        columns = ("id",) + tuple(columns)
+    after_id = None
+    while True:
+        rows = list_tasks(db, status, user_id, after_id, batch_size, columns)
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1].id
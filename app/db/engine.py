@@ -0,0 +1,86 @@
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+from app.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+)
+
+
+def _sqlite_pragmas(journal_mode: str, synchronous: str):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+    return set_pragmas
+
+
+def create_db_engine(
+    url: str = DATABASE_URL,
+    sqlite_journal_mode: str = SQLITE_JOURNAL_MODE,
+    sqlite_synchronous: str = SQLITE_SYNCHRONOUS,
+) -> Engine:
+    """
+    Create the engine for `url`, tuned for its backend.
+
+    SQLite: connections may be shared across threads, and every connection is
+    switched to WAL with synchronous=NORMAL (by default) and a busy timeout, so readers never
+    block the writer and concurrent workers wait for locks instead of failing.
+    In-memory databases use a single shared connection.
+
+    Other backends (PostgreSQL in production): a bounded connection pool,
+    recycled periodically and checked before use.
+    """
+    parsed = make_url(url)
+
+    if parsed.get_backend_name() == "sqlite":
+        database = parsed.database
+        if not database or database == ":memory:":
+            return create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+        directory = os.path.dirname(database)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+        event.listen(engine, "connect", _sqlite_pragmas(sqlite_journal_mode, sqlite_synchronous))
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+def run_migrations(url: str = DATABASE_URL):
+    """
+    Bring the database schema up to date with `alembic upgrade head`.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    config = Config(os.path.join(root, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(root, "alembic"))
+    config.attributes["database_url"] = url
+    # Keep the application's logging configuration
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
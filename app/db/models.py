@@ -1,22 +1,46 @@
-from sqlalchemy import Column, Integer, String, Float, create_engine
+from sqlalchemy import JSON, Column, Index, Integer, String, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from app.config import DATABASE_URL
+from app.db.engine import create_db_engine, run_migrations
 
 Base = declarative_base()
 
-DATABASE_URL = "sqlite:///./app/data/database.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Queue polling and listings filter on status/user and page by id
+        Index("ix_tasks_status_id", "status", "id"),
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)
     video_path = Column(String)
     audio_path = Column(String)
     handwriting_image_path = Column(String)
     status = Column(String, default="queued")  # queued, processing, completed, failed
-    result = Column(String, nullable=True)
+    result = Column(JSON(none_as_null=True), nullable=True)  # TaskResult (app.db.schemas)
+    lease_owner = Column(String, nullable=True)  # Worker currently processing the task
+    lease_expires_at = Column(Float, nullable=True)  # Unix time after which the task can be reclaimed
+    attempts = Column(Integer, default=0, nullable=False)
 
-Base.metadata.create_all(bind=engine)
+class AnalysisResult(Base):
+    """Cached output of one analyzer for one piece of uploaded media."""
+    __tablename__ = "analysis_results"
+
+    media_sha256 = Column(String, primary_key=True)
+    analyzer = Column(String, primary_key=True)  # eye_tracking, phonetics, handwriting_api, handwriting_local
+    model_version = Column(String, primary_key=True)
+    result = Column(String, nullable=False)  # JSON
+    created_at = Column(Float, nullable=False)
+    last_accessed_at = Column(Float, nullable=False, index=True)  # Drives LRU eviction
+
+def init_db():
+    """
+    Create or upgrade the schema by running the alembic migrations.
+    """
+    run_migrations(DATABASE_URL)
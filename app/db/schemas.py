@@ -0,0 +1,58 @@
+import json
+import math
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+def json_default(value):
+    # NumPy scalars and arrays (e.g. np.float32 probabilities) and anything else JSON can't encode
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _finite(value):
+    # NaN and infinity are not valid JSON: stored as null
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_finite(item) for item in value]
+    return value
+
+
+def to_json_compatible(value):
+    """
+    Convert a value to plain JSON types (dict, list, str, int, float, bool, None).
+    Non-finite floats (e.g. the NaN mean of a video too short for one window) become None.
+    """
+    return _finite(json.loads(json.dumps(value, default=json_default)))
+
+
+class TaskResult(BaseModel):
+    """
+    The result stored for a task: one entry per analysis that ran, or the error
+    that stopped the task.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    video_analysis: Optional[Dict[str, Any]] = None
+    phonetics_analysis: Optional[Dict[str, Any]] = None
+    handwriting_analysis: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Analyses still running, while partial results are saved
+    pending: Optional[List[str]] = None
+
+
+def task_result(result: dict = None, error: str = None) -> dict:
+    """
+    Validate a task result (or wrap an error message) and return it as plain JSON
+    types, ready for the Task.result column.
+    """
+    if error is not None:
+        result = {"error": error}
+    validated = TaskResult.model_validate(to_json_compatible(result or {}))
+    return validated.model_dump(exclude_none=True)
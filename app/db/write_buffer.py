@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from app.db.crud import finish_tasks, update_tasks_status
+from app.db.models import SessionLocal
+
+
+class TaskUpdateBuffer:
+    """
+    Write-behind buffer for task status updates.
+
+    Updates are collected in memory and written in one transaction once
+    `max_batch` are pending or the oldest has waited `max_delay` seconds,
+    instead of one commit per task. With a `worker_id` the updates are lease
+    outcomes written with finish_tasks (skipped if the lease was lost);
+    otherwise they are plain status updates.
+
+    Buffered updates are lost if the process dies before they are flushed, or
+    if the write fails; the affected tasks keep their lease, expire and are
+    processed again. Keep `max_delay` well below the lease length.
+
+    `on_flush`, if given, is called with the (task_id, status, result) updates
+    of each batch once it has been written, and not for a batch that failed.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        max_batch: int = 100,
+        max_delay: float = 0.5,
+        session_factory=SessionLocal,
+        on_flush: Optional[Callable[[List[Tuple[int, str, dict]]], None]] = None,
+    ):
+        self.worker_id = worker_id
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.session_factory = session_factory
+        self.on_flush = on_flush
+        self.flushed = 0
+
+        self._pending: List[Tuple[int, str, dict]] = []
+        self._lock = threading.Lock()  # Guards _pending
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="task-update-buffer", daemon=True)
+        self._thread.start()
+
+    def add(self, task_id: int, status: str, result: dict = None):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("TaskUpdateBuffer is closed")
+            self._pending.append((task_id, status, result))
+            full = len(self._pending) >= self.max_batch
+            if len(self._pending) == 1:
+                self._wake.notify()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every pending update now. Returns the number of tasks updated.
+        """
+        with self._flush_lock:
+            with self._lock:
+                updates, self._pending = self._pending, []
+            if not updates:
+                return 0
+
+            db = self.session_factory()
+            try:
+                if self.worker_id is None:
+                    written = update_tasks_status(db, updates)
+                else:
+                    written = finish_tasks(db, self.worker_id, updates)
+            finally:
+                db.close()
+            self.flushed += written
+            if self.on_flush is not None:
+                self.on_flush(updates)
+            return written
+
+    def close(self):
+        """
+        Flush what is pending and stop the background flusher.
+        """
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+            # Give the batch up to max_delay to fill
+            deadline = time.monotonic() + self.max_delay
+            with self._lock:
+                while not self._closed and time.monotonic() < deadline:
+                    self._wake.wait(deadline - time.monotonic())
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to flush task updates: {e}")
@@ -1,11 +1,33 @@
+from contextlib import asynccontextmanager
+import threading
 from fastapi import FastAPI
-from app.routers import detect, queue, process
+from app.config import DB_MIGRATE_ON_STARTUP, IPA_PRECOMPUTE_ON_STARTUP, WARMUP_ON_STARTUP
+from app.db.models import init_db
+from app.routers import detect, queue, process, health, tasks
 from app.routers import handwriting
+from app.services.warmup import warm_up
+from app.utils.ipa_transcription import precompute_reference_transcriptions
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_MIGRATE_ON_STARTUP:
+        init_db()
+
+    # Warm heavy components in the background so the server starts accepting
+    # requests immediately; /health/ready reports when they are loaded
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=warm_up, args=(WARMUP_ON_STARTUP,), daemon=True).start()
+    if IPA_PRECOMPUTE_ON_STARTUP:
+        threading.Thread(target=precompute_reference_transcriptions, daemon=True).start()
+    yield
+
 
 app = FastAPI(
     title="Dyslexia Detection API",
     description="API for detecting dyslexia using video, audio, and questionnaires.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 from app.routers import handwriting
 from app.routers import dictation
@@ -15,9 +37,11 @@ from app.routers import dictation
 # Include routers
 app.include_router(detect.router)
 app.include_router(queue.router)
+app.include_router(tasks.router)
 app.include_router(process.router)
 app.include_router(handwriting.router)
 app.include_router(dictation.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -1,24 +1,20 @@
 from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException, Form
 from app.utils.assesment_logic import cumulative_assessment, normalize_score
 import os
-import tempfile
-import pyttsx3
-import shutil
-from moviepy import VideoFileClip
 from app.services.queue_handler import add_task_to_queue
 from sqlalchemy.orm import Session
 from fastapi import Depends
 from app.db.models import SessionLocal
 from app.db.crud import create_task
+from app.db.schemas import task_result
+from app.services.progress import publish_progress
+from app.services.task_processing import cached_task_result
+from app.utils.file_handler import store_upload
+from starlette.concurrency import run_in_threadpool
 import random
-import speech_recognition as sr
-import eng_to_ipa as ipa
 
 router = APIRouter(prefix="/detect", tags=["Detection"])
 
-BASE_DIR = "app/data/uploads"
-os.makedirs(BASE_DIR, exist_ok=True)  # Ensure the base directory exists
-
 
 # Dependency to get the database session
 def get_db():
@@ -64,10 +60,6 @@ async def detect(
             "assessment": assessment_result,
         }
 
-    # Create user directory
-    user_dir = os.path.join(BASE_DIR, user_id)
-    os.makedirs(user_dir, exist_ok=True)
-
     # Initialize file paths
     video_path = None
     audio_path = None
@@ -78,32 +70,48 @@ async def detect(
         if not video.content_type.startswith("video/"):
             raise HTTPException(status_code=400, detail="Invalid file type. Please upload a video file.")
         
-        video_path = os.path.join(user_dir, video.filename)
-        with open(video_path, "wb") as buffer:
-            shutil.copyfileobj(video.file, buffer)
+        # Uploads are stored by content hash, so re-uploads of the same video share one file
+        video_path = (await store_upload(video))["path"]
 
-        # Extract audio and store it
+        # Audio is extracted to this path when the task is processed
         audio_path = os.path.splitext(video_path)[0] + ".wav"
-        extract_audio(video_path, audio_path)
 
     # Process handwriting image
     if handwriting_image:
         if not handwriting_image.content_type.startswith("image/"):
             raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image file.")
         
-        handwriting_image_path = os.path.join(user_dir, handwriting_image.filename)
-        with open(handwriting_image_path, "wb") as buffer:
-            shutil.copyfileobj(handwriting_image.file, buffer)
+        handwriting_image_path = (await store_upload(handwriting_image))["path"]
+
+    # Duplicate upload: every analysis is already cached for this media and model version.
+    # Checked before the task is saved, so a cached task is stored as completed and never queued
+    cached_result = await run_in_threadpool(cached_task_result, video_path, audio_path, handwriting_image_path)
+    stored = task_result(cached_result) if cached_result is not None else None
 
     # Save the task to the database
-    task = create_task(
+    task = await run_in_threadpool(
+        create_task,
         db=db,
         user_id=user_id,
         video_path=video_path,
         audio_path=audio_path,
         handwriting_image_path=handwriting_image_path,
+        status="queued" if stored is None else "completed",
+        result=stored,
     )
 
+    if cached_result is not None:
+        publish_progress(task.id, "completed", result=stored)
+        return {
+            "message": "Completed from cache",
+            "user_id": user_id,
+            "task_id": task.id,
+            "video_path": video_path,
+            "audio_path": audio_path,
+            "handwriting_image_path": handwriting_image_path,
+            "result": cached_result,
+        }
+
     # Add background task for video processing if video is provided
     if video and background_tasks:
         background_tasks.add_task(process_video, user_id, video_path, audio_path)
@@ -118,26 +126,6 @@ async def detect(
     }
 
 
-def extract_audio(video_path: str, audio_path: str):
-    """
-    Extracts audio from the provided video file and saves it as a .wav file.
-    """
-    try:
-        video = VideoFileClip(video_path)
-
-        # Check if the video contains an audio track
-        if video.audio is None:
-            raise ValueError("The uploaded video does not contain an audio track.")
-
-        # Extract and save the audio
-        video.audio.write_audiofile(audio_path)
-    except ValueError as ve:
-        raise HTTPException(status_code=400, detail=str(ve))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error extracting audio: {str(e)}")
-
-
-
 import random
 
 def process_video(user_id: str, video_path: str = None, audio_path: str = None):
@@ -1,33 +1,9 @@
 from fastapi import APIRouter, Query, HTTPException
 from typing import List
+from app.utils.vocabulary import AGE_BASED_PHRASES
 
 router = APIRouter(prefix="/dictation", tags=["Dictation"])
 
-# Define age-based phrases
-AGE_BASED_PHRASES = {
-    "under_7": [
-        "The cat is on the mat.",
-        "I like my red ball.",
-        "It is a sunny day.",
-        "We go to the park.",
-        "I love my dog."
-    ],
-    "under_14": [
-        "The river flows through the valley.",
-        "Science is an interesting subject.",
-        "We learn new things every day.",
-        "Teamwork helps us succeed.",
-        "Reading books expands our knowledge."
-    ],
-    "under_21": [
-        "The advancements in technology are remarkable.",
-        "Environmental conservation is crucial for our planet.",
-        "Education shapes the future of our society.",
-        "Artificial intelligence is transforming industries.",
-        "Climate change demands immediate attention."
-    ]
-}
-
 @router.get("/phrases/")
 async def get_dictation_phrases(age: int = Query(..., ge=0, le=21)):
     """
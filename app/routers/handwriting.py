@@ -1,12 +1,24 @@
 from fastapi import APIRouter, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import List
 from app.utils.text_analysis import process_handwriting_analysis
+from app.services.handwriting_api import get_handwriting_api_client
 from app.services.handwriting_processing import process_handwriting_for_dyslexia
-import os
+from app.services.ocr_service import get_ocr_pool, ocr_pages
+from app.services.result_cache import result_cache
+from app.utils.file_handler import store_upload
 
 router = APIRouter(prefix="/handwriting", tags=["Handwriting Analysis"])
 
-UPLOAD_DIR = "app/data/uploads/"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+def _analyze(file_path: str) -> dict:
+    # Process handwriting features
+    handwriting_features = process_handwriting_for_dyslexia(file_path)
+    # Perform additional analysis for spelling and phonetic accuracy
+    analysis_results = process_handwriting_analysis(file_path)
+    return {
+        "handwriting_features": handwriting_features,
+        "text_analysis": analysis_results,
+    }
 
 @router.post("/analyze/")
 async def analyze_handwriting(file: UploadFile):
@@ -17,19 +29,48 @@ async def analyze_handwriting(file: UploadFile):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
 
     # Save the uploaded image
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(file.file.read())
+    stored = await store_upload(file)
 
     try:
-        # Process handwriting features
-        handwriting_features = process_handwriting_for_dyslexia(file_path)
-        # Perform additional analysis for spelling and phonetic accuracy
-        analysis_results = process_handwriting_analysis(file_path)
-        return {
-            "handwriting_features": handwriting_features,
-            "text_analysis": analysis_results,
-            
-        }
+        # The same image was analyzed before with the current models
+        cached = await run_in_threadpool(result_cache.get, stored["sha256"], "handwriting_local")
+        if cached is not None:
+            return cached
+
+        # Image and text analysis are CPU-bound; keep them off the event loop
+        result = await run_in_threadpool(_analyze, stored["path"])
+        await run_in_threadpool(result_cache.put, stored["sha256"], "handwriting_local", result)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/ocr/")
+async def ocr_handwriting_pages(files: List[UploadFile]):
+    """
+    Extract the text of many handwriting pages at once. Pages are OCRed in
+    parallel by the OCR worker pool; the texts are returned in upload order.
+    """
+    for file in files:
+        if not file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail=f"Invalid file type for {file.filename}. Please upload images.")
+
+    paths = [(await store_upload(file))["path"] for file in files]
+    try:
+        texts = await run_in_threadpool(ocr_pages, paths)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {"pages": [{"filename": file.filename, "text": text} for file, text in zip(files, texts)]}
+
+@router.get("/ocr-stats")
+async def get_ocr_stats():
+    """
+    Pages recognized and cache hit rate of the OCR worker pool.
+    """
+    return get_ocr_pool().stats()
+
+@router.get("/api-stats")
+async def get_handwriting_api_stats():
+    """
+    Request, retry and circuit-breaker counters of the external handwriting API client.
+    """
+    return get_handwriting_api_client().stats()
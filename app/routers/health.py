@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from typing import List
+from app.config import READINESS_COMPONENTS
+from app.services.warmup import COMPONENTS, get_status, is_ready, warm_up
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    """
+    The process is up and serving requests.
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    """
+    Ready once every component listed in READINESS_COMPONENTS has been warmed.
+    """
+    ready = is_ready(READINESS_COMPONENTS)
+    body = {"ready": ready, "required": READINESS_COMPONENTS, "components": get_status()}
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+@router.post("/warmup")
+async def warmup(components: List[str] = Query(None)):
+    """
+    Load heavy models and libraries now instead of on the first request that needs them.
+    Warms every component when none are given.
+    """
+    unknown = [name for name in components or [] if name not in COMPONENTS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown components: {', '.join(unknown)}")
+
+    return {"components": await run_in_threadpool(warm_up, components)}
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.config import PROGRESS_HEARTBEAT_SECONDS
 from app.db.models import SessionLocal
-from app.db.crud import get_all_tasks, get_queued_tasks, get_task_by_id
-import json
+from app.db.crud import get_task_by_id, list_tasks as crud_list_tasks
+from app.services.progress import progress_broker, read_task_states
+from app.services.task_listing import resolve_columns, stream_tasks_ndjson, task_row_to_dict
+
+MAX_PAGE_SIZE = 1000
 
 router = APIRouter(prefix="/queue", tags=["Queue Management"])
 
@@ -15,31 +22,90 @@ def get_db():
         db.close()
 
 @router.get("/")
-async def list_tasks(db: Session = Depends(get_db)):
+async def list_tasks(
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    after_id: Optional[int] = Query(None, description="Id of the last task of the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: List[str] = Query(None, description="Columns to return; `result` is omitted by default"),
+    db: Session = Depends(get_db),
+):
     """
-    List all tasks in the database along with their statuses.
+    List tasks in id order, one page at a time, optionally filtered by status and user.
+    Pass `next_after_id` from the response as `after_id` to get the next page.
     """
-    tasks = get_all_tasks(db)
-    
-    # Ensure "result" is returned as a JSON object after validation
-    formatted_tasks = []
-    for task in tasks:
-        try:
-            result_json = json.loads(task.result) if task.result else None
-        except json.JSONDecodeError:
-            result_json = {"error": "Invalid JSON format in result"}
+    try:
+        columns = resolve_columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        formatted_tasks.append({
-            "id": task.id,
-            "user_id": task.user_id,
-            "video_path": task.video_path,
-            "audio_path": task.audio_path,
-            "handwriting_image_path": task.handwriting_image_path,
-            "status": task.status,
-            "result": result_json,
-        })
+    rows = await run_in_threadpool(crud_list_tasks, db, status, user_id, after_id, limit, columns)
+    tasks = [task_row_to_dict(row, columns) for row in rows]
+    return {
+        "tasks": tasks,
+        "next_after_id": tasks[-1]["id"] if len(tasks) == limit else None,
+    }
 
-    return {"tasks": formatted_tasks}
+
+@router.get("/export")
+async def export_tasks(
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    fields: List[str] = Query(None, description="Columns to return; `result` is omitted by default"),
+):
+    """
+    Stream every matching task as newline-delimited JSON, for bulk exports.
+    """
+    try:
+        columns = resolve_columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(stream_tasks_ndjson(status, user_id, columns), media_type="application/x-ndjson")
+
+
+@router.get("/progress-stats")
+async def get_progress_stats():
+    """
+    Connected clients and published events of the task progress streams.
+    """
+    return progress_broker.stats()
+
+
+@router.get("/{task_id}/events")
+async def stream_task_events(task_id: int, last_event_id: Optional[int] = Header(None)):
+    """
+    Stream a task's progress as server-sent events until it completes or fails:
+    processing, frames_decoded, windows_scored, asr_done and one analysis_done
+    per analysis, then completed or failed with the stored result.
+
+    A client that connects mid-task starts from the task's latest events; one
+    that reconnects with Last-Event-ID (as browsers do) resumes after it.
+    """
+    if not progress_broker.has_history(task_id):
+        # Nothing published for this task in this process yet: read its current state once
+        states = await run_in_threadpool(read_task_states, [task_id])
+        if not states:
+            raise HTTPException(status_code=404, detail="Task not found")
+        progress_broker.apply_state(*states[0])
+
+    subscription = progress_broker.subscribe(task_id, last_event_id or 0)
+
+    async def events():
+        try:
+            while True:
+                event = await subscription.get(PROGRESS_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield event.sse
+                if event.terminal:
+                    return
+        finally:
+            subscription.close()
+
+    # No-buffering header so reverse proxies (nginx) pass events through as they are sent
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.get("/{task_id}")
@@ -51,11 +117,6 @@ async def get_task(task_id: int, db: Session = Depends(get_db)):
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    try:
-        result_json = json.loads(task.result) if task.result else None
-    except json.JSONDecodeError:
-        result_json = {"error": "Invalid JSON format in result"}
-
     return {
         "id": task.id,
         "user_id": task.user_id,
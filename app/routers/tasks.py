@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.db.crud import get_all_tasks
+from typing import List, Optional
+from app.db.crud import list_tasks as crud_list_tasks
 from app.db.models import SessionLocal
+from app.services.task_listing import resolve_columns, task_row_to_dict
 
 router = APIRouter(prefix="/tasks", tags=["Task Management"])
 
@@ -13,6 +16,22 @@ def get_db():
         db.close()
 
 @router.get("/")
-async def list_tasks(db: Session = Depends(get_db)):
-    tasks = get_all_tasks(db)
-    return {"tasks": [task.__dict__ for task in tasks]}
+async def list_tasks(
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: List[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    One page of tasks; see GET /queue/ for the parameters.
+    """
+    try:
+        columns = resolve_columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = await run_in_threadpool(crud_list_tasks, db, status, user_id, after_id, limit, columns)
+    tasks = [task_row_to_dict(row, columns) for row in rows]
+    return {"tasks": tasks, "next_after_id": tasks[-1]["id"] if len(tasks) == limit else None}
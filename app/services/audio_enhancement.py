@@ -0,0 +1,195 @@
+import wave
+from math import gcd
+from typing import Tuple
+import numpy as np
+from app.config import AUDIO_ENHANCEMENT, AUDIO_NOISE_GATE_DB, AUDIO_TARGET_DBFS, AUDIO_VAD_DB
+from app.services.audio_processing import SAMPLE_WIDTH, TARGET_SAMPLE_RATE, extract_audio_pcm
+
+FRAME_MS = 20
+# Speech kept before the first and after the last voiced frame when trimming
+TRIM_PADDING_MS = 200
+# Gate gain changes are smoothed over this long to avoid clicks
+GATE_SMOOTHING_MS = 10
+
+
+# Every stage takes and returns mono float32 samples in [-1, 1].
+
+def decode_audio(audio_path: str) -> Tuple[np.ndarray, int]:
+    """
+    Decode a recording into memory as mono float32 samples.
+
+    PCM WAV files are read directly at their own sample rate; anything else is
+    decoded by ffmpeg to 16 kHz mono on a pipe. No file is written.
+
+    Returns:
+        tuple: (samples, sample_rate)
+    """
+    if audio_path.lower().endswith(".wav"):
+        try:
+            return _read_wav(audio_path)
+        except (wave.Error, ValueError):
+            pass  # Compressed or float WAV: let ffmpeg decode it
+    pcm = extract_audio_pcm(audio_path)
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0, TARGET_SAMPLE_RATE
+
+
+def _read_wav(audio_path: str) -> Tuple[np.ndarray, int]:
+    with wave.open(audio_path, "rb") as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples, offset, full_scale = np.frombuffer(data, dtype=np.uint8), 128.0, 128.0
+    elif width == 2:
+        samples, offset, full_scale = np.frombuffer(data, dtype="<i2"), 0.0, 32768.0
+    elif width == 3:
+        # Sign-extend 24-bit little-endian samples into int32
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        samples = raw[:, 0].astype(np.int32) | raw[:, 1].astype(np.int32) << 8 | raw[:, 2].astype(np.int8).astype(np.int32) << 16
+        offset, full_scale = 0.0, 8388608.0
+    elif width == 4:
+        samples, offset, full_scale = np.frombuffer(data, dtype="<i4"), 0.0, 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+
+    # Downmix and convert to float in one pass
+    frames = samples[:len(samples) // channels * channels].reshape(-1, channels)
+    mono = frames[:, 0].astype(np.float32)
+    for channel in range(1, channels):
+        mono += frames[:, channel]
+    if offset:
+        mono -= np.float32(offset * channels)
+    mono *= np.float32(1.0 / (full_scale * channels))
+    return mono, rate
+
+
+def resample(samples: np.ndarray, sample_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Polyphase resampling to `target_rate` (anti-aliased when downsampling).
+    """
+    if sample_rate == target_rate or samples.size == 0:
+        return samples
+    from scipy.signal import resample_poly
+
+    divisor = gcd(sample_rate, target_rate)
+    return resample_poly(samples, target_rate // divisor, sample_rate // divisor).astype(np.float32)
+
+
+def remove_dc(samples: np.ndarray) -> np.ndarray:
+    """
+    Remove the constant offset some microphones add to the signal.
+    """
+    if samples.size == 0:
+        return samples
+    return samples - samples.mean(dtype=np.float64).astype(np.float32)
+
+
+def _frame_rms(samples: np.ndarray, frame: int) -> np.ndarray:
+    count = len(samples) // frame
+    frames = samples[:count * frame].reshape(count, frame)
+    return np.sqrt((frames * frames).mean(axis=1))
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, vad_db: float = AUDIO_VAD_DB) -> np.ndarray:
+    """
+    Energy-based voice activity trimming: drop the leading and trailing
+    stretches whose frames are more than `vad_db` below the loudest frame.
+    Pauses inside the speech are kept.
+    """
+    frame = max(1, sample_rate * FRAME_MS // 1000)
+    rms = _frame_rms(samples, frame)
+    if not rms.any():
+        return samples if rms.size == 0 else samples[:0]
+
+    voiced = np.flatnonzero(rms >= rms.max() * 10 ** (vad_db / 20))
+    padding = TRIM_PADDING_MS * sample_rate // 1000
+    start = max(0, voiced[0] * frame - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame + padding)
+    return samples[start:end]
+
+
+def noise_gate(samples: np.ndarray, sample_rate: int, gate_db: float = AUDIO_NOISE_GATE_DB, vad_db: float = AUDIO_VAD_DB) -> np.ndarray:
+    """
+    Silence frames that are no louder than the background noise.
+
+    The noise floor is the 10th percentile of frame RMS. Frames less than
+    `gate_db` above it are muted, unless they are within `vad_db` of the
+    loudest frame (so quiet speech in a recording without pauses survives),
+    with the gain ramped between frames.
+    """
+    frame = max(1, sample_rate * FRAME_MS // 1000)
+    rms = _frame_rms(samples, frame)
+    count = rms.size
+    if count < 2:
+        return samples
+
+    floor = np.percentile(rms, 10)
+    if floor <= 0:
+        return samples
+    gains = ((rms > floor * 10 ** (gate_db / 20)) | (rms >= rms.max() * 10 ** (vad_db / 20))).astype(np.float32)
+    if gains.all():
+        return samples
+
+    # Per-sample gain: the frame gains held over each frame (the tail keeps the
+    # last frame's), smoothed with a moving average computed from a cumulative sum
+    envelope = np.repeat(gains, frame)
+    envelope = np.concatenate((envelope, np.full(len(samples) - envelope.size, gains[-1], np.float32)))
+    smoothing = max(1, sample_rate * GATE_SMOOTHING_MS // 1000)
+    padded = np.concatenate((np.full(smoothing // 2, envelope[0]), envelope, np.full(smoothing - smoothing // 2, envelope[-1])))
+    cumulative = np.concatenate(([0.0], np.cumsum(padded, dtype=np.float64)))
+    envelope = ((cumulative[smoothing:smoothing + len(samples)] - cumulative[:len(samples)]) / smoothing).astype(np.float32)
+    return samples * envelope
+
+
+def normalize_loudness(samples: np.ndarray, target_dbfs: float = AUDIO_TARGET_DBFS) -> np.ndarray:
+    """
+    Scale the recording so its RMS level is `target_dbfs`, without clipping peaks.
+    """
+    if samples.size == 0:
+        return samples
+    rms = float(np.sqrt(np.mean(samples * samples, dtype=np.float64)))
+    peak = float(np.abs(samples).max())
+    if rms == 0:
+        return samples
+    gain = min(10 ** (target_dbfs / 20) / rms, 0.99 / peak)
+    return samples * np.float32(gain)
+
+
+def enhance_audio(samples: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int]:
+    """
+    Prepare a recording for speech recognition, entirely in memory: resample
+    to 16 kHz, remove DC, trim leading/trailing silence, gate background
+    noise and normalize loudness.
+
+    Returns:
+        tuple: (samples, sample_rate)
+    """
+    samples = resample(samples.astype(np.float32, copy=False), sample_rate)
+    samples = remove_dc(samples)
+    samples = trim_silence(samples, TARGET_SAMPLE_RATE)
+    samples = noise_gate(samples, TARGET_SAMPLE_RATE)
+    samples = normalize_loudness(samples)
+    return samples, TARGET_SAMPLE_RATE
+
+
+def to_audio_data(samples: np.ndarray, sample_rate: int):
+    """
+    Float samples as 16-bit speech_recognition.AudioData.
+    """
+    import speech_recognition as sr
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+    return sr.AudioData(pcm, sample_rate, SAMPLE_WIDTH)
+
+
+def load_audio_for_recognition(audio_path: str, enhance: bool = AUDIO_ENHANCEMENT):
+    """
+    Decode a recording, enhance it (unless disabled) and return it as
+    speech_recognition.AudioData, without intermediate files.
+    """
+    samples, sample_rate = decode_audio(audio_path)
+    if enhance:
+        samples, sample_rate = enhance_audio(samples, sample_rate)
+    else:
+        samples, sample_rate = resample(samples, sample_rate), TARGET_SAMPLE_RATE
+    return to_audio_data(samples, sample_rate)
@@ -0,0 +1,120 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Format expected by the speech recognizer
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+def _ffmpeg_executable():
+    """
+    The ffmpeg binary bundled with moviepy (imageio-ffmpeg), else one on PATH, else None.
+    """
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg")
+
+
+def _run_ffmpeg(video_path: str, output_args: list) -> bytes:
+    """
+    Decode only the audio track of `video_path`, resampled to 16 kHz mono 16-bit
+    in the same pass, and return ffmpeg's stdout.
+    """
+    ffmpeg = _ffmpeg_executable()
+    command = [
+        ffmpeg, "-nostdin", "-v", "error", "-i", video_path,
+        "-vn", "-map", "0:a:0",
+        "-ac", str(TARGET_CHANNELS), "-ar", str(TARGET_SAMPLE_RATE), "-acodec", "pcm_s16le",
+    ] + output_args
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        error = process.stderr.decode(errors="replace").strip()
+        if "matches no streams" in error:
+            raise ValueError("The uploaded video does not contain an audio track.")
+        raise ValueError(f"Error extracting audio: {error}")
+    return process.stdout
+
+
+def extract_audio_pcm(video_path: str) -> bytes:
+    """
+    Extract the audio track of a video straight into memory as raw 16 kHz mono
+    16-bit PCM, ready for speech_recognition.AudioData. No file is written.
+
+    Raises:
+        ValueError: If the video has no audio track or extraction fails.
+    """
+    if _ffmpeg_executable() is None:
+        raise ValueError("Error extracting audio: ffmpeg is not available")
+    return _run_ffmpeg(video_path, ["-f", "s16le", "pipe:1"])
+
+
+def extract_audio_data(video_path: str):
+    """
+    The audio track of a video as in-memory speech_recognition.AudioData.
+    """
+    import speech_recognition as sr
+
+    return sr.AudioData(extract_audio_pcm(video_path), TARGET_SAMPLE_RATE, SAMPLE_WIDTH)
+
+
+def extract_audio(video_path: str, audio_path: str):
+    """
+    Extracts audio from the provided video file and saves it as a 16 kHz mono .wav file,
+    the format the recognizer uses, so it never has to be converted again.
+
+    The file is written under a temporary name and moved into place, so
+    concurrent tasks for the same content-addressed video never see a partial file.
+
+    Raises:
+        ValueError: If the video has no audio track or extraction fails.
+    """
+    directory = os.path.dirname(audio_path) or "."
+    fd, partial_path = tempfile.mkstemp(dir=directory, suffix=".wav")
+    os.close(fd)
+
+    try:
+        if _ffmpeg_executable() is not None:
+            _run_ffmpeg(video_path, ["-f", "wav", "-y", partial_path])
+        else:
+            _extract_audio_with_moviepy(video_path, partial_path)
+        os.replace(partial_path, audio_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def _extract_audio_with_moviepy(video_path: str, audio_path: str):
+    from moviepy import VideoFileClip
+
+    try:
+        # The context manager closes the reader processes moviepy opens
+        with VideoFileClip(video_path) as video:
+            # Check if the video contains an audio track
+            if video.audio is None:
+                raise ValueError("The uploaded video does not contain an audio track.")
+
+            video.audio.write_audiofile(
+                audio_path,
+                fps=TARGET_SAMPLE_RATE,
+                nbytes=SAMPLE_WIDTH,
+                ffmpeg_params=["-ac", str(TARGET_CHANNELS)],
+                logger=None,
+            )
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error extracting audio: {str(e)}")
+
+
+def ensure_audio_extracted(video_path: str, audio_path: str):
+    """
+    Extract the audio track of a task's video unless it has already been extracted.
+    Audio extraction runs during task processing, not in the upload request.
+    """
+    if not os.path.exists(audio_path):
+        extract_audio(video_path, audio_path)
@@ -0,0 +1,260 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Optional
+from app.config import (
+    HANDWRITING_API_BACKOFF,
+    HANDWRITING_API_BACKOFF_MAX,
+    HANDWRITING_API_BREAKER_RESET,
+    HANDWRITING_API_BREAKER_THRESHOLD,
+    HANDWRITING_API_CONNECT_TIMEOUT,
+    HANDWRITING_API_MAX_CONCURRENCY,
+    HANDWRITING_API_RETRIES,
+    HANDWRITING_API_TIMEOUT,
+    HANDWRITING_API_URL,
+)
+
+# Responses worth retrying: rate limiting and server-side failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service for a while.
+
+    After `failure_threshold` consecutive failed requests the circuit opens and
+    requests fail fast for `reset_timeout` seconds. Then one trial request is
+    let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class HandwritingApiClient:
+    """
+    Client for the external handwriting classification API.
+
+    Requests share one pool of keep-alive connections, at most
+    `max_concurrency` are in flight, and each attempt is bounded by timeouts.
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    jittered exponential backoff; repeated failures open a circuit breaker so
+    tasks fail fast while the API is down.
+
+    The underlying httpx.AsyncClient lives on a private event loop thread, so
+    the client can be used both from worker threads (classify_page_sync) and
+    from any event loop (classify_page).
+    """
+
+    def __init__(
+        self,
+        url: str = HANDWRITING_API_URL,
+        max_concurrency: int = HANDWRITING_API_MAX_CONCURRENCY,
+        timeout: float = HANDWRITING_API_TIMEOUT,
+        connect_timeout: float = HANDWRITING_API_CONNECT_TIMEOUT,
+        retries: int = HANDWRITING_API_RETRIES,
+        backoff: float = HANDWRITING_API_BACKOFF,
+        backoff_max: float = HANDWRITING_API_BACKOFF_MAX,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = url
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker(HANDWRITING_API_BREAKER_THRESHOLD, HANDWRITING_API_BREAKER_RESET)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="handwriting-api", daemon=True)
+        self._thread.start()
+        self._client = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "rejected": 0, "in_flight": 0}
+
+    def classify_page_sync(self, image_path: str) -> dict:
+        """
+        Classify a handwriting page, blocking the calling thread until done.
+        Returns the API's JSON response, or {"error": ...}.
+        """
+        with open(image_path, "rb") as f:
+            content = f.read()
+        future = asyncio.run_coroutine_threadsafe(self._classify(os.path.basename(image_path), content), self._loop)
+        return future.result()
+
+    async def classify_page(self, image_path: str) -> dict:
+        """
+        Classify a handwriting page from any event loop.
+        Returns the API's JSON response, or {"error": ...}.
+        """
+        def read():
+            with open(image_path, "rb") as f:
+                return f.read()
+
+        content = await asyncio.to_thread(read)
+        future = asyncio.run_coroutine_threadsafe(self._classify(os.path.basename(image_path), content), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        return {"url": self.url, "max_concurrency": self.max_concurrency, "circuit": self.breaker.state, **counts}
+
+    def close(self):
+        """
+        Close the connection pool and stop the client's event loop.
+        """
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self._counts[name] += delta
+
+    def _ensure_client(self):
+        # Created on the client's own loop, the only loop it is used from
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        # Full jitter: a random delay up to the exponential backoff, so
+        # clients retrying after the same outage do not retry in lockstep
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    async def _classify(self, filename: str, content: bytes) -> dict:
+        self._ensure_client()
+        self._count("requests")
+        if not self.breaker.allow():
+            self._count("rejected")
+            return {"error": "Handwriting API unavailable: too many recent failures, not retrying yet"}
+
+        try:
+            return await self._attempt(filename, content)
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. the task's analysis timeout). Count it as
+            # a failure so a half-open trial never stays in flight forever.
+            self.breaker.record_failure()
+            self._count("failed")
+            raise
+
+    async def _attempt(self, filename: str, content: bytes) -> dict:
+        """
+        Send the page, retrying transient failures. The breaker has already let it through.
+        """
+        import httpx
+
+        error, retry_after = None, None
+        async with self._semaphore:
+            self._count("in_flight")
+            try:
+                for attempt in range(self.retries + 1):
+                    if attempt:
+                        self._count("retries")
+                        await asyncio.sleep(self._delay(attempt - 1, retry_after))
+                    retry_after = None
+                    try:
+                        response = await self._client.post(self.url, files={"file": (filename, content)})
+                    except httpx.TimeoutException:
+                        error = f"Error processing handwriting: timed out after {self.timeout:g} seconds"
+                        continue
+                    except httpx.TransportError as e:
+                        error = f"Error processing handwriting: {e!r}"
+                        continue
+                    except Exception as e:
+                        # Not a transient network problem; retrying will not help
+                        error = f"Error processing handwriting: {str(e)}"
+                        break
+
+                    if response.status_code in RETRY_STATUSES:
+                        retry_after = response.headers.get("Retry-After")
+                        error = f"Failed to process handwriting. Status: {response.status_code}, Message: {response.text}"
+                        continue
+
+                    # The API answered; client errors are not the API being down
+                    self.breaker.record_success()
+                    if response.status_code == 200:
+                        try:
+                            result = response.json()
+                        except ValueError:
+                            self._count("failed")
+                            return {"error": f"Invalid response from the handwriting API: {response.text[:200]}"}
+                        self._count("succeeded")
+                        return result
+                    self._count("failed")
+                    return {"error": f"Failed to process handwriting. Status: {response.status_code}, Message: {response.text}"}
+            finally:
+                self._count("in_flight", -1)
+
+        self.breaker.record_failure()
+        self._count("failed")
+        return {"error": error}
+
+
+_client: Optional[HandwritingApiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_handwriting_api_client() -> HandwritingApiClient:
+    """
+    The shared handwriting API client, created on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HandwritingApiClient()
+        return _client
@@ -1,25 +1,195 @@
 import cv2
 import numpy as np
+from app.config import HANDWRITING_MAX_DIMENSION
 
-def process_handwriting_for_dyslexia(image_path: str):
+# A text line is a run of rows holding at least this fraction of the densest row's ink
+LINE_ROW_THRESHOLD = 0.05
+LINE_MERGE_FRACTION = 0.25
+# Components smaller than this fraction of the median component area are noise (specks, dots)
+MIN_COMPONENT_FRACTION = 0.1
+
+
+def load_grayscale(image_path: str, max_dimension: int = HANDWRITING_MAX_DIMENSION):
+    """
+    Load an image as grayscale, downsampled so its longest side is at most
+    `max_dimension` pixels (0 keeps full resolution).
+
+    Returns:
+        tuple: (image, scale) where scale is the downsampling factor (<= 1).
+    """
+    image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError(f"Could not read the handwriting image: {image_path}")
+
+    scale = 1.0
+    longest = max(image.shape)
+    if max_dimension and longest > max_dimension:
+        scale = max_dimension / longest
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return image, scale
+
+
+def _runs(mask: np.ndarray):
+    """
+    Start (inclusive) and end (exclusive) indices of the runs of True in a 1-D mask.
+    """
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _mean_std(values) -> tuple:
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return 0.0, 0.0
+    return float(values.mean()), float(values.std())
+
+
+def _line_features(ink: np.ndarray):
+    """
+    Text lines from the row projection profile, and letter gaps from the
+    column projection profile of each line.
+    """
+    rows = ink.sum(axis=1, dtype=np.int64)
+    starts, ends = _runs(rows > rows.max() * LINE_ROW_THRESHOLD) if rows.any() else (np.array([], int), np.array([], int))
+    if starts.size > 1:
+        # Descenders and accents can leave a few faint rows that split a line in
+        # two; rejoin runs separated by less than a quarter of a typical line height
+        breaks = (starts[1:] - ends[:-1]) >= max(1.0, np.median(ends - starts) * LINE_MERGE_FRACTION)
+        starts, ends = starts[np.concatenate(([True], breaks))], ends[np.concatenate((breaks, [True]))]
+
+    gaps = []
+    for start, end in zip(starts, ends):
+        columns = ink[start:end].any(axis=0)
+        filled = np.flatnonzero(columns)
+        if filled.size == 0:
+            continue
+        # Blank column runs between the first and last ink of the line
+        gap_starts, gap_ends = _runs(~columns[filled[0]:filled[-1] + 1])
+        gaps.append(gap_ends - gap_starts)
+
+    centers = (starts + ends) / 2.0
+    return {
+        "line_count": int(starts.size),
+        "line_spacing": np.diff(centers),
+        "line_height": ends - starts,
+        "letter_gaps": np.concatenate(gaps) if gaps else np.array([]),
+    }
+
+
+def _component_features(ink: np.ndarray):
+    """
+    Per-component size and slant from connected components, with all moments
+    accumulated in one pass over the ink pixels with np.bincount.
+    """
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    if areas.size == 0:
+        return {"component_count": 0, "component_height": np.array([]), "slant": np.array([]), "slant_weight": np.array([])}
+
+    keep = areas >= np.median(areas) * MIN_COMPONENT_FRACTION
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+
+    ys, xs = np.nonzero(labels)
+    component = labels[ys, xs]
+    n = np.bincount(component, minlength=count)[1:].astype(np.float64)
+    xs = xs.astype(np.float64)
+    ys = ys.astype(np.float64)
+    mean_x = np.bincount(component, xs, count)[1:] / n
+    mean_y = np.bincount(component, ys, count)[1:] / n
+    mu11 = np.bincount(component, xs * ys, count)[1:] / n - mean_x * mean_y
+    mu02 = np.bincount(component, ys * ys, count)[1:] / n - mean_y * mean_y
+
+    # Slant is the horizontal shear of a component against its height; image y
+    # grows downwards, so a right-leaning stroke has negative covariance. Only
+    # components clearly taller than a stroke (not dots or dashes) count.
+    upright = keep & (heights >= np.median(heights[keep]) * 0.5) & (mu02 > 1.0)
+    slant = np.degrees(np.arctan(-mu11[upright] / mu02[upright]))
+
+    return {
+        "component_count": int(keep.sum()),
+        "component_height": heights[keep],
+        "slant": slant,
+        "slant_weight": areas[upright],
+    }
+
+
+def _stroke_features(ink: np.ndarray):
+    """
+    Stroke width from the distance transform: along the ridge of a stroke the
+    distance to the background is half the stroke width.
+    """
+    distance = cv2.distanceTransform(ink, cv2.DIST_L2, 3)
+    ridge = (distance >= cv2.dilate(distance, np.ones((3, 3), np.uint8))) & (ink > 0)
+    return 2.0 * distance[ridge] - 1.0
+
+
+def extract_handwriting_features(image: np.ndarray, scale: float = 1.0) -> dict:
+    """
+    Layout, slant and stroke metrics of a grayscale handwriting image.
+
+    Lengths are reported in pixels of the original (pre-downsampling) image.
+    Every step is a vectorized pass over the image or its ink pixels, so memory
+    stays proportional to the image size.
+    """
+    # Ink is dark on a light page; Otsu picks the threshold per image
+    _, ink = cv2.threshold(image, 0, 1, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+
+    lines = _line_features(ink)
+    components = _component_features(ink)
+    strokes = _stroke_features(ink)
+
+    line_spacing, line_spacing_std = _mean_std(lines["line_spacing"])
+    line_height, _ = _mean_std(lines["line_height"])
+    letter_spacing, letter_spacing_std = _mean_std(lines["letter_gaps"])
+    component_height, _ = _mean_std(components["component_height"])
+    stroke_width, stroke_width_std = _mean_std(strokes)
+    slant, slant_std = 0.0, 0.0
+    if components["slant"].size:
+        slant = float(np.average(components["slant"], weights=components["slant_weight"]))
+        slant_std = float(np.sqrt(np.average((components["slant"] - slant) ** 2, weights=components["slant_weight"])))
+
+    return {
+        "line_count": lines["line_count"],
+        "line_spacing": line_spacing / scale,
+        "line_spacing_std": line_spacing_std / scale,
+        "line_height": line_height / scale,
+        "letter_spacing": letter_spacing / scale,
+        "letter_spacing_std": letter_spacing_std / scale,
+        "component_count": components["component_count"],
+        "component_height": component_height / scale,
+        "slant_deg": slant,
+        "slant_std_deg": slant_std,
+        "stroke_width": stroke_width / scale,
+        "stroke_width_std": stroke_width_std / scale,
+        "ink_density": float(ink.mean()),
+        "scale": scale,
+    }
+
+
+def _irregularity_score(features: dict) -> float:
+    """
+    Placeholder dyslexia score: how irregular line spacing, letter spacing and
+    slant are (coefficients of variation), clipped to [0, 1].
+    """
+    def variation(std, mean):
+        return std / mean if mean > 0 else 0.0
+
+    irregularity = (
+        variation(features["line_spacing_std"], features["line_spacing"])
+        + variation(features["letter_spacing_std"], features["letter_spacing"])
+        + features["slant_std_deg"] / 45.0
+    ) / 3.0
+    return float(np.clip(irregularity, 0.0, 1.0))
+
+
+def process_handwriting_for_dyslexia(image_path: str, max_dimension: int = HANDWRITING_MAX_DIMENSION):
     """
     Process the handwriting image to detect dyslexia indicators.
     """
     try:
-        # Load the image
-        image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-        if image is None:
-            raise ValueError(f"Could not read the handwriting image: {image_path}")
-
-        # Placeholder logic for handwriting analysis
-        # Example: Extract features like line spacing, letter spacing, and curvature
-        handwriting_features = {
-            "line_spacing": np.mean(np.diff(np.where(image > 128)[0])),  # Example placeholder metric
-            "letter_spacing": np.mean(np.diff(np.where(image > 128)[1])),  # Example placeholder metric
-        }
-
-        # Simulate dyslexia probability score based on extracted features
-        dyslexia_score = 0.5 * handwriting_features["line_spacing"] + 0.5 * handwriting_features["letter_spacing"]
+        image, scale = load_grayscale(image_path, max_dimension)
+        handwriting_features = extract_handwriting_features(image, scale)
+        dyslexia_score = _irregularity_score(handwriting_features)
         return {"dyslexia_probability": dyslexia_score, "features": handwriting_features}
     except Exception as e:
         raise ValueError(f"Error processing handwriting image: {str(e)}")
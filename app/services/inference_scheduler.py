@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Callable
+
+import numpy as np
+
+
+class InferenceScheduler:
+    """
+    Collect eye-tracking windows from every caller into shared batches.
+
+    Callers submit arrays shaped (n, time_steps, num_features) and get back a
+    Future holding the n predictions. A single background thread concatenates
+    pending windows and runs one model call whenever the batch reaches
+    `max_batch_size` windows or the oldest window has waited `max_wait_ms`.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue = Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._windows = 0
+        self._largest_batch = 0
+        self._batch_sizes = deque(maxlen=1024)
+        self._queue_waits = deque(maxlen=1024)
+
+    def submit(self, windows: np.ndarray) -> Future:
+        """
+        Queue windows for scoring and return a Future with their predictions.
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        if windows.ndim == 2:
+            windows = windows[np.newaxis]
+
+        future = Future()
+        self._ensure_started()
+        self._queue.put((windows, future, time.monotonic()))
+        return future
+
+    def predict(self, windows: np.ndarray, timeout: float = None) -> np.ndarray:
+        """
+        Blocking helper: submit windows and wait for their predictions.
+        """
+        return self.submit(windows).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        """
+        Batch-size and queue-wait metrics for tuning throughput against latency.
+        """
+        with self._stats_lock:
+            batch_sizes = np.array(self._batch_sizes, dtype=np.float64)
+            waits_ms = np.array(self._queue_waits, dtype=np.float64) * 1000.0
+            batches = self._batches
+            windows = self._windows
+            largest = self._largest_batch
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "pending_requests": self._queue.qsize(),
+            "batches_run": batches,
+            "windows_scored": windows,
+            "avg_batch_size": round(windows / batches, 2) if batches else 0.0,
+            "largest_batch": largest,
+            "recent_batch_size_p50": float(np.percentile(batch_sizes, 50)) if batch_sizes.size else 0.0,
+            "recent_queue_wait_ms_p50": round(float(np.percentile(waits_ms, 50)), 3) if waits_ms.size else 0.0,
+            "recent_queue_wait_ms_p95": round(float(np.percentile(waits_ms, 95)), 3) if waits_ms.size else 0.0,
+            "recent_queue_wait_ms_max": round(float(waits_ms.max()), 3) if waits_ms.size else 0.0,
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="inference-scheduler", daemon=True)
+                self._thread.start()
+
+    def _collect_batch(self):
+        """
+        Block for the first request, then keep collecting until the batch is full
+        or the first request's deadline passes.
+        """
+        first = self._queue.get()
+        batch = [first]
+        size = first[0].shape[0]
+        deadline = first[2] + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except Empty:
+                break
+            batch.append(item)
+            size += item[0].shape[0]
+
+        return batch, size
+
+    def _run(self):
+        while True:
+            batch, size = self._collect_batch()
+            started = time.monotonic()
+
+            # Drop requests whose callers cancelled their future; the rest can
+            # no longer be cancelled, so setting their results cannot fail
+            live = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if len(live) < len(batch):
+                batch, size = live, sum(item[0].shape[0] for item in live)
+                if not batch:
+                    continue
+
+            try:
+                inputs = batch[0][0] if len(batch) == 1 else np.concatenate([item[0] for item in batch])
+                outputs = np.asarray(self.predict_fn(inputs))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            # Hand each caller back its own slice of the batch output
+            offset = 0
+            for windows, future, _ in batch:
+                count = windows.shape[0]
+                future.set_result(outputs[offset:offset + count])
+                offset += count
+
+            with self._stats_lock:
+                self._batches += 1
+                self._windows += size
+                self._largest_batch = max(self._largest_batch, size)
+                self._batch_sizes.append(size)
+                self._queue_waits.extend(started - enqueued for _, _, enqueued in batch)
@@ -0,0 +1,292 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Union
+import cv2
+import numpy as np
+from app.config import OCR_CACHE_SIZE, OCR_LANGUAGE, OCR_PREPROCESSING, OCR_TESSERACT_CONFIG, OCR_WORKERS
+from app.utils.file_handler import media_hash
+
+# Tesseract parallelizes a single page with OpenMP; with one page per worker
+# that only oversubscribes the CPU
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# tesserocr installs signal handlers when imported, which only works on the main
+# thread, so it cannot be imported lazily from an OCR worker (import takes ~40 ms)
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+# Preprocessing steps. Each takes and returns a uint8 image; after "threshold"
+# the image is black text on a white background.
+
+def _grayscale(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def _threshold(image: np.ndarray) -> np.ndarray:
+    image = _grayscale(image)
+    # Adaptive thresholding copes with the uneven lighting of phone photos
+    return cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+
+
+def _ink_mask(image: np.ndarray) -> np.ndarray:
+    image = _grayscale(image)
+    _, ink = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    return ink
+
+
+def _deskew(image: np.ndarray) -> np.ndarray:
+    """
+    Rotate the page so text lines are horizontal, using the minimum-area
+    rectangle around the ink.
+    """
+    points = cv2.findNonZero(_ink_mask(image))
+    if points is None:
+        return image
+    angle = cv2.minAreaRect(points)[-1]
+    # The rectangle's angle range differs between OpenCV versions; map it to
+    # the smallest correction
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if abs(angle) < 0.5:
+        return image
+    height, width = image.shape[:2]
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(image, rotation, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def _crop(image: np.ndarray, margin: int = 10) -> np.ndarray:
+    """
+    Crop to the bounding box of the ink, plus a margin.
+    """
+    points = cv2.findNonZero(_ink_mask(image))
+    if points is None:
+        return image
+    x, y, w, h = cv2.boundingRect(points)
+    height, width = image.shape[:2]
+    return image[max(0, y - margin):min(height, y + h + margin), max(0, x - margin):min(width, x + w + margin)]
+
+
+PREPROCESSING_STEPS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "grayscale": _grayscale,
+    "threshold": _threshold,
+    "deskew": _deskew,
+    "crop": _crop,
+}
+
+
+def preprocess(image: np.ndarray, steps: Sequence[str] = OCR_PREPROCESSING) -> np.ndarray:
+    """
+    Run the named preprocessing steps over an image, in order.
+    """
+    for step in steps:
+        if step not in PREPROCESSING_STEPS:
+            raise ValueError(f"Unknown OCR preprocessing step: {step}")
+        image = PREPROCESSING_STEPS[step](image)
+    return image
+
+
+def _parse_tesseract_config(config: str):
+    """
+    Page segmentation mode and variables from a tesseract command-line style
+    config such as "--psm 6 -c tessedit_char_blacklist=|".
+    """
+    tokens = config.split()
+    psm, variables = None, {}
+    for option, value in zip(tokens, tokens[1:]):
+        if option == "--psm":
+            psm = int(value)
+        elif option == "-c" and "=" in value:
+            name, setting = value.split("=", 1)
+            variables[name] = setting
+    return psm, variables
+
+
+class _TesserocrEngine:
+    """A tesseract instance kept loaded for the life of the worker thread (tesserocr)."""
+
+    def __init__(self, language: str, config: str):
+        self._api = tesserocr.PyTessBaseAPI(lang=language)
+        psm, variables = _parse_tesseract_config(config)
+        if psm is not None:
+            self._api.SetPageSegMode(psm)
+        for name, value in variables.items():
+            self._api.SetVariable(name, value)
+
+    def recognize(self, image: np.ndarray) -> str:
+        from PIL import Image
+
+        # The API releases the GIL while recognizing, so worker threads run in parallel
+        self._api.SetImage(Image.fromarray(image))
+        return self._api.GetUTF8Text()
+
+
+class _PytesseractEngine:
+    """Fallback when tesserocr is not installed: one tesseract process per page."""
+
+    def __init__(self, language: str, config: str):
+        import pytesseract
+
+        self._pytesseract = pytesseract
+        self.language = language
+        self.config = config
+
+    def recognize(self, image: np.ndarray) -> str:
+        return self._pytesseract.image_to_string(image, lang=self.language, config=self.config)
+
+
+def _create_engine(language: str, config: str):
+    if tesserocr is not None:
+        return _TesserocrEngine(language, config)
+    print("tesserocr is not installed: OCR falls back to pytesseract, one tesseract process per page.")
+    return _PytesseractEngine(language, config)
+
+
+class OcrPool:
+    """
+    A fixed pool of OCR worker threads, each holding its own long-lived OCR engine.
+
+    Preprocessed pages are OCRed in parallel, and the text is cached by image
+    hash and preprocessing settings so the same page is never recognized twice.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        steps: Sequence[str] = OCR_PREPROCESSING,
+        language: str = OCR_LANGUAGE,
+        config: str = OCR_TESSERACT_CONFIG,
+        cache_size: int = 1024,
+    ):
+        self.workers = max(1, workers)
+        self.steps = tuple(steps)
+        self.language = language
+        self.config = config
+        self.cache_size = cache_size
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+        self._local = threading.local()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._pages = 0
+
+    def ocr_page(self, image: Union[str, np.ndarray]) -> str:
+        """
+        Text of one page, given as an image path or a BGR/grayscale array.
+        """
+        return self.ocr_pages([image])[0]
+
+    def ocr_pages(self, images: Sequence[Union[str, np.ndarray]]) -> List[str]:
+        """
+        Text of many pages, OCRed in parallel across the pool. Order is preserved.
+        """
+        keys = [self._cache_key(image) for image in images]
+        texts: List[Optional[str]] = [self._cached(key) for key in keys]
+
+        # Identical pages in one batch are recognized once
+        pending = {}
+        for image, key, text in zip(images, keys, texts):
+            if text is None and key not in pending:
+                pending[key] = self._executor.submit(self._recognize, image)
+
+        recognized = {key: future.result() for key, future in pending.items()}
+        for key, text in recognized.items():
+            self._store(key, text)
+        return [text if text is not None else recognized[key] for key, text in zip(keys, texts)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "workers": self.workers,
+                "preprocessing": list(self.steps),
+                "pages_recognized": self._pages,
+                "cache_entries": len(self._cache),
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+                "cache_hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _recognize(self, image: Union[str, np.ndarray]) -> str:
+        if isinstance(image, str):
+            path = image
+            image = cv2.imread(path)
+            if image is None:
+                raise ValueError(f"Could not read the image: {path}")
+
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = self._local.engine = _create_engine(self.language, self.config)
+
+        text = engine.recognize(preprocess(image, self.steps))
+        with self._lock:
+            self._pages += 1
+        return text
+
+    def _cache_key(self, image: Union[str, np.ndarray]) -> str:
+        digest = hashlib.sha256()
+        if isinstance(image, str):
+            sha256 = media_hash(image)
+            if sha256 is None:
+                with open(image, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                sha256 = digest.hexdigest()
+        else:
+            digest.update(str(image.shape).encode())
+            digest.update(np.ascontiguousarray(image).data)
+            sha256 = digest.hexdigest()
+        return f"{sha256}:{','.join(self.steps)}:{self.language}:{self.config}"
+
+    def _cached(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._cache.get(key)
+            if text is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._cache.move_to_end(key)
+            return text
+
+    def _store(self, key: str, text: str):
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+_pool: Optional[OcrPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> OcrPool:
+    """
+    The shared OCR pool, created on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OcrPool(workers=OCR_WORKERS, cache_size=OCR_CACHE_SIZE)
+        return _pool
+
+
+def ocr_page(image: Union[str, np.ndarray]) -> str:
+    """Text of one page (image path or array), using the shared pool."""
+    return get_ocr_pool().ocr_page(image)
+
+
+def ocr_pages(images: Sequence[Union[str, np.ndarray]]) -> List[str]:
+    """Text of many pages, OCRed in parallel by the shared pool."""
+    return get_ocr_pool().ocr_pages(images)
@@ -0,0 +1,313 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional
+from app.config import (
+    PROGRESS_HISTORY_TASKS,
+    PROGRESS_MIN_INTERVAL,
+    PROGRESS_POLL_INTERVAL,
+    PROGRESS_SUBSCRIBER_QUEUE,
+)
+from app.db.schemas import to_json_compatible
+
+# Events after which a task's stream ends
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class ProgressEvent:
+    """
+    One progress event of a task. Encoded as a server-sent event once, when
+    published, however many clients receive it.
+    """
+    __slots__ = ("id", "task_id", "event", "data", "sse")
+
+    def __init__(self, event_id: int, task_id: int, event: str, data: dict):
+        self.id = event_id
+        self.task_id = task_id
+        self.event = event
+        self.data = data
+        payload = json.dumps(to_json_compatible({"task_id": task_id, "event": event, **data}))
+        self.sse = f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode()
+
+    @property
+    def terminal(self) -> bool:
+        return self.event in TERMINAL_EVENTS
+
+
+class Subscription:
+    """
+    One client's stream of a task's events, starting with the task's latest
+    events so far. Read it with `get` from the event loop that created it.
+
+    Up to `max_queued` unread events are buffered; beyond that the oldest are
+    dropped, so a slow client cannot hold up the publisher or grow memory.
+    The terminal event is always the newest, so it is never dropped.
+    """
+
+    def __init__(self, broker, task_id: int, max_queued: int):
+        self.broker = broker
+        self.task_id = task_id
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+        self._max_queued = max(1, max_queued)
+        self._queue = deque()
+        self._ready = asyncio.Event()
+
+    async def get(self, timeout: float = None) -> Optional[ProgressEvent]:
+        """
+        The next event, or None if none arrives within `timeout` seconds.
+        """
+        if not self._queue:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._queue.popleft()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def _deliver(self, event: ProgressEvent):
+        # Runs on the subscription's event loop
+        self._queue.append(event)
+        if len(self._queue) > self._max_queued:
+            self._queue.popleft()
+            self.dropped += 1
+            self.broker._dropped += 1
+        self._ready.set()
+
+
+def _fan_out(subscriptions: List[Subscription], event: ProgressEvent):
+    for subscription in subscriptions:
+        subscription._deliver(event)
+
+
+class ProgressBroker:
+    """
+    In-process publish/subscribe of task progress events.
+
+    Analyses publish from any thread; each event is encoded once and handed to
+    every subscribed client with one callback per event loop, so the cost of a
+    client is a buffer entry rather than a database query. The latest event of
+    each kind is kept for the most recent `history_tasks` tasks, so a client
+    that connects mid-task (or reconnects) starts from the current state.
+
+    Tasks processed by standalone workers (python -m app.worker) run in other
+    processes. For those, one shared poller reads the state of every watched
+    task with a single query per `poll_interval` and publishes the changes.
+    """
+
+    def __init__(
+        self,
+        history_tasks: int = PROGRESS_HISTORY_TASKS,
+        max_queued: int = PROGRESS_SUBSCRIBER_QUEUE,
+        poll_interval: float = PROGRESS_POLL_INTERVAL,
+    ):
+        self.history_tasks = history_tasks
+        self.max_queued = max_queued
+        self.poll_interval = poll_interval
+
+        self._ids = itertools.count(1)
+        self._history: "OrderedDict[int, Dict[tuple, ProgressEvent]]" = OrderedDict()
+        self._subscribers: Dict[int, set] = {}
+        self._local = set()  # Tasks being processed in this process
+        self._remote_states: Dict[int, tuple] = {}  # Last (status, finished analyses) read by the poller
+        self._poller = None
+        self._lock = threading.Lock()
+
+        # Stats
+        self._published = 0
+        self._dropped = 0
+        self._polls = 0
+
+    def publish(self, task_id: int, event: str, **data) -> ProgressEvent:
+        """
+        Publish an event of a task to its subscribers. Safe to call from any thread.
+        """
+        with self._lock:
+            message = ProgressEvent(next(self._ids), task_id, event, data)
+            latest = self._history.pop(task_id, None) or {}
+            # One entry per kind of event (and per analysis for analysis_done),
+            # re-inserted last so replays keep the order they were published in
+            key = (event, data.get("analysis"))
+            latest.pop(key, None)
+            latest[key] = message
+            self._history[task_id] = latest
+            while len(self._history) > self.history_tasks:
+                evicted, _ = self._history.popitem(last=False)
+                self._local.discard(evicted)
+                self._remote_states.pop(evicted, None)
+
+            if message.terminal:
+                self._local.discard(task_id)
+            self._published += 1
+            subscribers = list(self._subscribers.get(task_id, ()))
+
+        by_loop = {}
+        for subscription in subscribers:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_fan_out, subscriptions, message)
+            except RuntimeError:
+                pass  # The client's event loop has been closed
+        return message
+
+    def mark_local(self, task_id: int):
+        """
+        Record that a task is being processed in this process, so the poller
+        leaves it to the pipeline's own events until its terminal event.
+        """
+        with self._lock:
+            self._local.add(task_id)
+
+    def has_history(self, task_id: int) -> bool:
+        with self._lock:
+            return task_id in self._history
+
+    def subscribe(self, task_id: int, after_id: int = 0) -> Subscription:
+        """
+        Subscribe to a task's events from the running event loop. The task's
+        latest events with an id above `after_id` are delivered first.
+        """
+        subscription = Subscription(self, task_id, self.max_queued)
+        with self._lock:
+            for message in sorted((self._history.get(task_id) or {}).values(), key=lambda m: m.id):
+                if message.id > after_id:
+                    subscription._deliver(message)
+            self._subscribers.setdefault(task_id, set()).add(subscription)
+            if self._poller is None or self._poller.done() or self._poller.get_loop().is_closed():
+                self._poller = subscription.loop.create_task(self._poll())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.task_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.task_id]
+
+    def apply_state(self, task_id: int, status: str, result: Optional[dict]):
+        """
+        Publish what changed in a task's stored status and result since the
+        last call, for tasks whose processing is not in this process.
+        """
+        result = result or {}
+        finished = tuple(key for key in result if key not in ("pending", "error"))
+        with self._lock:
+            previous_status, previous_finished = self._remote_states.get(task_id, (None, ()))
+            self._remote_states[task_id] = (status, finished)
+        if status == previous_status and finished == previous_finished:
+            return
+
+        if status in TERMINAL_EVENTS:
+            self.publish(task_id, status, result=result)
+            return
+        if status != previous_status:
+            self.publish(task_id, status)
+        for key in finished:
+            if key not in previous_finished:
+                self.publish(task_id, "analysis_done", analysis=key, result=result[key], pending=result.get("pending", []))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "watched_tasks": len(self._subscribers),
+                "local_tasks": len(self._local),
+                "tasks_with_history": len(self._history),
+                "published": self._published,
+                "dropped": self._dropped,
+                "database_polls": self._polls,
+            }
+
+    async def _poll(self):
+        """
+        Check the tasks that have subscribers but are processed elsewhere,
+        all in one query, until no client is left.
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._poller = None
+                    return
+                task_ids = [task_id for task_id in self._subscribers if task_id not in self._local]
+            if not task_ids:
+                continue
+            try:
+                states = await asyncio.to_thread(read_task_states, task_ids)
+            except Exception as e:
+                print(f"Failed to poll task progress: {e}")
+                continue
+            self._polls += 1
+            for task_id, status, result in states:
+                self.apply_state(task_id, status, result)
+
+
+def read_task_states(task_ids: Iterable[int]) -> list:
+    from app.db.crud import get_task_states
+    from app.db.models import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return get_task_states(db, task_ids)
+    finally:
+        db.close()
+
+
+# Events published many times per analysis, and so rate limited
+FREQUENT_EVENTS = ("frames_decoded", "windows_scored")
+
+
+class TaskReporter:
+    """
+    A progress(event, **data) callback bound to one task, for passing into
+    analyses. Frequent events (FREQUENT_EVENTS) are published at most every
+    `min_interval` seconds per kind; `flush` publishes the latest of any that
+    were held back.
+    """
+
+    def __init__(self, task_id: int, broker: ProgressBroker = None, min_interval: float = PROGRESS_MIN_INTERVAL):
+        self.task_id = task_id
+        self.broker = broker or progress_broker
+        self.min_interval = min_interval
+        self._last_sent: Dict[str, float] = {}
+        self._held: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, **data):
+        if event not in FREQUENT_EVENTS:
+            self.broker.publish(self.task_id, event, **data)
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sent.get(event, float("-inf")) < self.min_interval:
+                self._held[event] = data
+                return
+            self._last_sent[event] = now
+            self._held.pop(event, None)
+        self.broker.publish(self.task_id, event, **data)
+
+    def flush(self):
+        with self._lock:
+            held, self._held = self._held, {}
+            now = time.monotonic()
+            for event in held:
+                self._last_sent[event] = now
+        for event, data in held.items():
+            self.broker.publish(self.task_id, event, **data)
+
+
+# Shared broker used by the API and the task pipeline
+progress_broker = ProgressBroker()
+
+
+def publish_progress(task_id: int, event: str, **data):
+    """Publish an event of a task on the shared broker."""
+    return progress_broker.publish(task_id, event, **data)
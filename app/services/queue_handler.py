@@ -1,42 +1,150 @@
 import threading
-from queue import Queue
-from typing import Dict, Callable, List
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+from app.config import TASK_QUEUE_MAX_DEPTH, TASK_QUEUE_WORKERS
 
 
-def get_queued_tasks() -> Dict[str, List[str]]:
-    """Get a snapshot of all queued tasks for each user."""
-    snapshot = {}
-    for user_id, queue in user_queues.items():
-        snapshot[user_id] = list(queue.queue)  # Convert queue to a list for easier inspection
-    return snapshot
+class QueueFullError(Exception):
+    """Raised when the total queue depth limit has been reached."""
 
 
-# Global dictionary to hold queues for each user
-user_queues: Dict[str, Queue] = {}
+class FairTaskQueue:
+    """
+    Run queued tasks on a fixed pool of worker threads.
 
-# Locks for each user to prevent concurrent processing
-user_locks: Dict[str, threading.Lock] = {}
+    Tasks of one user run one at a time and in order. Users with pending tasks
+    take turns in round-robin order, so a user with a long backlog cannot starve
+    the others. A user's state is dropped as soon as their queue is empty and
+    nothing of theirs is running.
+    """
 
-def add_task_to_queue(user_id: str, task: Callable):
-    """Add a task to the user's queue and start processing if not already running."""
-    if user_id not in user_queues:
-        user_queues[user_id] = Queue()
-        user_locks[user_id] = threading.Lock()
-
-    # Add the task to the user's queue
-    user_queues[user_id].put(task)
-
-    # Start processing if no other tasks are running
-    thread = threading.Thread(target=process_user_queue, args=(user_id,))
-    thread.start()
-
-def process_user_queue(user_id: str):
-    """Process tasks from the user's queue one at a time."""
-    with user_locks[user_id]:  # Ensure only one thread processes the user's queue at a time
-        queue = user_queues[user_id]
-        while not queue.empty():
-            task = queue.get()
+    def __init__(self, workers: int = 4, max_depth: int = 1000):
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+
+        self._user_queues: Dict[str, Deque[Tuple[Callable, float]]] = {}
+        self._ready: Deque[str] = deque()  # Users with pending tasks and nothing running
+        self._running = set()
+        self._depth = 0
+        self._cond = threading.Condition()
+        self._threads = []
+
+        # Stats
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._waits = deque(maxlen=1024)
+
+    def submit(self, user_id: str, task: Callable):
+        """
+        Add a task to the user's queue. Raises QueueFullError when the queue is full.
+        """
+        with self._cond:
+            if self._depth >= self.max_depth:
+                self._rejected += 1
+                raise QueueFullError(f"Task queue is full ({self.max_depth} tasks)")
+
+            self._start_workers()
+            queue = self._user_queues.get(user_id)
+            if queue is None:
+                queue = self._user_queues[user_id] = deque()
+            queue.append((task, time.monotonic()))
+            self._depth += 1
+            self._submitted += 1
+
+            # A user is scheduled once, however many tasks they have queued
+            if len(queue) == 1 and user_id not in self._running:
+                self._ready.append(user_id)
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        """
+        Queue depth per user and recent wait times.
+        """
+        now = time.monotonic()
+        with self._cond:
+            waits = sorted(self._waits)
+            users = {
+                user_id: {
+                    "queued": len(queue),
+                    "running": user_id in self._running,
+                    "oldest_wait_s": round(now - queue[0][1], 3) if queue else 0.0,
+                }
+                for user_id, queue in self._user_queues.items()
+            }
+            for user_id in self._running:
+                users.setdefault(user_id, {"queued": 0, "running": True, "oldest_wait_s": 0.0})
+
+            return {
+                "workers": self.workers,
+                "depth": self._depth,
+                "max_depth": self.max_depth,
+                "running": len(self._running),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "recent_wait_s_p50": round(waits[len(waits) // 2], 3) if waits else 0.0,
+                "recent_wait_s_max": round(waits[-1], 3) if waits else 0.0,
+                "users": users,
+            }
+
+    def _start_workers(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"task-queue-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_task(self):
+        with self._cond:
+            while not self._ready:
+                self._cond.wait()
+            user_id = self._ready.popleft()
+            task, enqueued = self._user_queues[user_id].popleft()
+            self._running.add(user_id)
+            self._depth -= 1
+            self._waits.append(time.monotonic() - enqueued)
+            return user_id, task
+
+    def _work(self):
+        while True:
+            user_id, task = self._next_task()
+            failed = False
             try:
                 task()
             except Exception as e:
+                failed = True
                 print(f"Error processing task for user {user_id}: {e}")
+
+            with self._cond:
+                self._running.discard(user_id)
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+                if self._user_queues[user_id]:
+                    # Back of the line, behind every other waiting user
+                    self._ready.append(user_id)
+                    self._cond.notify()
+                else:
+                    # Evict idle per-user state
+                    del self._user_queues[user_id]
+
+
+# Shared queue used by the API
+task_queue = FairTaskQueue(workers=TASK_QUEUE_WORKERS, max_depth=TASK_QUEUE_MAX_DEPTH)
+
+
+def get_queued_tasks() -> dict:
+    """Get a snapshot of queue depth and wait times, overall and per user."""
+    return task_queue.stats()
+
+
+def add_task_to_queue(user_id: str, task: Callable):
+    """Add a task to the user's queue. Raises QueueFullError when the queue is full."""
+    task_queue.submit(user_id, task)
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from app.config import ANALYZER_VERSIONS, RESULT_CACHE_MAX_ENTRIES
+from app.db.models import AnalysisResult, SessionLocal
+from app.db.schemas import to_json_compatible
+
+
+class ResultCache:
+    """
+    Analysis results keyed by (media hash, analyzer, model version).
+
+    Entries live in the `analysis_results` table so every API process and worker
+    shares them. The table is bounded to `max_entries`; the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 10000, session_factory=SessionLocal):
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def get(self, media_sha256: Optional[str], analyzer: str) -> Optional[dict]:
+        """
+        Cached result for the media under the analyzer's current model version, or None.
+        """
+        if not media_sha256:
+            return None
+
+        db = self.session_factory()
+        try:
+            entry = db.get(AnalysisResult, (media_sha256, analyzer, ANALYZER_VERSIONS[analyzer]))
+            if entry is None:
+                self._count(analyzer, "misses")
+                return None
+            entry.last_accessed_at = time.time()
+            db.commit()
+            self._count(analyzer, "hits")
+            return json.loads(entry.result)
+        finally:
+            db.close()
+
+    def put(self, media_sha256: Optional[str], analyzer: str, result: dict):
+        """
+        Store a result, evicting the least recently used entries if the cache is full.
+        """
+        if not media_sha256:
+            return
+
+        now = time.time()
+        db = self.session_factory()
+        try:
+            db.merge(AnalysisResult(
+                media_sha256=media_sha256,
+                analyzer=analyzer,
+                model_version=ANALYZER_VERSIONS[analyzer],
+                result=json.dumps(to_json_compatible(result)),
+                created_at=now,
+                last_accessed_at=now,
+            ))
+            db.commit()
+            self._count(analyzer, "stores")
+
+            overflow = db.query(func.count()).select_from(AnalysisResult).scalar() - self.max_entries
+            if overflow > 0:
+                oldest = db.query(AnalysisResult.last_accessed_at).order_by(AnalysisResult.last_accessed_at).offset(overflow - 1).limit(1).scalar()
+                evicted = db.query(AnalysisResult).filter(AnalysisResult.last_accessed_at <= oldest).delete(synchronize_session=False)
+                db.commit()
+                self._count("all", "evictions", evicted)
+        except IntegrityError:
+            # Another process stored the same entry concurrently
+            db.rollback()
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """
+        Hit rate per analyzer (since this process started) and the number of cached entries.
+        """
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+        for values in counters.values():
+            lookups = values.get("hits", 0) + values.get("misses", 0)
+            if lookups:
+                values["hit_rate"] = round(values.get("hits", 0) / lookups, 4)
+
+        db = self.session_factory()
+        try:
+            entries = db.query(func.count()).select_from(AnalysisResult).scalar()
+        finally:
+            db.close()
+
+        return {"entries": entries, "max_entries": self.max_entries, "analyzers": counters}
+
+    def _count(self, analyzer: str, counter: str, amount: int = 1):
+        with self._lock:
+            values = self._counters.setdefault(analyzer, {})
+            values[counter] = values.get(counter, 0) + amount
+
+
+result_cache = ResultCache(max_entries=RESULT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,282 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional, Tuple
+import numpy as np
+from app.config import (
+    SPEECH_BACKEND,
+    SPEECH_LANGUAGE,
+    SPEECH_MAX_CONCURRENCY,
+    SPEECH_MIN_SILENCE_MS,
+    SPEECH_SEGMENT_SECONDS,
+    SPEECH_SILENCE_DB,
+    SPEECH_STUB_TRANSCRIPT,
+    SPEECH_TIMEOUT,
+)
+
+FRAME_MS = 30
+# Silence kept around each segment, so words are not clipped at the cut
+SEGMENT_PADDING_MS = 200
+
+
+# Recognizer backends. Each turns one 16-bit mono sr.AudioData into text,
+# raising sr.UnknownValueError when nothing is understood and sr.RequestError
+# when the recognizer fails.
+
+class _GoogleBackend:
+    """Google Web Speech API (remote; the historical default)."""
+
+    name = "google"
+
+    def __init__(self, language: str, timeout: float):
+        self.language = language
+        self.timeout = timeout
+
+    def recognize(self, audio) -> str:
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        # Bounds the HTTP request, so a stalled call fails instead of holding a worker
+        recognizer.operation_timeout = self.timeout
+        return recognizer.recognize_google(audio, language=self.language)
+
+
+class _SphinxBackend:
+    """CMU Sphinx, fully offline (needs the pocketsphinx package)."""
+
+    name = "sphinx"
+
+    def __init__(self, language: str, timeout: float):
+        try:
+            import pocketsphinx  # noqa: F401
+        except ImportError:
+            raise ValueError("The sphinx speech backend needs the pocketsphinx package")
+        self.language = language
+
+    def recognize(self, audio) -> str:
+        import speech_recognition as sr
+
+        return sr.Recognizer().recognize_sphinx(audio, language=self.language)
+
+
+class _StubBackend:
+    """Returns a fixed transcript for every segment, for tests and local runs without a recognizer."""
+
+    name = "stub"
+
+    def __init__(self, language: str, timeout: float, transcript: str = SPEECH_STUB_TRANSCRIPT):
+        self.transcript = transcript
+
+    def recognize(self, audio) -> str:
+        import speech_recognition as sr
+
+        if not self.transcript:
+            raise sr.UnknownValueError()
+        return self.transcript
+
+
+BACKENDS = {backend.name: backend for backend in (_GoogleBackend, _SphinxBackend, _StubBackend)}
+
+
+def create_backend(name: str, language: str = SPEECH_LANGUAGE, timeout: float = SPEECH_TIMEOUT):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend: {name} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[name](language, timeout)
+
+
+def _runs(mask: np.ndarray):
+    """
+    Start (inclusive) and end (exclusive) indices of the runs of True in a 1-D mask.
+    """
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def split_on_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    max_seconds: float = SPEECH_SEGMENT_SECONDS,
+    min_silence_ms: int = SPEECH_MIN_SILENCE_MS,
+    silence_db: float = SPEECH_SILENCE_DB,
+) -> List[Tuple[int, int]]:
+    """
+    Sample ranges (start, end) to transcribe separately, cut at pauses.
+
+    A frame is silent when its RMS is more than `silence_db` below the loudest
+    frame. Speech separated by at least `min_silence_ms` of silence is grouped
+    into segments of up to `max_seconds`; longer stretches without a pause are
+    cut at `max_seconds`. Recordings no longer than `max_seconds` are returned
+    whole, and segments with no speech are dropped.
+    """
+    total = len(samples)
+    if total <= max_seconds * sample_rate:
+        return [(0, total)] if total else []
+
+    frame = max(1, sample_rate * FRAME_MS // 1000)
+    count = total // frame
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame)
+    rms = np.sqrt((frames * frames).mean(axis=1))
+    if not rms.any():
+        return []
+
+    starts, ends = _runs(rms >= rms.max() * 10 ** (silence_db / 20))
+    if starts.size > 1:
+        # Pauses shorter than min_silence_ms are part of the speech
+        breaks = (starts[1:] - ends[:-1]) * FRAME_MS >= min_silence_ms
+        starts, ends = starts[np.concatenate(([True], breaks))], ends[np.concatenate((breaks, [True]))]
+
+    max_frames = max(1, int(max_seconds * 1000 / FRAME_MS))
+    groups = []
+    for start, end in zip(starts, ends):
+        if groups and end - groups[-1][0] <= max_frames:
+            groups[-1][1] = end
+            continue
+        # A run too long for one segment is cut every max_frames
+        for piece in range(start, end, max_frames):
+            groups.append([piece, min(piece + max_frames, end)])
+
+    padding = SEGMENT_PADDING_MS * sample_rate // 1000
+    return [(max(0, start * frame - padding), min(total, end * frame + padding)) for start, end in groups]
+
+
+class SpeechTranscriber:
+    """
+    Transcribes recordings with a pluggable recognizer backend.
+
+    Long recordings are split at pauses and the segments are recognized in
+    parallel on a bounded pool shared by all callers, then stitched back
+    together in order. Each recognizer call is limited to `timeout` seconds
+    from when it starts on the pool; time spent queued behind other
+    recordings does not count.
+    """
+
+    def __init__(
+        self,
+        backend: str = SPEECH_BACKEND,
+        max_workers: int = SPEECH_MAX_CONCURRENCY,
+        timeout: float = SPEECH_TIMEOUT,
+        segment_seconds: float = SPEECH_SEGMENT_SECONDS,
+        language: str = SPEECH_LANGUAGE,
+    ):
+        self.backend = create_backend(backend, language, timeout) if isinstance(backend, str) else backend
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.segment_seconds = segment_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="speech")
+        self._lock = threading.Lock()
+        self._recordings = 0
+        self._segments = 0
+        self._failures = 0
+        self._timeouts = 0
+
+    def transcribe(self, audio) -> str:
+        """
+        Text of a recording given as sr.AudioData.
+
+        Raises:
+            sr.UnknownValueError: If no segment contains recognizable speech.
+            sr.RequestError: If the recognizer fails or times out on any segment.
+        """
+        import speech_recognition as sr
+
+        sample_width = 2
+        pcm = audio.get_raw_data(convert_width=sample_width)
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        segments = split_on_silence(samples, audio.sample_rate, self.segment_seconds)
+        if not segments:
+            raise sr.UnknownValueError()
+
+        started = [None] * len(segments)  # When each call began on a worker
+        futures = [
+            self._executor.submit(
+                self._recognize,
+                started,
+                index,
+                sr.AudioData(pcm[start * sample_width:end * sample_width], audio.sample_rate, sample_width),
+            )
+            for index, (start, end) in enumerate(segments)
+        ]
+        not_done = self._wait(futures, started)
+
+        with self._lock:
+            self._recordings += 1
+            self._segments += len(segments)
+            if not_done:
+                self._timeouts += 1
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            raise sr.RequestError(f"Speech recognition timed out after {self.timeout:g} seconds")
+
+        texts = []
+        for future in futures:
+            try:
+                texts.append(future.result())
+            except sr.UnknownValueError:
+                continue
+            except Exception as e:
+                with self._lock:
+                    self._failures += 1
+                if isinstance(e, sr.RequestError):
+                    raise
+                raise sr.RequestError(f"Speech recognition failed: {e}")
+
+        transcript = " ".join(text.strip() for text in texts if text and text.strip())
+        if not transcript:
+            raise sr.UnknownValueError()
+        return transcript
+
+    def _recognize(self, started: list, index: int, audio) -> str:
+        started[index] = time.monotonic()
+        return self.backend.recognize(audio)
+
+    def _wait(self, futures: list, started: list) -> set:
+        """
+        Wait for every call, allowing each `timeout` seconds from its start.
+        Returns the calls still running when one of them ran out of time.
+        """
+        pending = set(futures)
+        while pending:
+            running = [started[i] for i, future in enumerate(futures) if future in pending and started[i] is not None]
+            if running:
+                remaining = min(running) + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    return pending
+            else:
+                # All still queued behind other recordings: not timed yet
+                remaining = self.timeout
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        return pending
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend.name,
+                "max_workers": self.max_workers,
+                "timeout": self.timeout,
+                "recordings": self._recordings,
+                "segments": self._segments,
+                "failures": self._failures,
+                "timeouts": self._timeouts,
+            }
+
+
+_transcriber: Optional[SpeechTranscriber] = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber() -> SpeechTranscriber:
+    """
+    The shared transcriber, created on first use.
+    """
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            _transcriber = SpeechTranscriber()
+        return _transcriber
+
+
+def transcribe(audio) -> str:
+    """Text of a recording (sr.AudioData), using the shared transcriber."""
+    return get_transcriber().transcribe(audio)
@@ -0,0 +1,40 @@
+import json
+from typing import Iterable, List, Optional
+from app.db.crud import TASK_COLUMNS, TASK_LIST_COLUMNS, iter_tasks
+from app.db.models import SessionLocal
+
+
+def resolve_columns(fields: Optional[List[str]]) -> tuple:
+    """
+    The columns to load for a listing. `fields` may hold column names, either
+    repeated or comma separated; the id is always included since it is the
+    pagination cursor. Raises ValueError for unknown columns.
+    """
+    if not fields:
+        return TASK_LIST_COLUMNS
+
+    requested = [name.strip() for field in fields for name in field.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in TASK_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ("id",) + tuple(name for name in dict.fromkeys(requested) if name != "id")
+
+
+def task_row_to_dict(row, columns: Iterable[str]) -> dict:
+    # `result` is a JSON column, so it arrives already decoded
+    return {column: getattr(row, column) for column in columns}
+
+
+def stream_tasks_ndjson(status: str = None, user_id: str = None, columns=TASK_LIST_COLUMNS, batch_size: int = 500):
+    """
+    Yield matching tasks as newline-delimited JSON, one task per line.
+
+    The generator opens its own session because it keeps running after the
+    request handler (and its session dependency) has returned.
+    """
+    db = SessionLocal()
+    try:
+        for row in iter_tasks(db, status, user_id, columns, batch_size):
+            yield json.dumps(task_row_to_dict(row, columns)) + "\n"
+    finally:
+        db.close()
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from app.config import MODALITY_TIMEOUTS, MODALITY_WORKERS, TASK_LEASE_SECONDS
+from app.db.crud import heartbeat_tasks, save_partial_result
+from app.db.models import SessionLocal
+from app.db.schemas import task_result
+from app.services.audio_processing import ensure_audio_extracted
+from app.services.handwriting_api import get_handwriting_api_client
+from app.services.progress import TaskReporter, progress_broker
+from app.services.result_cache import result_cache
+from app.services.video_processing import process_video_for_dyslexia
+from app.utils.file_handler import media_hash
+from app.utils.phonetics_analysis import process_audio_for_phonetics
+from app.utils.vocabulary import DEFAULT_TEST_WORDS
+
+# Blocking analyses run on this pool rather than on the event loop's default
+# executor: asyncio.run() waits for its default executor on exit, so an
+# analysis that had timed out would still hold up the task
+_modality_executor = ThreadPoolExecutor(max_workers=MODALITY_WORKERS, thread_name_prefix="modality")
+
+def process_handwriting_with_api(handwriting_image_path: str):
+    """
+    Sends handwriting image to the external handwriting classification API.
+    """
+    try:
+        return get_handwriting_api_client().classify_page_sync(handwriting_image_path)
+    except Exception as e:
+        return {"error": f"Error processing handwriting: {str(e)}"}
+
+async def _in_executor(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(_modality_executor, function, *args)
+
+async def _run_modality(key: str, analyzer: str, media_sha256: str, analyze) -> dict:
+    """
+    Return the cached result of `analyzer` for this media, or run it (within
+    the modality's timeout) and cache the result. Error results are not cached
+    so they can be retried.
+    """
+    cached = await _in_executor(result_cache.get, media_sha256, analyzer)
+    if cached is not None:
+        return cached
+
+    timeout = MODALITY_TIMEOUTS[key]
+    try:
+        result = await asyncio.wait_for(analyze(), timeout)
+    except asyncio.TimeoutError:
+        return {"error": f"Analysis timed out after {timeout:g} seconds"}
+    except Exception as e:
+        return {"error": str(e)}
+
+    if "error" not in result:
+        await _in_executor(result_cache.put, media_sha256, analyzer, result)
+    return result
+
+def _analyze_phonetics(video_path: str, audio_path: str, progress=None) -> dict:
+    test_words = DEFAULT_TEST_WORDS
+    try:
+        if video_path:
+            ensure_audio_extracted(video_path, audio_path)
+        return process_audio_for_phonetics(audio_path, test_words, progress)
+    except ValueError as e:
+        return {"error": str(e)}
+
+async def _classify_handwriting(handwriting_image_path: str) -> dict:
+    try:
+        return await get_handwriting_api_client().classify_page(handwriting_image_path)
+    except Exception as e:
+        return {"error": f"Error processing handwriting: {str(e)}"}
+
+def _modalities(task, progress=None) -> list:
+    """
+    (result key, analyzer, media hash, coroutine function) for every analysis that applies to a task.
+    """
+    video_sha256 = media_hash(task.video_path) or media_hash(task.audio_path)
+    modalities = []
+
+    # Video analysis (eye tracking) and phonetics (speech recognition on the
+    # extracted audio) are blocking, CPU-heavy calls: run them on threads
+    if task.video_path:
+        modalities.append(("video_analysis", "eye_tracking", video_sha256,
+                           lambda: _in_executor(partial(process_video_for_dyslexia, task.video_path, progress=progress))))
+    if task.audio_path:
+        modalities.append(("phonetics_analysis", "phonetics", video_sha256,
+                           lambda: _in_executor(_analyze_phonetics, task.video_path, task.audio_path, progress)))
+
+    # Handwriting analysis via the external API is I/O: a coroutine
+    if task.handwriting_image_path:
+        modalities.append(("handwriting_analysis", "handwriting_api", media_hash(task.handwriting_image_path),
+                           lambda: _classify_handwriting(task.handwriting_image_path)))
+    return modalities
+
+async def process_task_async(task, on_result=None) -> dict:
+    """
+    Run every analysis that applies to a task concurrently and return the
+    combined result, so a task takes about as long as its slowest analysis.
+
+    Each analysis has its own timeout (MODALITY_TIMEOUTS); one that fails or
+    times out is reported as {"error": ...} without affecting the others.
+    Analyses already cached for the same media and model version are not rerun.
+
+    Progress is published on app.services.progress as it happens: "processing",
+    then "frames_decoded", "windows_scored", "asr_done" and one "analysis_done"
+    per analysis. The caller publishes "completed" or "failed" once the result is stored.
+
+    Args:
+        task: The task to process.
+        on_result (Callable): Called (on a worker thread) with the results so
+            far each time an analysis finishes, with the keys of the analyses
+            still running under "pending".
+    """
+    progress = TaskReporter(task.id)
+    progress_broker.mark_local(task.id)
+    modalities = _modalities(task, progress)
+    order = [key for key, *_ in modalities]
+    progress("processing", analyses=order)
+    results = {}
+    # Serializes the callbacks so a later partial result is never overwritten by an earlier one
+    report_lock = asyncio.Lock()
+
+    async def run(key, analyzer, media_sha256, analyze):
+        result = await _run_modality(key, analyzer, media_sha256, analyze)
+        async with report_lock:
+            results[key] = result
+            progress.flush()
+            progress("analysis_done", analysis=key, result=result, pending=[k for k in order if k not in results])
+            if on_result is None or len(results) == len(order):
+                return
+            snapshot = {k: results[k] for k in order if k in results}
+            snapshot["pending"] = [k for k in order if k not in results]
+            try:
+                await _in_executor(on_result, snapshot)
+            except Exception as e:
+                print(f"Failed to save partial result of task {task.id}: {e}")
+
+    await asyncio.gather(*(run(*modality) for modality in modalities))
+    return {key: results[key] for key in order}
+
+def process_task(task, on_result=None) -> dict:
+    """
+    Blocking version of process_task_async, for worker threads (app.worker).
+    """
+    return asyncio.run(process_task_async(task, on_result))
+
+def partial_result_saver(task_id: int, worker_id: str, session_factory=SessionLocal):
+    """
+    An on_result callback for process_task that stores the partial results
+    of a task leased by `worker_id`.
+    """
+    def save(snapshot: dict):
+        db = session_factory()
+        try:
+            save_partial_result(db, task_id, worker_id, task_result(snapshot))
+        finally:
+            db.close()
+    return save
+
+def cached_task_result(video_path: str = None, audio_path: str = None, handwriting_image_path: str = None):
+    """
+    The full task result if every analysis the task needs is already cached, else None.
+    """
+    video_sha256 = media_hash(video_path) or media_hash(audio_path)
+    needed = []
+    if video_path:
+        needed.append(("video_analysis", "eye_tracking", video_sha256))
+    if audio_path:
+        needed.append(("phonetics_analysis", "phonetics", video_sha256))
+    if handwriting_image_path:
+        needed.append(("handwriting_analysis", "handwriting_api", media_hash(handwriting_image_path)))
+
+    result = {}
+    for key, analyzer, sha256 in needed:
+        cached = result_cache.get(sha256, analyzer)
+        if cached is None:
+            return None
+        result[key] = cached
+    return result
+
+class LeaseHeartbeat:
+    """
+    Keep extending the leases of claimed tasks in the background while they are being processed.
+
+    Use as a context manager around the processing of a claimed task, or of a
+    claimed batch (pass a list of ids and `release` each task once it is done).
+    The heartbeat uses its own session, since sessions must not be shared between threads.
+    """
+
+    def __init__(self, task_ids, worker_id: str, lease_seconds: float = TASK_LEASE_SECONDS, session_factory=SessionLocal):
+        self.task_ids = {task_ids} if isinstance(task_ids, int) else set(task_ids)
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.session_factory = session_factory
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def release(self, task_id: int):
+        """
+        Stop renewing the lease of a task that has been processed.
+        """
+        self.task_ids.discard(task_id)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        db = self.session_factory()
+        try:
+            # Renew well before expiry so one slow commit does not lose the lease
+            while not self._stop.wait(self.lease_seconds / 3):
+                task_ids = list(self.task_ids)
+                if not task_ids:
+                    continue
+                if heartbeat_tasks(db, task_ids, self.worker_id, self.lease_seconds) < len(task_ids):
+                    self.lost = True
+                    print(f"Worker {self.worker_id} lost the lease on some of tasks {task_ids}")
+                    return
+        except Exception as e:
+            print(f"Heartbeat for tasks {sorted(self.task_ids)} failed: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,354 @@
+import threading
+import time
+from queue import Queue, Empty, Full
+from typing import Callable
+
+import cv2
+import numpy as np
+
+# Marks the end of a stage's output on a queue
+_DONE = object()
+
+
+def padded_window_start(length: int, time_steps: int, stride: int):
+    """
+    Start of the trailing partial window over `length` frames when the last
+    window is padded, or None if the full windows already end on the last frame.
+
+    Full windows start every `stride` frames; the padded window starts `stride`
+    after the last full one (at frame 0 when the video is shorter than one
+    window). Shared by every processing mode so they score the same windows.
+    """
+    if length <= 0:
+        return None
+    if length < time_steps:
+        return 0
+    overhang = (length - time_steps) % stride
+    if not overhang:
+        return None
+    return length - time_steps - overhang + stride
+
+
+class StageStats:
+    """
+    Busy time of a pipeline stage and the fill level of its input queue.
+    """
+
+    def __init__(self, name: str, workers: int, queue_capacity: int = None):
+        self.name = name
+        self.workers = workers
+        self.queue_capacity = queue_capacity
+        self.items = 0
+        self.busy = 0.0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._lock = threading.Lock()
+
+    def record(self, busy: float, items: int = 1):
+        with self._lock:
+            self.busy += busy
+            self.items += items
+
+    def sample_queue(self, queue: Queue):
+        with self._lock:
+            self._depth_total += queue.qsize()
+            self._depth_samples += 1
+
+    def report(self, wall_time: float) -> dict:
+        report = {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_s": round(self.busy, 3),
+            # Fraction of the stage's worker time spent doing work
+            "occupancy": round(self.busy / (wall_time * self.workers), 3) if wall_time > 0 else 0.0,
+        }
+        if self.queue_capacity is not None:
+            report["queue_capacity"] = self.queue_capacity
+            report["avg_queue_depth"] = round(self._depth_total / self._depth_samples, 2) if self._depth_samples else 0.0
+        return report
+
+
+class VideoPipeline:
+    """
+    Run frame decoding, landmark extraction and window scoring as concurrent stages.
+
+    Stages are connected by bounded queues, so a slow stage applies backpressure to
+    the ones feeding it and wall-clock time approaches that of the slowest stage.
+
+    Args:
+        video_path (str): Path to the video file.
+        create_extractor (Callable): Builds a frame -> landmarks callable. Called once
+            per landmark worker so no extractor is shared between threads.
+        score_windows (Callable): Scores an array of raw windows shaped
+            (n, time_steps, num_features) and returns n probabilities.
+        time_steps (int): Frames per window.
+        num_features (int): Landmark values per frame.
+        stride (int): Frames between window starts.
+        pad_last (bool): Pad and score the trailing partial window.
+        decode_workers (int): Captures decoding disjoint frame ranges in parallel.
+        landmark_workers (int): Threads running landmark extraction.
+        scoring_workers (int): Threads normalizing and scoring completed windows.
+        queue_size (int): Capacity of each inter-stage queue.
+        progress (Callable): Called with ("frames_decoded", frames=..., total_frames=...)
+            as frames get their landmarks, and ("windows_scored", windows=...) as
+            windows are scored, from the pipeline's threads.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        create_extractor: Callable,
+        score_windows: Callable,
+        time_steps: int,
+        num_features: int,
+        stride: int = None,
+        pad_last: bool = False,
+        decode_workers: int = 1,
+        landmark_workers: int = 2,
+        scoring_workers: int = 1,
+        queue_size: int = 64,
+        progress: Callable = None,
+    ):
+        self.video_path = video_path
+        self.create_extractor = create_extractor
+        self.score_windows = score_windows
+        self.time_steps = time_steps
+        self.num_features = num_features
+        self.stride = max(1, stride or time_steps)
+        self.pad_last = pad_last
+        self.decode_workers = max(1, decode_workers)
+        self.landmark_workers = max(1, landmark_workers)
+        self.scoring_workers = max(1, scoring_workers)
+        self.progress = progress
+
+        self.frame_queue = Queue(maxsize=queue_size)
+        self.landmark_queue = Queue(maxsize=queue_size)
+        self.window_queue = Queue(maxsize=queue_size)
+
+        self.stats = {
+            "decode": StageStats("decode", self.decode_workers),
+            "landmarks": StageStats("landmarks", self.landmark_workers, queue_size),
+            "assemble": StageStats("assemble", 1, queue_size),
+            "scoring": StageStats("scoring", self.scoring_workers, queue_size),
+        }
+
+        self.results = {}
+        self._results_lock = threading.Lock()
+        self._error = None
+        self._stop = threading.Event()
+        self._active_decoders = 0
+        self._decoders_lock = threading.Lock()
+        self._frame_count = 0
+        self._frames_assembled = 0
+
+    def run(self) -> dict:
+        """
+        Process the whole video and return the per-window probabilities with stage stats.
+        """
+        segments = self._plan_segments()
+        self.stats["decode"].workers = len(segments)
+        self._active_decoders = len(segments)
+
+        threads = [threading.Thread(target=self._decode, args=segment, daemon=True) for segment in segments]
+        threads += [threading.Thread(target=self._extract_landmarks, daemon=True) for _ in range(self.landmark_workers)]
+        threads.append(threading.Thread(target=self._assemble, daemon=True))
+        threads += [threading.Thread(target=self._score, daemon=True) for _ in range(self.scoring_workers)]
+
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.monotonic() - started
+
+        if self._error is not None:
+            raise self._error
+
+        if self.progress is not None:
+            self.progress("frames_decoded", frames=self._frames_assembled, total_frames=self._frame_count)
+            self.progress("windows_scored", windows=len(self.results))
+
+        return {
+            "window_probabilities": [self.results[i] for i in sorted(self.results)],
+            "pipeline": {
+                "wall_time_s": round(wall_time, 3),
+                "stages": {name: stage.report(wall_time) for name, stage in self.stats.items()},
+            },
+        }
+
+    def _plan_segments(self):
+        """
+        Split the video into contiguous frame ranges, one per decode worker.
+        """
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Error: Could not open video {self.video_path}")
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        self._frame_count = frame_count
+
+        # Seeking needs a known length; otherwise read the whole file with one decoder
+        if frame_count <= 0 or self.decode_workers == 1:
+            return [(0, None)]
+
+        bounds = np.linspace(0, frame_count, min(self.decode_workers, frame_count) + 1).astype(int)
+        segments = [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+        segments[-1] = (segments[-1][0], None)  # Last segment reads to the real end of file
+        return segments
+
+    def _fail(self, error: Exception):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _put(self, queue: Queue, item, stats: StageStats = None):
+        """
+        Blocking put that gives up once the pipeline has been stopped.
+        """
+        if stats is not None:
+            stats.sample_queue(queue)
+        while not self._stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _get(self, queue: Queue):
+        while not self._stop.is_set():
+            try:
+                return queue.get(timeout=0.1)
+            except Empty:
+                continue
+        return _DONE
+
+    def _decode(self, start: int, end: int):
+        stats = self.stats["decode"]
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            if start:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            index = start
+            while end is None or index < end:
+                began = time.monotonic()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                stats.record(time.monotonic() - began)
+                if not self._put(self.frame_queue, (index, frame), self.stats["landmarks"]):
+                    return
+                index += 1
+        except Exception as e:
+            self._fail(e)
+        finally:
+            cap.release()
+            # The last decoder to finish closes the frame stream
+            with self._decoders_lock:
+                self._active_decoders -= 1
+                last = self._active_decoders == 0
+            if last:
+                self._put(self.frame_queue, _DONE)
+
+    def _extract_landmarks(self):
+        stats = self.stats["landmarks"]
+        try:
+            extract = self.create_extractor()
+            while True:
+                item = self._get(self.frame_queue)
+                if item is _DONE:
+                    break
+                index, frame = item
+                began = time.monotonic()
+                landmarks = extract(frame)
+                stats.record(time.monotonic() - began)
+                if not self._put(self.landmark_queue, (index, landmarks), self.stats["assemble"]):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            # Let the other workers see the end of the frame stream too
+            self._put(self.frame_queue, _DONE)
+            self._put(self.landmark_queue, _DONE)
+
+    def _assemble(self):
+        """
+        Write landmarks into the series by frame index and release windows whose
+        frames have all arrived.
+        """
+        stats = self.stats["assemble"]
+        series = np.empty((1024, self.num_features), dtype=np.float32)
+        received = np.zeros(1024, dtype=bool)
+        contiguous = 0  # Frames [0, contiguous) have all arrived
+        next_window = 0
+        finished_landmark_workers = 0
+
+        try:
+            while finished_landmark_workers < self.landmark_workers:
+                item = self._get(self.landmark_queue)
+                if item is _DONE:
+                    if self._stop.is_set():
+                        return
+                    finished_landmark_workers += 1
+                    continue
+
+                began = time.monotonic()
+                index, landmarks = item
+                if index >= len(series):
+                    size = max(index + 1, len(series) * 2)
+                    grown = np.empty((size, self.num_features), dtype=np.float32)
+                    grown[:len(series)] = series
+                    series = grown
+                    received = np.concatenate([received, np.zeros(size - len(received), dtype=bool)])
+                series[index] = landmarks
+                received[index] = True
+
+                while contiguous < len(received) and received[contiguous]:
+                    contiguous += 1
+                self._frames_assembled = contiguous
+
+                # Views stay valid if the buffer is later grown: they keep the old one alive
+                released = next_window
+                while next_window * self.stride + self.time_steps <= contiguous:
+                    window_start = next_window * self.stride
+                    window = series[window_start:window_start + self.time_steps]
+                    if not self._put(self.window_queue, (next_window, window), self.stats["scoring"]):
+                        return
+                    next_window += 1
+                stats.record(time.monotonic() - began)
+                if self.progress is not None and next_window > released:
+                    self.progress("frames_decoded", frames=contiguous, total_frames=self._frame_count)
+
+            # Complete the trailing partial window by repeating the last frame
+            if self.pad_last:
+                last_start = padded_window_start(contiguous, self.time_steps, self.stride)
+                if last_start is not None:
+                    window = np.empty((self.time_steps, self.num_features), dtype=np.float32)
+                    tail = series[last_start:contiguous]
+                    window[:len(tail)] = tail
+                    window[len(tail):] = series[contiguous - 1]
+                    self._put(self.window_queue, (next_window, window), self.stats["scoring"])
+        except Exception as e:
+            self._fail(e)
+        finally:
+            for _ in range(self.scoring_workers):
+                self._put(self.window_queue, _DONE)
+
+    def _score(self):
+        stats = self.stats["scoring"]
+        try:
+            while True:
+                item = self._get(self.window_queue)
+                if item is _DONE:
+                    break
+                window_index, window = item
+                began = time.monotonic()
+                probability = self.score_windows(window[np.newaxis])[0]
+                stats.record(time.monotonic() - began)
+                with self._results_lock:
+                    self.results[window_index] = probability
+                    scored = len(self.results)
+                if self.progress is not None:
+                    self.progress("windows_scored", windows=scored)
+        except Exception as e:
+            self._fail(e)
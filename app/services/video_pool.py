@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import cv2
+import numpy as np
+
+# Per-process handle on app.services.video_processing, set by _init_worker.
+# Every worker process loads its own FaceMesh and Keras model through it.
+_vp = None
+
+
+def _init_worker():
+    """
+    Load and warm the FaceMesh and model of a worker process.
+    """
+    global _vp
+
+    # One compute thread per process; parallelism comes from the process count
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", "1")
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+    from app.services import video_processing
+
+    _vp = video_processing
+    _vp.warm_up()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _process_whole_video(video_path: str, stride: int, pad_last: bool) -> dict:
+    return _vp.process_video_for_dyslexia(video_path, mode="vectorized", window_stride=stride, pad_last_window=pad_last)
+
+
+def _extract_segment(video_path: str, start: int, end: int = None) -> np.ndarray:
+    """
+    Landmarks of frames [start, end) of a video. `end=None` reads to the end of the file.
+
+    Each segment gets a fresh FaceMesh, so its tracking starts at the segment's
+    first frame as it would for a video of its own, rather than from whichever
+    segment this process handled before.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Error: Could not open video {video_path}")
+
+    mesh = _vp.create_face_mesh(static_image_mode=False)
+    try:
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        if end is None:
+            series, length = _vp.read_eye_tracking_series(cap, mesh=mesh)
+            return series[:length]
+
+        landmarks = np.empty((end - start, _vp.num_features), dtype=np.float32)
+        count = 0
+        while count < len(landmarks):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            landmarks[count] = _vp.extract_eye_tracking_data(frame, mesh)
+            count += 1
+    finally:
+        cap.release()
+        mesh.close()
+
+    return landmarks[:count]
+
+
+def _score_series(series: np.ndarray, stride: int, pad_last: bool) -> List[float]:
+    windows = _vp.build_windows(series, len(series), stride=stride, pad_last=pad_last)
+    if len(windows) == 0:
+        return []
+    return list(_vp.get_model().predict_on_batch(_vp.normalize_windows(windows))[:, 0])
+
+
+class VideoProcessPool:
+    """
+    Process videos on a pool of worker processes.
+
+    Every worker owns its FaceMesh and Keras model, loaded and warmed once when the
+    process starts. Short videos are processed whole by a single worker; videos longer
+    than `segment_frames` are split into frame segments whose landmarks are extracted
+    in parallel and merged back in frame order before scoring, so results do not
+    depend on which worker finished first.
+    """
+
+    def __init__(self, workers: int = None, segment_frames: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self.segment_frames = segment_frames
+        self._executor = None
+
+    def start(self):
+        """
+        Spawn and warm every worker so the first request does not pay for model loading.
+        """
+        if self._executor is None:
+            # Spawn rather than fork: TensorFlow and MediaPipe state must not be inherited
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        return self
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def process_video(self, video_path: str, stride: int, pad_last: bool = False) -> dict:
+        """
+        Process one video, splitting it into frame segments when it is long.
+        """
+        self.start()
+        segments = self._plan_segments(video_path)
+        if len(segments) <= 1:
+            return self._executor.submit(_process_whole_video, video_path, stride, pad_last).result()
+
+        futures = [self._executor.submit(_extract_segment, video_path, start, end) for start, end in segments]
+        series = np.concatenate([future.result() for future in futures])  # Merged in frame order
+        results = self._executor.submit(_score_series, series, stride, pad_last).result()
+        return {
+            "dyslexia_probability": np.mean(results),  # Average prediction across the video
+            "frames_analyzed": len(results),
+        }
+
+    def process_videos(self, video_paths: List[str], stride: int, pad_last: bool = False) -> List[dict]:
+        """
+        Process many whole videos in parallel. Results are returned in input order.
+        """
+        self.start()
+        futures = [self._executor.submit(_process_whole_video, path, stride, pad_last) for path in video_paths]
+        return [future.result() for future in futures]
+
+    def _plan_segments(self, video_path: str):
+        if not self.segment_frames:
+            return [(0, None)]
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Error: Could not open video {video_path}")
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        if frame_count <= self.segment_frames:
+            return [(0, None)]
+        segments = [(start, start + self.segment_frames) for start in range(0, frame_count, self.segment_frames)]
+        segments[-1] = (segments[-1][0], None)  # Last segment reads to the real end of file
+        return segments
@@ -1,30 +1,81 @@
+import threading
 import cv2
 import numpy as np
-import mediapipe as mp
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import StandardScaler
-# Import necessary functions for phonetics accuracy
-from app.utils.text_analysis import percentage_of_phonetic_accuraccy, spelling_accuracy
+from app.config import (
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    VIDEO_PROCESSING_MODE,
+    VIDEO_WINDOW_STRIDE,
+    VIDEO_PAD_LAST_WINDOW,
+    VIDEO_DECODE_WORKERS,
+    VIDEO_LANDMARK_WORKERS,
+    VIDEO_SCORING_WORKERS,
+    VIDEO_PIPELINE_QUEUE_SIZE,
+    VIDEO_POOL_WORKERS,
+    VIDEO_POOL_SEGMENT_FRAMES,
+)
+from app.services.inference_scheduler import InferenceScheduler
+from app.services.video_pipeline import VideoPipeline, padded_window_start
+from app.services.video_pool import VideoProcessPool
 
-# Load the trained model
-model = load_model("app/models/dyslexia_detection_model.h5")
-print("Model loaded successfully.")
-
-# Scaler
-scaler = StandardScaler()
+MODEL_PATH = "app/models/dyslexia_detection_model.h5"
 
 # Parameters
 time_steps = 100
 num_features = 4
 
-# MediaPipe
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+# TensorFlow, MediaPipe and the model are loaded on first use (see get_model / get_face_mesh)
+_model = None
+_face_mesh = None
+_load_lock = threading.Lock()
+
+def get_model():
+    """Load the trained model on first use."""
+    global _model
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                from tensorflow.keras.models import load_model
+                _model = load_model(MODEL_PATH)
+                print("Model loaded successfully.")
+    return _model
+
+def create_face_mesh(static_image_mode=False):
+    """
+    Create a FaceMesh instance. Instances are not thread-safe, so each worker needs its own.
+    With `static_image_mode`, every frame is detected independently instead of being
+    tracked from the previous one, for instances that do not see consecutive frames.
+    """
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=static_image_mode, min_detection_confidence=0.5, min_tracking_confidence=0.5
+    )
+
+def get_face_mesh():
+    """Shared FaceMesh instance used when the caller does not bring its own."""
+    global _face_mesh
+    if _face_mesh is None:
+        with _load_lock:
+            if _face_mesh is None:
+                _face_mesh = create_face_mesh()
+    return _face_mesh
+
+def warm_up():
+    """Load the model and FaceMesh and run each once so the first request is not slowed down."""
+    extract_eye_tracking_data(np.zeros((64, 64, 3), dtype=np.uint8))
+    get_model().predict_on_batch(np.zeros((1, time_steps, num_features), dtype=np.float32))
+
+# Batches windows from all videos being processed into shared model calls
+inference_scheduler = InferenceScheduler(
+    lambda batch: get_model().predict_on_batch(batch),
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_MAX_WAIT_MS,
+)
 
-def extract_eye_tracking_data(frame):
+def extract_eye_tracking_data(frame, mesh=None):
     """Extract eye tracking data from a single video frame."""
     rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = face_mesh.process(rgb_frame)
+    results = (mesh or get_face_mesh()).process(rgb_frame)
 
     if results.multi_face_landmarks:
         for landmarks in results.multi_face_landmarks:
@@ -42,13 +93,109 @@ def extract_eye_tracking_data(frame):
     # Return random values if no face is detected
     return np.random.random(), np.random.random(), np.random.random(), np.random.random()
 
-def process_video_for_dyslexia(video_path):
-    """Process the video to detect dyslexia using eye-tracking."""
-    cap = cv2.VideoCapture(video_path)
+def read_eye_tracking_series(cap, progress=None, mesh=None):
+    """
+    Read every frame of an opened video into one preallocated float32 landmark array.
 
-    if not cap.isOpened():
-        raise ValueError(f"Error: Could not open video {video_path}")
+    The buffer is sized from the container's frame count (plus room for padding the
+    last window) and only grows if the container under-reports its length.
+    Returns the buffer and the number of frames written to it. `progress`, if given,
+    is called with ("frames_decoded", frames=..., total_frames=...) every window's worth of frames.
+    `mesh` is the FaceMesh to use instead of the shared one.
+    """
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    capacity = max(frame_count, 0) + time_steps
+    series = np.empty((capacity, num_features), dtype=np.float32)
+    length = 0
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        if length == len(series):
+            grown = np.empty((len(series) * 2, num_features), dtype=np.float32)
+            grown[:length] = series[:length]
+            series = grown
+
+        series[length] = extract_eye_tracking_data(frame, mesh)
+        length += 1
+        if progress is not None and length % time_steps == 0:
+            progress("frames_decoded", frames=length, total_frames=frame_count)
+
+    if progress is not None:
+        progress("frames_decoded", frames=length, total_frames=frame_count)
+    return series, length
+
+def build_windows(series, length, stride=time_steps, pad_last=False):
+    """
+    Build all (time_steps, num_features) windows over the first `length` rows of `series`.
+
+    Windows start every `stride` frames, so a stride below `time_steps` gives
+    overlapping windows. With `pad_last`, the trailing partial window is completed by
+    repeating the last frame in place instead of being dropped. The result is a
+    zero-copy strided view of shape (n_windows, time_steps, num_features).
+    """
+    stride = max(1, int(stride))
+
+    last_start = padded_window_start(length, time_steps, stride) if pad_last else None
+    if last_start is not None:
+        padded_length = last_start + time_steps
+        if padded_length > len(series):
+            grown = np.empty((padded_length, num_features), dtype=np.float32)
+            grown[:length] = series[:length]
+            series = grown
+        series[length:padded_length] = series[length - 1]
+        length = padded_length
+
+    if length < time_steps:
+        return np.empty((0, time_steps, num_features), dtype=np.float32)
+
+    windows = np.lib.stride_tricks.sliding_window_view(series[:length], time_steps, axis=0)[::stride]
+    return windows.transpose(0, 2, 1)
 
+def normalize_windows(windows):
+    """
+    Standardize every window per feature in one vectorized pass.
+
+    Equivalent to running StandardScaler.fit_transform on each window separately.
+    """
+    mean = windows.mean(axis=1, keepdims=True)
+    std = windows.std(axis=1, keepdims=True)
+    std[std < 10 * np.finfo(np.float32).eps] = 1.0  # Constant features are left centered, as StandardScaler does
+    return ((windows - mean) / std).astype(np.float32, copy=False)
+
+def score_windows(windows):
+    """Normalize raw windows and return one dyslexia probability per window."""
+    return inference_scheduler.predict(normalize_windows(windows))[:, 0]
+
+def create_landmark_extractor():
+    """
+    Frame -> landmarks callable backed by its own FaceMesh instance. Pipeline
+    workers take frames from a shared queue, so each sees a non-contiguous subset:
+    the mesh detects every frame rather than tracking between frames it never saw.
+    """
+    mesh = create_face_mesh(static_image_mode=True)
+    return lambda frame: extract_eye_tracking_data(frame, mesh)
+
+# Created on first use of the "process_pool" mode
+_video_pool = None
+_video_pool_lock = threading.Lock()
+
+def get_video_pool():
+    """Process pool whose workers each own a FaceMesh and model instance."""
+    global _video_pool
+    with _video_pool_lock:
+        if _video_pool is None:
+            _video_pool = VideoProcessPool(workers=VIDEO_POOL_WORKERS, segment_frames=VIDEO_POOL_SEGMENT_FRAMES).start()
+    return _video_pool
+
+def _process_capture_streaming(cap, progress=None):
+    """Score each consecutive window as soon as its frames have been read."""
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     sequence = []
     results = []
 
@@ -65,13 +212,96 @@ def process_video_for_dyslexia(video_path):
             sequence_array = scaler.fit_transform(sequence_array).reshape(1, time_steps, num_features)
 
             # Predict dyslexia probability
-            prediction = model.predict(sequence_array)
+            prediction = inference_scheduler.predict(sequence_array)
             dyslexia_prob = prediction[0][0]
             results.append(dyslexia_prob)
+            if progress is not None:
+                progress("frames_decoded", frames=len(results) * time_steps, total_frames=frame_count)
+                progress("windows_scored", windows=len(results))
 
             sequence = []  # Reset sequence for the next batch
 
-    cap.release()
+    return results
+
+def _process_capture_vectorized(cap, stride, pad_last, progress=None):
+    """Read the whole landmark series, then normalize and score all windows at once."""
+    series, length = read_eye_tracking_series(cap, progress)
+    windows = build_windows(series, length, stride=stride, pad_last=pad_last)
+    if len(windows) == 0:
+        return []
+
+    results = list(score_windows(windows))
+    if progress is not None:
+        progress("windows_scored", windows=len(results))
+    return results
+
+def _process_video_pipelined(video_path, stride, pad_last, progress=None):
+    """Decode, extract landmarks and score windows in concurrent pipeline stages."""
+    pipeline = VideoPipeline(
+        video_path,
+        create_extractor=create_landmark_extractor,
+        score_windows=score_windows,
+        time_steps=time_steps,
+        num_features=num_features,
+        stride=stride,
+        pad_last=pad_last,
+        decode_workers=VIDEO_DECODE_WORKERS,
+        landmark_workers=VIDEO_LANDMARK_WORKERS,
+        scoring_workers=VIDEO_SCORING_WORKERS,
+        queue_size=VIDEO_PIPELINE_QUEUE_SIZE,
+        progress=progress,
+    )
+    output = pipeline.run()
+    return output["window_probabilities"], output["pipeline"]
+
+def process_video_for_dyslexia(video_path, mode=None, window_stride=None, pad_last_window=None, progress=None):
+    """
+    Process the video to detect dyslexia using eye-tracking.
+
+    Args:
+        video_path (str): Path to the video file.
+        mode (str): "vectorized" scores the whole video with one predict call,
+            "pipelined" runs decoding, landmark extraction and scoring as concurrent
+            stages, "process_pool" hands the video to a pool of worker processes,
+            "streaming" scores each window as it is read. Defaults to
+            VIDEO_PROCESSING_MODE.
+        window_stride (int): Frames between window starts (all modes but streaming).
+        pad_last_window (bool): Pad and score the trailing partial window (all modes
+            but streaming).
+        progress (Callable): Called with ("frames_decoded", frames=..., total_frames=...)
+            and ("windows_scored", windows=...) as the video is processed. Not
+            called in "process_pool" mode, whose work happens in other processes.
+    """
+    mode = mode or VIDEO_PROCESSING_MODE
+    window_stride = window_stride or VIDEO_WINDOW_STRIDE or time_steps
+    pad_last_window = VIDEO_PAD_LAST_WINDOW if pad_last_window is None else pad_last_window
+
+    if mode == "process_pool":
+        return get_video_pool().process_video(video_path, window_stride, pad_last_window)
+
+    if mode == "pipelined":
+        results, pipeline_stats = _process_video_pipelined(video_path, window_stride, pad_last_window, progress)
+        return {
+            "dyslexia_probability": np.mean(results),  # Average prediction across the video
+            "frames_analyzed": len(results),
+            "pipeline": pipeline_stats,
+        }
+
+    cap = cv2.VideoCapture(video_path)
+
+    if not cap.isOpened():
+        raise ValueError(f"Error: Could not open video {video_path}")
+
+    try:
+        if mode == "vectorized":
+            results = _process_capture_vectorized(cap, window_stride, pad_last_window, progress)
+        elif mode == "streaming":
+            results = _process_capture_streaming(cap, progress)
+        else:
+            raise ValueError(f"Unknown video processing mode: {mode}")
+    finally:
+        cap.release()
+
     return {
         "dyslexia_probability": np.mean(results),  # Average prediction across the video
         "frames_analyzed": len(results)
@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Dict, List
+
+
+def _warm_eye_tracking():
+    from app.services import video_processing
+    video_processing.warm_up()
+
+
+def _warm_text_analysis():
+    from app.services.ocr_service import get_ocr_pool
+    from app.utils.text_analysis import correct_text
+    from app.utils import phonetic_encoding
+
+    get_ocr_pool()
+    correct_text("warm up")  # Loads the spelling model
+    phonetic_encoding.warm_up()
+
+
+def _warm_speech():
+    import speech_recognition
+    import scipy.signal
+    from app.services import audio_enhancement
+    from app.services.speech_service import get_transcriber
+    from app.utils.ipa_transcription import precompute_reference_transcriptions
+
+    get_transcriber()
+    precompute_reference_transcriptions()
+
+
+def _warm_media():
+    from moviepy import VideoFileClip
+
+
+# Heavy components that are loaded lazily, in the order they are warmed
+COMPONENTS = {
+    "eye_tracking": _warm_eye_tracking,
+    "text_analysis": _warm_text_analysis,
+    "speech": _warm_speech,
+    "media": _warm_media,
+}
+
+_status: Dict[str, dict] = {name: {"state": "cold"} for name in COMPONENTS}
+_lock = threading.Lock()
+
+
+def warm_up(components: List[str] = None) -> Dict[str, dict]:
+    """
+    Load the given components (all by default) and record how long each took.
+    Components that are already warm are skipped.
+    """
+    for name in components or list(COMPONENTS):
+        if name not in COMPONENTS:
+            raise ValueError(f"Unknown component: {name}")
+
+        with _lock:
+            if _status[name]["state"] in ("ready", "warming"):
+                continue
+            _status[name] = {"state": "warming"}
+
+        started = time.monotonic()
+        try:
+            COMPONENTS[name]()
+            _status[name] = {"state": "ready", "seconds": round(time.monotonic() - started, 3)}
+        except Exception as e:
+            _status[name] = {"state": "failed", "error": str(e)}
+
+    return get_status()
+
+
+def get_status() -> Dict[str, dict]:
+    with _lock:
+        return {name: dict(status) for name, status in _status.items()}
+
+
+def is_ready(components: List[str]) -> bool:
+    """
+    True once every required component has been warmed successfully.
+    """
+    status = get_status()
+    return all(status[name]["state"] == "ready" for name in components)
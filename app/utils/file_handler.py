@@ -0,0 +1,97 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES, UPLOAD_STORE_DIR
+
+_SHA256_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _stream_to(source, out, max_bytes: int):
+    """
+    Copy a file object into `out` chunk by chunk, hashing as it goes.
+    Returns the number of bytes copied and the SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {max_bytes} bytes.")
+        digest.update(chunk)
+        out.write(chunk)
+    return size, digest.hexdigest()
+
+
+def content_path(sha256: str, extension: str = "") -> str:
+    """
+    Location of a stored upload in the content-addressed store.
+    """
+    return os.path.join(UPLOAD_STORE_DIR, sha256[:2], sha256 + extension)
+
+
+def media_hash(path: str) -> Optional[str]:
+    """
+    SHA-256 of a file saved in the content-addressed store, read from its name.
+    Returns None for files stored elsewhere.
+    """
+    if not path:
+        return None
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem if _SHA256_NAME.match(stem) else None
+
+
+def _store_in_chunks(source, extension: str, max_bytes: int) -> dict:
+    """
+    Stream a file object into the content-addressed store. If a file with the
+    same content is already stored, the new copy is discarded.
+    """
+    os.makedirs(UPLOAD_STORE_DIR, exist_ok=True)
+    fd, partial_path = tempfile.mkstemp(dir=UPLOAD_STORE_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            size, sha256 = _stream_to(source, out, max_bytes)
+
+        destination = content_path(sha256, extension)
+        deduplicated = os.path.exists(destination)
+        if deduplicated:
+            os.remove(partial_path)
+        else:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(partial_path, destination)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return {"path": destination, "size": size, "sha256": sha256, "deduplicated": deduplicated}
+
+
+def _check_declared_size(upload: UploadFile, max_bytes: int):
+    # Reject early when the client declared the size
+    if upload.size is not None and upload.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {max_bytes} bytes.")
+
+
+async def store_upload(upload: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+    """
+    Stream an uploaded file into the content-addressed store (UPLOAD_STORE_DIR).
+
+    The file is saved as <sha256><extension>, so re-uploads of the same content
+    map to the same path and are only stored once. Reading, hashing and writing
+    run in the threadpool in fixed-size chunks, so memory use does not depend on
+    the file size. Uploads larger than `max_bytes` are rejected with 413.
+
+    Returns:
+        dict: The stored file's path, size, SHA-256 hex digest and whether an
+        identical file was already stored ("deduplicated").
+    """
+    _check_declared_size(upload, max_bytes)
+    extension = os.path.splitext(upload.filename or "")[1].lower()
+    return await run_in_threadpool(_store_in_chunks, upload.file, extension, max_bytes)
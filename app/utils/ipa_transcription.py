@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Iterable
+from app.config import IPA_CACHE_SIZE
+from app.utils.vocabulary import AGE_BASED_PHRASES, DEFAULT_TEST_WORDS, LEVEL_VOCABULARY
+
+
+@lru_cache(maxsize=IPA_CACHE_SIZE)
+def transcribe_word(word: str) -> str:
+    """
+    IPA transcription of a single word, memoized in a bounded LRU cache.
+    """
+    import eng_to_ipa as ipa
+
+    return ipa.convert(word)
+
+
+def transcribe_text(text: str) -> str:
+    """
+    IPA transcription of a whitespace-separated text, one cached lookup per word.
+    Produces the same output as eng_to_ipa.convert on the whole text.
+    """
+    return " ".join(transcribe_word(word) for word in text.split())
+
+
+@lru_cache(maxsize=256)
+def _reference_phonetics(words: tuple) -> str:
+    return " ".join(transcribe_text(word) for word in words)
+
+
+def reference_phonetics(words: Iterable[str]) -> str:
+    """
+    Joined IPA transcription of a list of reference words or phrases.
+    """
+    return _reference_phonetics(tuple(words))
+
+
+def precompute_reference_transcriptions():
+    """
+    Transcribe every built-in vocabulary and dictation phrase ahead of time.
+    """
+    reference_phonetics(DEFAULT_TEST_WORDS)
+    for words in LEVEL_VOCABULARY.values():
+        reference_phonetics(words)
+    for phrases in AGE_BASED_PHRASES.values():
+        reference_phonetics(phrases)
+        for phrase in phrases:
+            reference_phonetics([phrase])
+
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counts of the word and reference transcription caches.
+    """
+    stats = {}
+    for name, cached in (("words", transcribe_word), ("references", _reference_phonetics)):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
@@ -1,29 +1,107 @@
 # app/utils/levenshtein.py
+from typing import Dict, Iterable, List, Optional
 
-def levenshtein(s1: str, s2: str) -> int:
+
+def _pattern_bitmasks(pattern: str) -> Dict[str, int]:
+    """
+    Map each character of the pattern to a bitmask of the positions it occupies.
+    """
+    peq: Dict[str, int] = {}
+    bit = 1
+    for c in pattern:
+        peq[c] = peq.get(c, 0) | bit
+        bit <<= 1
+    return peq
+
+
+def _bit_parallel_distance(peq: Dict[str, int], m: int, text: str, max_distance: Optional[int]) -> int:
+    """
+    Myers/Hyyrö bit-parallel edit distance between a preprocessed pattern of length m
+    and `text`. Python integers act as bit vectors of any length, so every text
+    character costs a handful of word operations instead of a full DP row.
+    """
+    n = len(text)
+    if m == 0:
+        return n
+
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = full  # Vertical positive deltas
+    mv = 0     # Vertical negative deltas
+    score = m
+
+    for j, c in enumerate(text, 1):
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+
+        # The distance can drop by at most one per remaining text character
+        if max_distance is not None and score - (n - j) > max_distance:
+            return max_distance + 1
+
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+
+    return score
+
+
+def levenshtein(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
     """
     Compute the Levenshtein distance between two strings.
 
     Args:
         s1 (str): The first string.
         s2 (str): The second string.
+        max_distance (int, optional): Stop as soon as the distance is known to exceed
+            this threshold and return max_distance + 1.
 
     Returns:
-        int: The Levenshtein distance between the two strings.
+        int: The Levenshtein distance between the two strings (capped at
+        max_distance + 1 when a threshold is given).
     """
+    if s1 == s2:
+        return 0
     if len(s1) < len(s2):
-        return levenshtein(s2, s1)
+        s1, s2 = s2, s1
+    if max_distance is not None and len(s1) - len(s2) > max_distance:
+        return max_distance + 1
     if not s2:
         return len(s1)
 
-    prev_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        curr_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = prev_row[j + 1] + 1
-            deletions = curr_row[j] + 1
-            substitutions = prev_row[j] + (c1 != c2)
-            curr_row.append(min(insertions, deletions, substitutions))
-        prev_row = curr_row
-
-    return prev_row[-1]
+    # The shorter string becomes the bit-vector pattern
+    return _bit_parallel_distance(_pattern_bitmasks(s2), len(s2), s1, max_distance)
+
+
+class LevenshteinReference:
+    """
+    A reference string preprocessed once for scoring many candidates against it.
+    """
+
+    def __init__(self, reference: str):
+        self.reference = reference
+        self._peq = _pattern_bitmasks(reference)
+
+    def distance(self, candidate: str, max_distance: Optional[int] = None) -> int:
+        """
+        Levenshtein distance from the reference to `candidate`.
+        """
+        if max_distance is not None and abs(len(candidate) - len(self.reference)) > max_distance:
+            return max_distance + 1
+        return _bit_parallel_distance(self._peq, len(self.reference), candidate, max_distance)
+
+
+def batch_levenshtein(reference: str, candidates: Iterable[str], max_distance: Optional[int] = None) -> List[int]:
+    """
+    Levenshtein distances from one reference string to each candidate.
+    """
+    scorer = LevenshteinReference(reference)
+    return [scorer.distance(candidate, max_distance) for candidate in candidates]
@@ -0,0 +1,83 @@
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+from app.config import PHONETIC_CACHE_SIZE
+
+# Phonetic algorithms available for scoring, by name
+PHONETIC_ALGORITHMS = ("soundex", "metaphone", "caverphone", "nysiis")
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def _create_encoder(algorithm: str):
+    from abydos.phonetic import Caverphone, Metaphone, NYSIIS, Soundex
+
+    classes = {"soundex": Soundex, "metaphone": Metaphone, "caverphone": Caverphone, "nysiis": NYSIIS}
+    if algorithm not in classes:
+        raise ValueError(f"Unknown phonetic algorithm: {algorithm}")
+    return classes[algorithm]()
+
+
+def get_encoder(algorithm: str):
+    """
+    The encoder for `algorithm`, created once and kept for the life of the process.
+    """
+    encoder = _encoders.get(algorithm)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.get(algorithm)
+            if encoder is None:
+                encoder = _encoders[algorithm] = _create_encoder(algorithm)
+    return encoder
+
+
+@lru_cache(maxsize=PHONETIC_CACHE_SIZE)
+def encode_word(algorithm: str, word: str) -> str:
+    """
+    Phonetic code of a single word, memoized per (algorithm, word) in a bounded LRU cache.
+    """
+    return get_encoder(algorithm).encode(word)
+
+
+def encode_all(word: str, algorithms: Sequence[str] = PHONETIC_ALGORITHMS) -> Tuple[str, ...]:
+    """
+    Codes of one word under every algorithm, in the order of `algorithms`.
+    """
+    return tuple(encode_word(algorithm, word) for algorithm in algorithms)
+
+
+def encode_tokens(tokens: Iterable[str], algorithms: Sequence[str] = PHONETIC_ALGORITHMS) -> Dict[str, List[str]]:
+    """
+    Codes of a batch of tokens under every algorithm: {algorithm: [code per token]}.
+    Each distinct token is encoded once per batch.
+    """
+    tokens = list(tokens)
+    codes = {token: encode_all(token, algorithms) for token in dict.fromkeys(tokens)}
+    return {
+        algorithm: [codes[token][index] for token in tokens]
+        for index, algorithm in enumerate(algorithms)
+    }
+
+
+def warm_up():
+    """
+    Create every encoder ahead of the first request.
+    """
+    for algorithm in PHONETIC_ALGORITHMS:
+        encode_word(algorithm, "warm")
+
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counts of the (algorithm, word) cache.
+    """
+    info = encode_word.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
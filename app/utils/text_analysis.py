@@ -1,37 +1,87 @@
-import cv2
-import tempfile
-import pyttsx3
-import pytesseract
-from textblob import TextBlob
-import speech_recognition as sr
+import re
+from functools import lru_cache
+from typing import List, Union
+from app.config import TEXT_CORRECTION_CACHE_SIZE
+from app.services.ocr_service import ocr_page
+from app.utils.levenshtein import levenshtein
+from app.utils.phonetic_encoding import PHONETIC_ALGORITHMS, encode_tokens
+# textblob (and abydos, in app.utils.phonetic_encoding) are imported on first use to keep API startup fast
 
-from abydos.phonetic import Soundex, Metaphone, Caverphone, NYSIIS
+# The tokenization TextBlob.correct() uses: a word, a punctuation mark or a whitespace character
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|\s")
 
 def extract_text_from_image(image_path: str) -> str:
     """
-    Extract text from a handwriting sample using OCR.
+    Extract text from a handwriting sample using OCR (see app.services.ocr_service).
     """
-    image = cv2.imread(image_path)
-    text = pytesseract.image_to_string(image)
-    return text
+    return ocr_page(image_path)
 
-def spelling_accuracy(text: str) -> float:
+@lru_cache(maxsize=TEXT_CORRECTION_CACHE_SIZE)
+def correct_token(token: str) -> str:
+    """
+    Spelling correction of a single token, as TextBlob.correct() does it, cached
+    since the same words recur across texts.
+    """
+    from textblob import Word
+
+    return str(Word(token).correct())
+
+def correct_text(text: str) -> str:
+    """
+    Same result as str(TextBlob(text).correct()), correcting each distinct token once.
+    """
+    return "".join(correct_token(token) for token in _TOKEN_PATTERN.findall(text))
+
+def correction_cache_stats() -> dict:
+    info = correct_token.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
+
+class TextAnalysisContext:
+    """
+    One text prepared for analysis: tokenized once and spelling-corrected at
+    most once, however many metrics use it.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.words: List[str] = text.split()
+        self._corrected_text = None
+
+    @property
+    def corrected_text(self) -> str:
+        if self._corrected_text is None:
+            self._corrected_text = correct_text(self.text)
+        return self._corrected_text
+
+    @property
+    def corrected_words(self) -> List[str]:
+        return self.corrected_text.split()
+
+def _context(text: Union[str, TextAnalysisContext]) -> TextAnalysisContext:
+    return text if isinstance(text, TextAnalysisContext) else TextAnalysisContext(text)
+
+def spelling_accuracy(text: Union[str, TextAnalysisContext]) -> float:
     """
     Calculate spelling accuracy based on TextBlob corrections.
     """
-    corrected_text = str(TextBlob(text).correct())
-    errors = levenshtein(text, corrected_text)
-    return 100 * (1 - errors / max(len(text), 1))
+    context = _context(text)
+    errors = levenshtein(context.text, context.corrected_text)
+    return 100 * (1 - errors / max(len(context.text), 1))
 
-def phonetic_accuracy(text: str) -> float:
+def phonetic_accuracy(text: Union[str, TextAnalysisContext]) -> float:
     """
     Calculate phonetic accuracy using Soundex and other algorithms.
     """
-    soundex = Soundex()
-    metaphone = Metaphone()
-    original_phonetics = [soundex.encode(word) for word in text.split()]
-    corrected_text = str(TextBlob(text).correct())
-    corrected_phonetics = [soundex.encode(word) for word in corrected_text.split()]
+    context = _context(text)
+    original_phonetics = encode_tokens(context.words, ["soundex"])["soundex"]
+    corrected_phonetics = encode_tokens(context.corrected_words, ["soundex"])["soundex"]
     errors = levenshtein(" ".join(original_phonetics), " ".join(corrected_phonetics))
     return 100 * (1 - errors / max(len(original_phonetics), 1))
 
@@ -40,48 +90,28 @@ def process_handwriting_analysis(image_path: str) -> dict:
     Perform text analysis on extracted handwriting text.
     """
     text = extract_text_from_image(image_path)
+    # All metrics share one spelling correction pass
+    context = TextAnalysisContext(text)
     return {
         "text": text,
-        "spelling_accuracy": spelling_accuracy(text),
-        "phonetic_accuracy": phonetic_accuracy(text),
+        "spelling_accuracy": spelling_accuracy(context),
+        "phonetic_accuracy": phonetic_accuracy(context),
+        "phonetic_similarity": percentage_of_phonetic_accuraccy(context),
     }
 
-def levenshtein(s1: str, s2: str) -> int:
-    """
-    Calculate Levenshtein distance between two strings.
-    """
-    if len(s1) < len(s2):
-        return levenshtein(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
-
-
-
-def percentage_of_phonetic_accuraccy(extracted_text: str) -> float:
+def percentage_of_phonetic_accuraccy(extracted_text: Union[str, TextAnalysisContext]) -> float:
     """
     Calculate phonetic accuracy using Soundex, Metaphone, Caverphone, and NYSIIS.
     """
-    soundex = Soundex()
-    metaphone = Metaphone()
-    caverphone = Caverphone()
-    nysiis = NYSIIS()
-    spell_corrected = TextBlob(extracted_text).correct()
+    context = _context(extracted_text)
+    original_codes = encode_tokens(context.words)
+    corrected_codes = encode_tokens(context.corrected_words)
 
     phonetics_scores = []
 
-    for encoding in [soundex, metaphone, caverphone, nysiis]:
-        original = " ".join([encoding.encode(word) for word in extracted_text.split()])
-        corrected = " ".join([encoding.encode(word) for word in spell_corrected.split()])
+    for algorithm in PHONETIC_ALGORITHMS:
+        original = " ".join(original_codes[algorithm])
+        corrected = " ".join(corrected_codes[algorithm])
         score = (len(original) - levenshtein(original, corrected)) / (len(original) + 1)
         phonetics_scores.append(score)
 
@@ -0,0 +1,35 @@
+# Built-in test vocabularies shared by the phonetics and dictation code
+
+# Default words read aloud in the eye-tracking/phonetics session
+DEFAULT_TEST_WORDS = ["fish", "dog", "cat", "orange", "apple"]
+
+# Predefined vocabulary sets per difficulty level
+LEVEL_VOCABULARY = {
+    1: ["fish", "dog", "cat", "orange", "apple"],
+    2: ["banana", "elephant", "dinosaur", "pineapple", "strawberry"],
+}
+
+# Define age-based phrases
+AGE_BASED_PHRASES = {
+    "under_7": [
+        "The cat is on the mat.",
+        "I like my red ball.",
+        "It is a sunny day.",
+        "We go to the park.",
+        "I love my dog."
+    ],
+    "under_14": [
+        "The river flows through the valley.",
+        "Science is an interesting subject.",
+        "We learn new things every day.",
+        "Teamwork helps us succeed.",
+        "Reading books expands our knowledge."
+    ],
+    "under_21": [
+        "The advancements in technology are remarkable.",
+        "Environmental conservation is crucial for our planet.",
+        "Education shapes the future of our society.",
+        "Artificial intelligence is transforming industries.",
+        "Climate change demands immediate attention."
+    ]
+}
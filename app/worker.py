@@ -0,0 +1,183 @@
+"""
+Standalone task worker.
+
+Claims queued tasks from the `tasks` table with a lease, processes them and
+records the result. Run any number of workers on any number of nodes against
+the same database:
+
+    python -m app.worker --threads 4
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from app.config import (
+    DB_MIGRATE_ON_STARTUP,
+    TASK_CLAIM_BATCH_SIZE,
+    TASK_LEASE_SECONDS,
+    TASK_PARTIAL_RESULTS,
+    TASK_WRITE_BEHIND,
+    TASK_WRITE_BEHIND_MAX_DELAY,
+    WORKER_POLL_INTERVAL,
+)
+from app.db.crud import claim_tasks, finish_tasks, release_tasks, requeue_expired_leases
+from app.db.models import SessionLocal, init_db
+from app.db.schemas import task_result
+from app.db.write_buffer import TaskUpdateBuffer
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(
+    worker_id: str,
+    stop: threading.Event,
+    process=None,
+    session_factory=SessionLocal,
+    lease_seconds: float = TASK_LEASE_SECONDS,
+    poll_interval: float = WORKER_POLL_INTERVAL,
+    exit_when_idle: bool = False,
+    batch_size: int = TASK_CLAIM_BATCH_SIZE,
+    write_behind: bool = TASK_WRITE_BEHIND,
+) -> int:
+    """
+    Claim and process tasks until `stop` is set. Returns the number of tasks handled.
+
+    Args:
+        worker_id (str): Unique name recorded as the lease owner.
+        stop (threading.Event): Set to finish the current task and exit.
+        process (Callable): Task -> result dict. Defaults to the full analysis pipeline.
+        session_factory (Callable): Creates database sessions.
+        lease_seconds (float): Lease length, renewed by a heartbeat while processing.
+        poll_interval (float): Seconds to wait when the queue is empty.
+        exit_when_idle (bool): Return as soon as the queue is empty (used for draining and benchmarks).
+        batch_size (int): Tasks claimed per claim statement. Outcomes of a batch are
+            written together in one transaction.
+        write_behind (bool): Buffer outcomes across batches and write them every
+            TASK_WRITE_BEHIND_MAX_DELAY seconds (see app.db.write_buffer).
+    """
+    from app.services.progress import publish_progress
+    from app.services.task_processing import LeaseHeartbeat
+
+    if process is None:
+        from app.services.task_processing import partial_result_saver, process_task
+
+        def process(task):
+            on_result = partial_result_saver(task.id, worker_id, session_factory) if TASK_PARTIAL_RESULTS else None
+            return process_task(task, on_result)
+
+    def publish_outcomes(outcomes):
+        # For clients streaming progress from this process, once the outcomes are stored
+        for task_id, status, result in outcomes:
+            publish_progress(task_id, status, result=result)
+
+    handled = 0
+    next_requeue = 0.0
+    buffer = TaskUpdateBuffer(
+        worker_id,
+        max_delay=TASK_WRITE_BEHIND_MAX_DELAY,
+        session_factory=session_factory,
+        on_flush=publish_outcomes,
+    ) if write_behind else None
+    db = session_factory()
+    try:
+        while not stop.is_set():
+            # Checking for expired leases costs a write, so not on every claim
+            if time.monotonic() >= next_requeue:
+                requeue_expired_leases(db)
+                next_requeue = time.monotonic() + min(lease_seconds / 3, 10.0)
+
+            tasks = claim_tasks(db, worker_id, batch_size, lease_seconds)
+            if not tasks:
+                if buffer is not None:
+                    buffer.flush()
+                if exit_when_idle:
+                    break
+                stop.wait(poll_interval)
+                continue
+
+            outcomes = []
+            started = set()
+            with LeaseHeartbeat([task.id for task in tasks], worker_id, lease_seconds, session_factory) as heartbeat:
+                for task in tasks:
+                    if stop.is_set():
+                        break
+                    started.add(task.id)
+                    try:
+                        outcome = (task.id, "completed", task_result(process(task)))
+                    except Exception as e:
+                        outcome = (task.id, "failed", task_result(error=str(e)))
+                        logger.exception("Task %s failed on %s", task.id, worker_id)
+                    if buffer is not None:
+                        # Stored by the buffer within TASK_WRITE_BEHIND_MAX_DELAY, well inside the
+                        # lease the heartbeat last renewed. Once stored the task is no longer
+                        # held, so renewing it would look like a lost lease. Its progress is
+                        # published by the buffer after the write.
+                        heartbeat.release(task.id)
+                        buffer.add(*outcome)
+                    else:
+                        # Kept in the heartbeat until the batch's outcomes are written below
+                        outcomes.append(outcome)
+                    handled += 1
+
+                finish_tasks(db, worker_id, outcomes)
+                # Claimed but not started because the worker is stopping
+                unprocessed = [task.id for task in tasks if task.id not in started]
+                if unprocessed:
+                    release_tasks(db, unprocessed, worker_id)
+
+            publish_outcomes(outcomes)
+    finally:
+        if buffer is not None:
+            buffer.close()
+        db.close()
+    return handled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued detection tasks.")
+    parser.add_argument("--threads", type=int, default=1, help="Worker threads in this process")
+    parser.add_argument("--lease-seconds", type=float, default=TASK_LEASE_SECONDS)
+    parser.add_argument("--poll-interval", type=float, default=WORKER_POLL_INTERVAL)
+    parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    parser.add_argument("--batch-size", type=int, default=TASK_CLAIM_BATCH_SIZE, help="Tasks claimed at once")
+    parser.add_argument("--write-behind", action="store_true", default=TASK_WRITE_BEHIND, help="Buffer task outcomes and write them in batches")
+    args = parser.parse_args()
+
+    if DB_MIGRATE_ON_STARTUP:
+        init_db()
+
+    stop = threading.Event()
+    # Finish the task in hand, then exit
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(f"{prefix}-{i}", stop),
+            kwargs={
+                "lease_seconds": args.lease_seconds,
+                "poll_interval": args.poll_interval,
+                "exit_when_idle": args.drain,
+                "batch_size": args.batch_size,
+                "write_behind": args.write_behind,
+            },
+        )
+        for i in range(args.threads)
+    ]
+
+    print(f"Worker {prefix} started with {args.threads} thread(s).")
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Worker {prefix} stopped after {time.monotonic() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark the in-memory audio preprocessing pipeline, per minute of audio.
+Run from the repository root:
+
+    python benchmarks/audio_enhancement.py
+
+The input is a synthetic 44.1 kHz stereo WAV (speech-like bursts, background
+noise, a DC offset and leading/trailing silence). The baseline is the previous
+path: pydub converts it to a 16 kHz mono WAV file, which sr.AudioFile reads back.
+"""
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, ".")
+
+from app.services import audio_enhancement as enhancement
+
+SOURCE_RATE = 44100
+
+
+def write_recording(path: str, seconds: float, rng: np.random.Generator):
+    samples = rng.normal(0, 0.003, int(seconds * SOURCE_RATE))  # Background noise
+    position = 2 * SOURCE_RATE  # Two seconds of silence before the first word
+    while position < len(samples) - 3 * SOURCE_RATE:
+        length = int(rng.uniform(0.3, 1.0) * SOURCE_RATE)
+        t = np.arange(length) / SOURCE_RATE
+        samples[position:position + length] += 0.2 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) * np.hanning(length)
+        position += length + int(rng.uniform(0.3, 0.8) * SOURCE_RATE)
+    samples += 0.05  # DC offset
+    stereo = np.repeat((np.clip(samples, -1, 1) * 32767).astype("<i2")[:, None], 2, axis=1)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(SOURCE_RATE)
+        wav.writeframes(stereo.tobytes())
+
+
+def baseline(path: str, output_path: str):
+    """The conversion this pipeline replaced, kept here as the baseline."""
+    import speech_recognition as sr
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path)
+    audio.set_channels(1).set_frame_rate(16000).export(output_path, format="wav")
+    with sr.AudioFile(output_path) as source:
+        return sr.Recognizer().record(source)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    try:
+        import imageio_ffmpeg
+        from pydub import AudioSegment
+
+        AudioSegment.converter = imageio_ffmpeg.get_ffmpeg_exe()
+    except ImportError:
+        pass
+
+    # Import scipy.signal ahead of the timings, as the speech warm-up does
+    import scipy.signal  # noqa: F401
+
+    rng = np.random.default_rng(0)
+    directory = tempfile.mkdtemp()
+    print(f"{'stage':>20} {'ms per minute of audio':>24}")
+    for minutes in (1, 5):
+        path = os.path.join(directory, f"recording-{minutes}.wav")
+        write_recording(path, minutes * 60, rng)
+
+        stages = {}
+        samples, stages["decode"] = timed(enhancement.decode_audio, path)
+        samples, rate = samples
+        samples, stages["resample"] = timed(enhancement.resample, samples, rate)
+        samples, stages["remove_dc"] = timed(enhancement.remove_dc, samples)
+        trimmed, stages["trim_silence"] = timed(enhancement.trim_silence, samples, 16000)
+        gated, stages["noise_gate"] = timed(enhancement.noise_gate, trimmed, 16000)
+        normalized, stages["normalize_loudness"] = timed(enhancement.normalize_loudness, gated)
+        _, stages["to_audio_data"] = timed(enhancement.to_audio_data, normalized, 16000)
+        audio, total = timed(enhancement.load_audio_for_recognition, path)
+
+        print(f"-- {minutes} min at 44.1 kHz stereo -> {len(audio.frame_data) / 2 / 16000:.1f} s after trimming")
+        for stage, seconds in stages.items():
+            print(f"{stage:>20} {seconds * 1000 / minutes:>24.1f}")
+        print(f"{'total (in memory)':>20} {total * 1000 / minutes:>24.1f}")
+        try:
+            _, old = timed(baseline, path, os.path.join(directory, "converted.wav"))
+            print(f"{'pydub + temp WAV':>20} {old * 1000 / minutes:>24.1f}")
+        except Exception as e:
+            print(f"{'pydub + temp WAV':>20} {'unavailable: ' + str(e)[:40]:>24}")
+
+
+if __name__ == "__main__":
+    main()
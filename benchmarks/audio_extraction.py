@@ -0,0 +1,92 @@
+"""
+Compare the previous two-pass audio path (moviepy full-rate WAV, then pydub
+resampling to 16 kHz mono) with the single-pass ffmpeg demux. Reports bytes
+written and processing time per minute of video. Run from the repository root:
+
+    python benchmarks/audio_extraction.py [VIDEO]
+
+Without VIDEO a 2-minute test clip (640x480, 44.1 kHz stereo) is generated.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from app.services.audio_processing import _ffmpeg_executable, extract_audio, extract_audio_pcm
+
+
+def make_test_video(path: str, seconds: int):
+    subprocess.run(
+        [
+            _ffmpeg_executable(), "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc=size=640x480:rate=30:duration={seconds}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={seconds}",
+            "-ac", "2", "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-shortest", path,
+        ],
+        check=True,
+    )
+
+
+def duration_minutes(path: str) -> float:
+    from moviepy import VideoFileClip
+
+    with VideoFileClip(path) as clip:
+        return clip.duration / 60.0
+
+
+def two_pass(video_path: str, directory: str) -> int:
+    """The old path: VideoFileClip(...).audio.write_audiofile, then pydub conversion."""
+    from moviepy import VideoFileClip
+    from pydub import AudioSegment
+
+    full_rate = os.path.join(directory, "full_rate.wav")
+    with VideoFileClip(video_path) as clip:
+        clip.audio.write_audiofile(full_rate, logger=None)
+    converted = os.path.join(directory, "converted.wav")
+    AudioSegment.from_file(full_rate).set_channels(1).set_frame_rate(16000).export(converted, format="wav")
+    return os.path.getsize(full_rate) + os.path.getsize(converted)
+
+
+def single_pass_file(video_path: str, directory: str) -> int:
+    audio_path = os.path.join(directory, "audio.wav")
+    extract_audio(video_path, audio_path)
+    return os.path.getsize(audio_path)
+
+
+def single_pass_memory(video_path: str, directory: str) -> int:
+    extract_audio_pcm(video_path)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?")
+    parser.add_argument("--seconds", type=int, default=120, help="Length of the generated test clip")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = args.video
+        if video_path is None:
+            video_path = os.path.join(tmp, "test.mp4")
+            make_test_video(video_path, args.seconds)
+        minutes = duration_minutes(video_path)
+
+        print(f"{'method':<28} {'bytes written':>14} {'s per video-minute':>20}")
+        for name, method in (
+            ("moviepy + pydub (old)", two_pass),
+            ("ffmpeg single pass, file", single_pass_file),
+            ("ffmpeg single pass, memory", single_pass_memory),
+        ):
+            with tempfile.TemporaryDirectory(dir=tmp) as work:
+                started = time.perf_counter()
+                written = method(video_path, work)
+                elapsed = time.perf_counter() - started
+            print(f"{name:<28} {written:>14,} {elapsed / minutes:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Drain a backlog of zero-work tasks to measure what task state transitions cost
+in database round trips and commits. Compares the old per-task pattern
+(SELECT + commit + refresh for every status change) with lease-based workers
+claiming one task or a batch at a time, with and without the write-behind
+buffer. Run from the repository root:
+
+    python benchmarks/bulk_task_updates.py --tasks 10000 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.db.crud import get_queued_tasks
+from app.db.engine import create_db_engine
+from app.db.models import Base, Task
+from app.db.schemas import task_result
+from app.worker import run_worker
+
+
+def make_database(path: str, tasks: int):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Task), [{"user_id": f"user-{i % 50}", "status": "queued"} for i in range(tasks)])
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def old_update_task_status(db, task_id, status, result=None):
+    """update_task_status as it was: SELECT, commit, refresh."""
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if task:
+        task.status = status
+        task.result = result
+        db.commit()
+        db.refresh(task)
+    return task
+
+
+def run_old_loop(session_factory, workers: int):
+    db = session_factory()
+    for task in get_queued_tasks(db):
+        old_update_task_status(db, task.id, "processing")
+        old_update_task_status(db, task.id, "completed", result=task_result({}))
+    db.close()
+
+
+def run_workers(session_factory, workers: int, batch_size: int, write_behind: bool):
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(f"bench-{i}", threading.Event()),
+            kwargs={
+                "process": lambda task: {},
+                "session_factory": session_factory,
+                "exit_when_idle": True,
+                "batch_size": batch_size,
+                "write_behind": write_behind,
+            },
+        )
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    variants = [
+        ("old per-task updates (1 loop)", lambda f: run_old_loop(f, args.workers)),
+        (f"{args.workers} workers, claim 1", lambda f: run_workers(f, args.workers, 1, False)),
+        (f"{args.workers} workers, claim {args.batch_size}", lambda f: run_workers(f, args.workers, args.batch_size, False)),
+        (f"{args.workers} workers, claim 1, write-behind", lambda f: run_workers(f, args.workers, 1, True)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, run) in enumerate(variants):
+            session_factory = make_database(os.path.join(tmp, f"{i}.db"), args.tasks)
+            started = time.perf_counter()
+            run(session_factory)
+            elapsed = time.perf_counter() - started
+
+            db = session_factory()
+            done = db.query(Task).filter(Task.status == "completed").count()
+            db.close()
+            print(f"{name:<40} {args.tasks / elapsed:10.1f} tasks/s  ({elapsed:6.2f}s, {done}/{args.tasks} completed)")
+
+
+if __name__ == "__main__":
+    main()
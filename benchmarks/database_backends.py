@@ -0,0 +1,102 @@
+"""
+Exercise the engine layer (app.db.engine) with the task workload: several
+lease-based workers draining a queue while another thread pages through the
+task listing. Compares SQLite with its old defaults (rollback journal,
+synchronous=FULL) against WAL + synchronous=NORMAL, plus any extra database
+URLs given, e.g. a local PostgreSQL. Run from the repository root:
+
+    python benchmarks/database_backends.py --tasks 2000 --workers 8
+    python benchmarks/database_backends.py --url postgresql+psycopg2://postgres@localhost/bench
+
+Extra URLs must point at a scratch database: its tables are dropped and recreated.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.db.crud import create_task, list_tasks
+from app.db.engine import create_db_engine, run_migrations
+from app.db.models import Base
+from app.worker import run_worker
+
+
+def prepare(engine, url: str, tasks: int):
+    with engine.begin() as connection:
+        Base.metadata.drop_all(bind=connection)
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    run_migrations(url)
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    for i in range(tasks):
+        create_task(db, user_id=f"user-{i % 50}")
+    db.close()
+    return session_factory
+
+
+def run(name: str, url: str, tasks: int, workers: int, **engine_options):
+    engine = create_db_engine(url, **engine_options)
+    session_factory = prepare(engine, url, tasks)
+
+    stop = threading.Event()
+    reads = []
+
+    def read_listing():
+        db = session_factory()
+        while not stop.is_set():
+            started = time.perf_counter()
+            list_tasks(db, status="completed", limit=100)
+            reads.append(time.perf_counter() - started)
+        db.close()
+
+    reader = threading.Thread(target=read_listing)
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(f"bench-{i}", threading.Event()),
+            kwargs={"process": lambda task: {}, "session_factory": session_factory, "exit_when_idle": True},
+        )
+        for i in range(workers)
+    ]
+
+    started = time.perf_counter()
+    reader.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reader.join()
+    engine.dispose()
+
+    reads.sort()
+    p95 = reads[int(len(reads) * 0.95)] * 1000 if reads else 0.0
+    print(f"{name:<32} {tasks / elapsed:10.1f} tasks/s {len(reads):8d} reads   p95 read {p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--url", action="append", default=[], help="Extra database URL to benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("sqlite, rollback journal, FULL", f"sqlite:///{os.path.join(tmp, 'journal.db')}", args.tasks, args.workers,
+            sqlite_journal_mode="DELETE", sqlite_synchronous="FULL")
+        run("sqlite, WAL, NORMAL", f"sqlite:///{os.path.join(tmp, 'wal.db')}", args.tasks, args.workers,
+            sqlite_journal_mode="WAL", sqlite_synchronous="NORMAL")
+    for url in args.url:
+        run(url.split(":", 1)[0], url, args.tasks, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Load and failure test of the handwriting API client against the local stand-in
+(benchmarks/handwriting_api_standin.py), started in-process. Run from the
+repository root:
+
+    python benchmarks/handwriting_api_load.py
+
+Compares the previous approach (a new connection per request, no timeout, no
+retries) with the pooled client, then injects failures: transient 503s, slow
+responses and a full outage followed by recovery.
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, ".")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+import handwriting_api_standin as standin
+from app.services.handwriting_api import CircuitBreaker, HandwritingApiClient
+
+REQUESTS = 200
+WORKER_THREADS = 16
+
+
+def start_standin() -> str:
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(standin.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def configure(base: str, **behaviour):
+    httpx.post(f"{base}/control", json=behaviour)
+    httpx.post(f"{base}/stats/reset")
+
+
+def post_without_pool(url: str, path: str) -> dict:
+    """The previous client, kept here as the baseline: one connection per request."""
+    try:
+        with open(path, "rb") as f:
+            response = httpx.post(url, files={"file": f}, timeout=None)
+        if response.status_code == 200:
+            return response.json()
+        return {"error": f"Status: {response.status_code}"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def run_threads(call, path: str, requests: int = REQUESTS):
+    """Worker threads each blocking on one request at a time, as task workers do."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WORKER_THREADS) as pool:
+        results = list(pool.map(lambda _: call(path), range(requests)))
+    return results, time.perf_counter() - start
+
+
+def report(name: str, results, elapsed: float, base: str):
+    stats = httpx.get(f"{base}/stats").json()
+    ok = sum("error" not in r for r in results)
+    print(f"{name:<34} {len(results) / elapsed:>8.1f} req/s {ok:>5}/{len(results)} ok "
+          f"{stats['requests']:>5} server hits {stats['connections']:>5} connections")
+
+
+def main():
+    base = start_standin()
+    url = f"{base}/classify-page/"
+    path = os.path.join(tempfile.mkdtemp(), "page.png")
+    with open(path, "wb") as f:
+        f.write(os.urandom(64 * 1024))
+
+    print(f"{REQUESTS} requests, stand-in latency 50 ms, {WORKER_THREADS} worker threads\n")
+
+    configure(base, latency=0.05)
+    results, elapsed = run_threads(lambda p: post_without_pool(url, p), path)
+    report("new connection per request", results, elapsed, base)
+
+    client = HandwritingApiClient(url, max_concurrency=16, backoff=0.05, backoff_max=0.5)
+    configure(base, latency=0.05)
+    results, elapsed = run_threads(client.classify_page_sync, path)
+    report("pooled client, worker threads", results, elapsed, base)
+
+    async def from_event_loop():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.classify_page(path) for _ in range(REQUESTS)))
+        return results, time.perf_counter() - start
+
+    configure(base, latency=0.05)
+    results, elapsed = asyncio.run(from_event_loop())
+    report("pooled client, asyncio.gather", results, elapsed, base)
+
+    print("\nFailure injection")
+    configure(base, latency=0.05, failure_rate=0.3)
+    results, elapsed = run_threads(lambda p: post_without_pool(url, p), path)
+    report("30% 503s, no retries", results, elapsed, base)
+    configure(base, latency=0.05, failure_rate=0.3)
+    results, elapsed = run_threads(client.classify_page_sync, path)
+    report("30% 503s, jittered retries", results, elapsed, base)
+
+    slow = HandwritingApiClient(url, max_concurrency=16, timeout=0.5, retries=1, backoff=0.05)
+    configure(base, latency=0.05, hang_rate=0.1, hang_seconds=30)
+    results, elapsed = run_threads(slow.classify_page_sync, path, 100)
+    report("10% hang 30 s, 0.5 s timeout", results, elapsed, base)
+
+    print("\nOutage and recovery (breaker opens after 5 failures, probes after 1 s)")
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=1.0)
+    outage = HandwritingApiClient(url, max_concurrency=16, retries=2, backoff=0.05, breaker=breaker)
+    configure(base, latency=0.05, failure_rate=1.0)
+    results, elapsed = run_threads(outage.classify_page_sync, path)
+    report("API down", results, elapsed, base)
+    print(f"{'':<34} circuit {breaker.state}, {outage.stats()['rejected']} requests failed fast")
+
+    configure(base, latency=0.05)
+    time.sleep(1.0)
+    # Half-open: one trial request goes through while the others still fail fast
+    results, elapsed = run_threads(outage.classify_page_sync, path)
+    report("API back, first batch", results, elapsed, base)
+    print(f"{'':<34} circuit {breaker.state}")
+    configure(base, latency=0.05)
+    results, elapsed = run_threads(outage.classify_page_sync, path)
+    report("API back, next batch", results, elapsed, base)
+
+    for c in (client, slow, outage):
+        c.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Local stand-in for the external handwriting classification API
+(https://api.athul.live/classify-page/), for offline load and failure testing.
+
+    python benchmarks/handwriting_api_standin.py --port 8090 --latency 0.05 --failure-rate 0.1
+    HANDWRITING_API_URL=http://127.0.0.1:8090/classify-page/ uvicorn app.main:app
+
+Behaviour can be changed while it runs with POST /control (same fields as the
+command-line options), e.g. to simulate an outage and a recovery.
+"""
+import argparse
+import asyncio
+import random
+
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+app = FastAPI(title="Handwriting API stand-in")
+
+
+class Behaviour(BaseModel):
+    latency: float = 0.05  # Mean response time in seconds (exponentially distributed)
+    failure_rate: float = 0.0  # Fraction of requests answered with failure_status
+    failure_status: int = 503
+    hang_rate: float = 0.0  # Fraction of requests that take hang_seconds to answer
+    hang_seconds: float = 60.0
+
+
+behaviour = Behaviour()
+counters = {"requests": 0, "failures": 0, "hangs": 0}
+connections = set()
+
+
+@app.post("/classify-page/")
+async def classify_page(request: Request, file: UploadFile):
+    counters["requests"] += 1
+    connections.add((request.client.host, request.client.port))
+    content = await file.read()
+
+    if random.random() < behaviour.hang_rate:
+        counters["hangs"] += 1
+        await asyncio.sleep(behaviour.hang_seconds)
+    else:
+        await asyncio.sleep(random.expovariate(1 / behaviour.latency) if behaviour.latency > 0 else 0)
+
+    if random.random() < behaviour.failure_rate:
+        counters["failures"] += 1
+        return JSONResponse({"detail": "Stand-in failure"}, status_code=behaviour.failure_status)
+
+    # Deterministic per image, so repeated uploads get the same answer
+    score = (sum(content[:4096]) % 1000) / 1000
+    return {"prediction": "dyslexic" if score > 0.5 else "non-dyslexic", "confidence": round(score, 3), "stand_in": True}
+
+
+@app.post("/control")
+async def control(update: Behaviour):
+    global behaviour
+    behaviour = update
+    return behaviour
+
+
+@app.get("/stats")
+async def stats():
+    return {**counters, "connections": len(connections), "behaviour": behaviour}
+
+
+@app.post("/stats/reset")
+async def reset_stats():
+    for name in counters:
+        counters[name] = 0
+    connections.clear()
+    return counters
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    for name, field in Behaviour.model_fields.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=field.annotation, default=field.default)
+    args = parser.parse_args()
+
+    global behaviour
+    behaviour = Behaviour(**{name: getattr(args, name) for name in Behaviour.model_fields})
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
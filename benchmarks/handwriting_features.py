@@ -0,0 +1,85 @@
+"""
+Compare the old handwriting metrics (np.where over the full-resolution image,
+twice) with the projection-profile / connected-component feature engine, at full
+resolution and downsampled. Reports time and peak NumPy memory (tracemalloc)
+on a synthetic page of text. Run from the repository root:
+
+    python benchmarks/handwriting_features.py --width 4000 --height 3000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+import cv2
+import numpy as np
+from app.services.handwriting_processing import process_handwriting_for_dyslexia
+
+
+def make_page(path: str, width: int, height: int):
+    page = np.full((height, width), 245, np.uint8)
+    font_scale = height / 600
+    line_pitch = int(height / 16)
+    rng = np.random.default_rng(0)
+    for i in range(1, 15):
+        words = " ".join(rng.choice(["reading", "was", "dog", "bird", "the", "quick", "fox", "sat"], 6))
+        cv2.putText(page, words, (int(width * 0.05), i * line_pitch), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, 20, max(1, int(font_scale * 2.5)), cv2.LINE_AA)
+    # Camera-like noise
+    page = cv2.add(page, rng.integers(0, 12, page.shape, dtype=np.uint8))
+    cv2.imwrite(path, page)
+
+
+def old_process(image_path: str):
+    """process_handwriting_for_dyslexia as it was."""
+    image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    features = {
+        "line_spacing": np.mean(np.diff(np.where(image > 128)[0])),
+        "letter_spacing": np.mean(np.diff(np.where(image > 128)[1])),
+    }
+    return {"dyslexia_probability": 0.5 * features["line_spacing"] + 0.5 * features["letter_spacing"], "features": features}
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "page.png")
+        make_page(path, args.width, args.height)
+        print(f"{args.width}x{args.height} page ({args.width * args.height / 1e6:.1f} MP)")
+
+        for name, fn, fn_args in (
+            ("old np.where metrics", old_process, (path,)),
+            ("feature engine, full resolution", process_handwriting_for_dyslexia, (path, 0)),
+            ("feature engine, max 2000 px", process_handwriting_for_dyslexia, (path, 2000)),
+            ("feature engine, max 1000 px", process_handwriting_for_dyslexia, (path, 1000)),
+        ):
+            runs = [measure(fn, *fn_args) for _ in range(args.repeat)]
+            elapsed = min(run[0] for run in runs)
+            peak = max(run[1] for run in runs)
+            print(f"{name:<34} {elapsed * 1000:9.1f} ms   peak {peak / 2**20:8.1f} MiB")
+
+        features = process_handwriting_for_dyslexia(path, 2000)["features"]
+        print("features (max 2000 px):", {key: round(value, 2) for key, value in features.items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the API.
+
+Imports app.main in fresh interpreters, reports the median wall time and fails
+(exit code 1) if it exceeds the budget or if any heavy dependency was imported
+eagerly. Run from the repository root:
+
+    python benchmarks/import_time.py --budget 2.0
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be loaded on first use
+HEAVY_MODULES = [
+    "tensorflow",
+    "mediapipe",
+    "sklearn",
+    "moviepy",
+    "pyttsx3",
+    "speech_recognition",
+    "pytesseract",
+    "textblob",
+    "abydos",
+    "eng_to_ipa",
+    "pydub",
+    "requests",
+]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+loaded = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"seconds": elapsed, "heavy_loaded": loaded}}))
+"""
+
+
+def measure(runs: int):
+    timings = []
+    heavy_loaded = set()
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            sys.exit(f"FAIL: import app.main raised:\n{process.stderr}")
+        sample = json.loads(process.stdout.strip().splitlines()[-1])
+        timings.append(sample["seconds"])
+        heavy_loaded.update(sample["heavy_loaded"])
+    return timings, sorted(heavy_loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="Maximum median import time in seconds")
+    args = parser.parse_args()
+
+    timings, heavy_loaded = measure(args.runs)
+    median = statistics.median(timings)
+    print(f"import app.main: median {median:.3f}s, min {min(timings):.3f}s, max {max(timings):.3f}s over {args.runs} runs")
+
+    failed = False
+    if heavy_loaded:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy_loaded)}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: median import time {median:.3f}s exceeds budget {args.budget:.3f}s")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark the bit-parallel Levenshtein engine against the previous pure-Python
+dynamic-programming implementation. Run from the repository root:
+
+    python benchmarks/levenshtein.py
+"""
+import random
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from app.utils.levenshtein import batch_levenshtein, levenshtein
+
+# IPA-like alphabet, as produced by eng_to_ipa for whole test passages
+ALPHABET = "abdefhijklmnoprstuvwzæðŋɑɔəɛɪʃʊʌʒθˈˌ "
+
+
+def levenshtein_dp(s1: str, s2: str) -> int:
+    """The implementation this engine replaced, kept here as the baseline."""
+    if len(s1) < len(s2):
+        return levenshtein_dp(s2, s1)
+    if not s2:
+        return len(s1)
+
+    prev_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        curr_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = prev_row[j + 1] + 1
+            deletions = curr_row[j] + 1
+            substitutions = prev_row[j] + (c1 != c2)
+            curr_row.append(min(insertions, deletions, substitutions))
+        prev_row = curr_row
+
+    return prev_row[-1]
+
+
+def mutate(text: str, rate: float, rng: random.Random) -> str:
+    chars = list(text)
+    for i in range(len(chars)):
+        if rng.random() < rate:
+            chars[i] = rng.choice(ALPHABET)
+    return "".join(chars)
+
+
+def best_of(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number
+
+
+def main():
+    rng = random.Random(0)
+
+    # Correctness against the baseline
+    for _ in range(500):
+        a = "".join(rng.choice(ALPHABET[:6]) for _ in range(rng.randint(0, 40)))
+        b = "".join(rng.choice(ALPHABET[:6]) for _ in range(rng.randint(0, 40)))
+        assert levenshtein(a, b) == levenshtein_dp(a, b), (a, b)
+        k = rng.randint(0, 10)
+        assert levenshtein(a, b, max_distance=k) == min(levenshtein_dp(a, b), k + 1), (a, b, k)
+
+    print(f"{'length':>8} {'dp (ms)':>10} {'bit-parallel (ms)':>18} {'threshold (ms)':>15} {'speedup':>8}")
+    for length in (50, 200, 1000, 3000):
+        a = "".join(rng.choice(ALPHABET) for _ in range(length))
+        b = mutate(a, 0.3, rng)
+        number = max(1, 20000 // (length * length // 50 + 1))
+        dp = best_of(lambda: levenshtein_dp(a, b), number)
+        fast = best_of(lambda: levenshtein(a, b), number * 20)
+        banded = best_of(lambda: levenshtein(a, b, max_distance=length // 10), number * 20)
+        print(f"{length:>8} {dp * 1000:>10.3f} {fast * 1000:>18.3f} {banded * 1000:>15.3f} {dp / fast:>7.1f}x")
+
+    reference = "".join(rng.choice(ALPHABET) for _ in range(300))
+    candidates = [mutate(reference, 0.2, rng) for _ in range(200)]
+    dp = best_of(lambda: [levenshtein_dp(reference, c) for c in candidates], 1)
+    batch = best_of(lambda: batch_levenshtein(reference, candidates), 5)
+    print(f"batch of {len(candidates)} x 300 chars: dp {dp * 1000:.1f} ms, batch {batch * 1000:.1f} ms ({dp / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare task latency with the analyses of a task run one after another (as
+process_task used to) and fanned out concurrently, and show the partial
+results saved as each analysis finishes. The analyses are simulated with
+fixed durations; uses a throwaway SQLite database. Run from the repository root:
+
+    python benchmarks/modality_fanout.py --video 1.5 --phonetics 1.0 --handwriting 0.6
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import MODALITY_TIMEOUTS
+from app.db.crud import claim_next_task, create_task, get_task_by_id
+from app.db.models import Base
+from app.services import task_processing
+
+
+class NoCache:
+    def get(self, media_sha256, analyzer):
+        return None
+
+    def put(self, media_sha256, analyzer, result):
+        pass
+
+
+def simulate(durations: dict):
+    """Replace the three analyses with sleeps of the given durations."""
+    def video(video_path):
+        time.sleep(durations["video"])
+        return {"dyslexia_probability": 0.4}
+
+    def phonetics(video_path, audio_path):
+        time.sleep(durations["phonetics"])
+        return {"phonetics_inaccuracy": 12.5}
+
+    async def handwriting(image_path):
+        await asyncio.sleep(durations["handwriting"])
+        return {"prediction": "non-dyslexic"}
+
+    task_processing.result_cache = NoCache()
+    task_processing.process_video_for_dyslexia = video
+    task_processing._analyze_phonetics = phonetics
+    task_processing._classify_handwriting = handwriting
+    return video, phonetics, handwriting
+
+
+def run_sequential(task, video, phonetics, handwriting):
+    """What process_task used to do: one analysis after another."""
+    return {
+        "video_analysis": video(task.video_path),
+        "phonetics_analysis": phonetics(task.video_path, task.audio_path),
+        "handwriting_analysis": asyncio.run(handwriting(task.handwriting_image_path)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", type=float, default=1.5, help="Seconds of simulated eye tracking")
+    parser.add_argument("--phonetics", type=float, default=1.0, help="Seconds of simulated speech recognition")
+    parser.add_argument("--handwriting", type=float, default=0.6, help="Seconds of simulated handwriting API call")
+    args = parser.parse_args()
+    video, phonetics, handwriting = simulate({"video": args.video, "phonetics": args.phonetics, "handwriting": args.handwriting})
+
+    path = os.path.join(tempfile.mkdtemp(), "tasks.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    for _ in range(2):
+        create_task(db, user_id="bench", video_path="/tmp/v.mp4", audio_path="/tmp/v.wav", handwriting_image_path="/tmp/h.png")
+
+    task = claim_next_task(db, "bench")
+    start = time.perf_counter()
+    run_sequential(task, video, phonetics, handwriting)
+    sequential = time.perf_counter() - start
+
+    task = claim_next_task(db, "bench")
+    saver = task_processing.partial_result_saver(task.id, "bench", session_factory)
+    saved = []
+
+    def on_result(partial):
+        saver(partial)
+        # Read back what a client polling GET /queue/{task_id} would see
+        reader = session_factory()
+        stored = get_task_by_id(reader, task.id)
+        saved.append((time.perf_counter() - start, stored.status, sorted(k for k in stored.result if k != "pending"), stored.result["pending"]))
+        reader.close()
+
+    start = time.perf_counter()
+    result = task_processing.process_task(task, on_result)
+    fanned_out = time.perf_counter() - start
+
+    print(f"analyses: video {args.video}s, phonetics {args.phonetics}s, handwriting {args.handwriting}s")
+    print(f"sequential  {sequential:6.2f} s")
+    print(f"fan-out     {fanned_out:6.2f} s  ({sequential / fanned_out:.1f}x)")
+    print("partial results saved:")
+    for at, status, done, pending in saved:
+        print(f"  {at:5.2f} s  {status:<10} done={done} pending={pending}")
+    print(f"final keys: {sorted(result)}")
+
+    # One analysis over its timeout does not hold up the others
+    MODALITY_TIMEOUTS["video_analysis"] = args.phonetics / 2
+    start = time.perf_counter()
+    result = task_processing.process_task(task)
+    print(f"video timeout {MODALITY_TIMEOUTS['video_analysis']:g}s: {time.perf_counter() - start:.2f} s, "
+          f"video_analysis={result['video_analysis']}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+OCR pages per second with the OCR worker pool at different worker counts,
+compared with the old path (pytesseract on the raw BGR image, a new tesseract
+process per page, when the tesseract binary is installed). Also shows the
+cached pass. Uses synthetic, slightly rotated pages of text. Run from the
+repository root:
+
+    python benchmarks/ocr_throughput.py --pages 24 --workers 1 2 4
+
+Throughput only scales with workers up to the number of CPU cores.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+import cv2
+import numpy as np
+from app.services.ocr_service import OcrPool
+
+WORDS = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "reading", "was", "bird", "tree"]
+
+
+def make_pages(directory: str, count: int):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        page = np.full((1100, 1600, 3), 230, np.uint8)
+        for line in range(5):
+            text = " ".join(rng.choice(WORDS, 4))
+            cv2.putText(page, text, (60, 160 + line * 190), cv2.FONT_HERSHEY_SIMPLEX, 2.2, (40, 40, 40), 5, cv2.LINE_AA)
+        rotation = cv2.getRotationMatrix2D((800, 550), rng.uniform(-4, 4), 1.0)
+        page = cv2.warpAffine(page, rotation, (1600, 1100), borderValue=(230, 230, 230))
+        path = os.path.join(directory, f"page-{i}.png")
+        cv2.imwrite(path, page)
+        paths.append(path)
+    return paths
+
+
+def old_extract(paths):
+    import pytesseract
+
+    return [pytesseract.image_to_string(cv2.imread(path)) for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_pages(tmp, args.pages)
+
+        if shutil.which("tesseract"):
+            started = time.perf_counter()
+            old_extract(paths)
+            print(f"{'old: pytesseract, raw image':<34} {args.pages / (time.perf_counter() - started):7.2f} pages/s")
+        else:
+            print("old: pytesseract, raw image        skipped (no tesseract binary)")
+
+        for workers in args.workers:
+            pool = OcrPool(workers=workers)
+            started = time.perf_counter()
+            texts = pool.ocr_pages(paths)
+            elapsed = time.perf_counter() - started
+            words = sum(len(text.split()) for text in texts)
+            print(f"{f'pool, {workers} worker(s)':<34} {args.pages / elapsed:7.2f} pages/s   ({words} words read)")
+
+            started = time.perf_counter()
+            pool.ocr_pages(paths)
+            cached = time.perf_counter() - started
+        print(f"{'pool, cached pass':<34} {args.pages / cached:7.2f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark per-page phonetic scoring: the previous approach (new Soundex,
+Metaphone, Caverphone and NYSIIS objects on every call, every word encoded
+separately) against app.utils.phonetic_encoding. Run from the repository root:
+
+    python benchmarks/phonetic_scoring.py
+
+Spelling correction is left out: both sides score the same original and
+corrected word lists.
+"""
+import random
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from app.utils import phonetic_encoding
+from app.utils.levenshtein import levenshtein
+from app.utils.vocabulary import AGE_BASED_PHRASES
+
+
+def score_baseline(words, corrected_words):
+    """The scoring this layer replaced, kept here as the baseline."""
+    from abydos.phonetic import Soundex, Metaphone, Caverphone, NYSIIS
+
+    scores = []
+    for encoding in [Soundex(), Metaphone(), Caverphone(), NYSIIS()]:
+        original = " ".join([encoding.encode(word) for word in words])
+        corrected = " ".join([encoding.encode(word) for word in corrected_words])
+        scores.append((len(original) - levenshtein(original, corrected)) / (len(original) + 1))
+    return sum(scores) / len(scores) * 100
+
+
+def encode_baseline(words):
+    from abydos.phonetic import Soundex, Metaphone, Caverphone, NYSIIS
+
+    return [[encoding.encode(word) for word in words] for encoding in [Soundex(), Metaphone(), Caverphone(), NYSIIS()]]
+
+
+def score_cached(words, corrected_words):
+    original_codes = phonetic_encoding.encode_tokens(words)
+    corrected_codes = phonetic_encoding.encode_tokens(corrected_words)
+    scores = []
+    for algorithm in phonetic_encoding.PHONETIC_ALGORITHMS:
+        original = " ".join(original_codes[algorithm])
+        corrected = " ".join(corrected_codes[algorithm])
+        scores.append((len(original) - levenshtein(original, corrected)) / (len(original) + 1))
+    return sum(scores) / len(scores) * 100
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    if len(word) < 3 or rng.random() > 0.3:
+        return word
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def page(rng: random.Random, words: int = 250):
+    vocabulary = [word.strip(".,").lower() for phrases in AGE_BASED_PHRASES.values() for phrase in phrases for word in phrase.split()]
+    corrected = [rng.choice(vocabulary) for _ in range(words)]
+    return [misspell(word, rng) for word in corrected], corrected
+
+
+def best_of(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number
+
+
+def main():
+    rng = random.Random(0)
+    pages = [page(rng) for _ in range(20)]
+
+    for words, corrected in pages:
+        assert abs(score_baseline(words, corrected) - score_cached(words, corrected)) < 1e-9
+
+    print(f"page of {len(pages[0][0])} words, 4 algorithms (ms per page)")
+    print(f"{'':>16} {'encoding':>10} {'scoring':>10}")
+
+    baseline_encoding = best_of(lambda: [encode_baseline(w + c) for w, c in pages], 1) / len(pages)
+    baseline = best_of(lambda: [score_baseline(w, c) for w, c in pages], 1) / len(pages)
+    print(f"{'baseline':>16} {baseline_encoding * 1000:>10.2f} {baseline * 1000:>10.2f}")
+
+    phonetic_encoding.encode_word.cache_clear()
+    cold_encoding = timeit.timeit(lambda: [phonetic_encoding.encode_tokens(w + c) for w, c in pages], number=1) / len(pages)
+    phonetic_encoding.encode_word.cache_clear()
+    cold = timeit.timeit(lambda: [score_cached(w, c) for w, c in pages], number=1) / len(pages)
+    print(f"{'cached (cold)':>16} {cold_encoding * 1000:>10.2f} {cold * 1000:>10.2f}")
+
+    warm_encoding = best_of(lambda: [phonetic_encoding.encode_tokens(w + c) for w, c in pages], 5) / len(pages)
+    warm = best_of(lambda: [score_cached(w, c) for w, c in pages], 5) / len(pages)
+    print(f"{'cached (warm)':>16} {warm_encoding * 1000:>10.2f} {warm * 1000:>10.2f}")
+    print(f"encoding {baseline_encoding / warm_encoding:.0f}x faster; the rest of scoring is the Levenshtein distance between code strings")
+    print(f"cache: {phonetic_encoding.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Fan-out of task progress events to many connected clients, and the database
+reads needed to follow tasks processed by standalone workers. Uses a throwaway
+SQLite database. Run from the repository root:
+
+    python benchmarks/progress_fanout.py --clients 5000 --tasks 500
+
+Clients are subscriptions on one event loop, as SSE connections are on the
+server. The baseline for database reads is every client polling GET /queue/{task_id}.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, ".")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tasks.db')}"
+
+from sqlalchemy import event
+from app.db.crud import create_task, get_task_by_id, update_task_status
+from app.db.models import Base, SessionLocal, engine
+from app.services.progress import ProgressBroker
+
+EVENTS_PER_TASK = 20
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def fan_out(clients: int, tasks: int):
+    """Publish from a worker thread; every client reads its task's events to the end."""
+    broker = ProgressBroker(poll_interval=3600)
+    for task_id in range(tasks):
+        broker.mark_local(task_id)
+    subscriptions = [broker.subscribe(i % tasks) for i in range(clients)]
+    latencies = []
+
+    async def client(subscription):
+        while True:
+            message = await subscription.get()
+            latencies.append(time.perf_counter() - message.data["sent"])
+            if message.terminal:
+                subscription.close()
+                return
+
+    def publish():
+        for step in range(1, EVENTS_PER_TASK):
+            for task_id in range(tasks):
+                broker.publish(task_id, "frames_decoded", frames=step * 100, total_frames=EVENTS_PER_TASK * 100, sent=time.perf_counter())
+        for task_id in range(tasks):
+            broker.publish(task_id, "completed", result={"video_analysis": {"dyslexia_probability": 0.4}}, sent=time.perf_counter())
+
+    readers = [asyncio.create_task(client(s)) for s in subscriptions]
+    start = time.perf_counter()
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    await asyncio.gather(*readers)
+    elapsed = time.perf_counter() - start
+    publisher.join()
+
+    stats = broker.stats()
+    print(f"{clients} clients on {tasks} tasks, {EVENTS_PER_TASK} events per task")
+    print(f"  published {stats['published']} events, delivered {len(latencies)} in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:,.0f} deliveries/s), dropped {stats['dropped']}")
+    print(f"  publish-to-client latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+async def remote_reads(clients: int, tasks: int, seconds: float):
+    """Count queries while every task is processed by another process (state changes in the database)."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    task_ids = [create_task(db, user_id="bench").id for _ in range(tasks)]
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+
+    # Baseline: one round of every client polling its task
+    for i in range(clients):
+        get_task_by_id(db, task_ids[i % tasks])
+    polling = len(queries)
+
+    broker = ProgressBroker(poll_interval=1.0)
+    subscriptions = [broker.subscribe(task_ids[i % tasks]) for i in range(clients)]
+    received = [0]
+
+    async def client(subscription):
+        while True:
+            message = await subscription.get()
+            received[0] += 1
+            if message.terminal:
+                subscription.close()
+                return
+
+    def remote_worker():
+        other = SessionLocal()
+        time.sleep(seconds / 2)
+        for task_id in task_ids:
+            update_task_status(other, task_id, "processing")
+        time.sleep(seconds / 2)
+        for task_id in task_ids:
+            update_task_status(other, task_id, "completed", {"video_analysis": {"dyslexia_probability": 0.4}})
+        other.close()
+
+    readers = [asyncio.create_task(client(s)) for s in subscriptions]
+    start = time.perf_counter()
+    worker = threading.Thread(target=remote_worker)
+    worker.start()
+    await asyncio.gather(*readers)
+    elapsed = time.perf_counter() - start
+    worker.join()
+
+    # Each poll of the broker is one query, covering every watched task
+    polls = broker.stats()["database_polls"]
+    print(f"{clients} clients following {tasks} tasks run by a standalone worker, {elapsed:.1f} s")
+    print(f"  polling GET /queue/{{task_id}} once a second: {polling:,} queries/s")
+    print(f"  streaming: {polls} shared polls ({polls / elapsed:.1f} queries/s), {received[0]} events delivered")
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of the simulated remote processing")
+    args = parser.parse_args()
+    asyncio.run(fan_out(args.clients, args.tasks))
+    print()
+    asyncio.run(remote_reads(args.clients, args.tasks, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
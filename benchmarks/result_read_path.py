@@ -0,0 +1,131 @@
+"""
+Compare reading task listings when results are stored as str(dict) reprs (the
+old format) with the JSON result column. Uses throwaway SQLite databases filled
+with realistic results. Run from the repository root:
+
+    python benchmarks/result_read_path.py --tasks 20000
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+import numpy as np
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from app.db.crud import TASK_COLUMNS, TASK_LIST_COLUMNS, iter_tasks
+from app.db.models import Base, Task
+from app.db.schemas import task_result
+
+LegacyBase = declarative_base()
+
+
+class LegacyTask(LegacyBase):
+    """The tasks table as it was, with results saved as str(result)."""
+    __tablename__ = "tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, index=True)
+    video_path = Column(String)
+    audio_path = Column(String)
+    handwriting_image_path = Column(String)
+    status = Column(String, default="queued")
+    result = Column(String, nullable=True)
+
+
+def sample_result(i: int) -> dict:
+    return {
+        "video_analysis": {"dyslexia_probability": np.float32(i % 100 / 100), "frames_analyzed": 500 + i % 50},
+        "phonetics_analysis": {
+            "test_words": ["cat", "dog", "fish", "bird", "tree"],
+            "user_pronounced": "cat dog fish bird three",
+            "phonetics_inaccuracy": 12.5,
+        },
+        "handwriting_analysis": {"label": "normal", "confidence": 0.93, "scores": [0.93, 0.05, 0.02]},
+    }
+
+
+def make_database(path: str, base, model, tasks: int, encode):
+    engine = create_engine(f"sqlite:///{path}")
+    base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    db.bulk_save_objects([
+        model(
+            user_id=f"user-{i % 100}",
+            video_path=f"app/data/uploads/objects/{i:064x}.mp4",
+            audio_path=f"app/data/uploads/objects/{i:064x}.wav",
+            status="completed",
+            result=encode(sample_result(i)),
+        )
+        for i in range(tasks)
+    ])
+    db.commit()
+    db.close()
+    return session_factory
+
+
+def legacy_listing(session_factory):
+    """What GET /queue/ used to do: load every ORM row and try json.loads on each repr."""
+    db = session_factory()
+    tasks = []
+    for task in db.query(LegacyTask).all():
+        try:
+            result = json.loads(task.result) if task.result else None
+        except json.JSONDecodeError:
+            result = {"error": "Invalid JSON format in result"}
+        tasks.append({"id": task.id, "status": task.status, "result": result})
+    db.close()
+    return tasks
+
+
+def legacy_listing_parsed(session_factory):
+    """Actually recovering the data from reprs needs ast.literal_eval (NumPy reprs unwrapped first)."""
+    db = session_factory()
+    tasks = []
+    for task in db.query(LegacyTask).all():
+        text = task.result.replace("np.float32(", "(")
+        tasks.append({"id": task.id, "status": task.status, "result": ast.literal_eval(text)})
+    db.close()
+    return tasks
+
+
+def json_listing(session_factory, columns):
+    db = session_factory()
+    tasks = [{column: getattr(row, column) for column in columns} for row in iter_tasks(db, columns=columns)]
+    db.close()
+    return tasks
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = make_database(os.path.join(tmp, "legacy.db"), LegacyBase, LegacyTask, args.tasks, lambda r: str(r))
+        current = make_database(os.path.join(tmp, "json.db"), Base, Task, args.tasks, task_result)
+
+        print(f"{args.tasks} tasks")
+        for name, fn, fn_args in (
+            ("repr + json.loads (old /queue)", legacy_listing, (legacy,)),
+            ("repr + ast.literal_eval", legacy_listing_parsed, (legacy,)),
+            ("JSON column, with results", json_listing, (current, TASK_COLUMNS)),
+            ("JSON column, summary only", json_listing, (current, TASK_LIST_COLUMNS)),
+        ):
+            print(f"{name:<34} {timed(fn, *fn_args):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark segmented, parallel transcription against one recognizer call per
+recording. Run from the repository root:
+
+    python benchmarks/speech_transcription.py
+
+The recognizer is simulated: a remote service whose latency grows with the
+length of the audio sent (here 0.2 s + 0.1 s per second of audio, about a
+tenth of the Google Web Speech API's), so no network or model is needed.
+Recordings are synthetic "words" (noise bursts) separated by pauses.
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, ".")
+
+from app.services.speech_service import SpeechTranscriber, split_on_silence
+
+SAMPLE_RATE = 16000
+
+
+class SimulatedRemoteBackend:
+    name = "simulated"
+
+    def __init__(self, base: float = 0.2, per_second: float = 0.1):
+        self.base = base
+        self.per_second = per_second
+
+    def recognize(self, audio) -> str:
+        seconds = len(audio.frame_data) / audio.sample_width / audio.sample_rate
+        time.sleep(self.base + self.per_second * seconds)
+        # One "word" per burst, so stitching can be checked
+        samples = np.frombuffer(audio.frame_data, dtype=np.int16)
+        frames = samples[:len(samples) // 480 * 480].reshape(-1, 480)
+        loud = np.abs(frames).mean(axis=1) > 500
+        words = int(np.count_nonzero(np.diff(loud.astype(np.int8)) == 1) + loud[0])
+        return " ".join(["word"] * words)
+
+
+def recording(seconds: float, rng: random.Random):
+    """Bursts of 0.3-1.2 s separated by pauses of 0.35-1.0 s; returns (samples, burst count)."""
+    parts, bursts, length = [], 0, 0
+    while length < seconds * SAMPLE_RATE:
+        pause = np.random.default_rng(rng.randrange(1 << 30)).normal(0, 30, int(rng.uniform(0.35, 1.0) * SAMPLE_RATE))
+        burst = np.random.default_rng(rng.randrange(1 << 30)).normal(0, 6000, int(rng.uniform(0.3, 1.2) * SAMPLE_RATE))
+        parts += [pause, burst]
+        bursts += 1
+        length += len(pause) + len(burst)
+    parts.append(np.zeros(SAMPLE_RATE // 2))
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16), bursts
+
+
+def audio_data(samples):
+    import speech_recognition as sr
+
+    return sr.AudioData(samples.tobytes(), SAMPLE_RATE, 2)
+
+
+def main():
+    rng = random.Random(0)
+    backend = SimulatedRemoteBackend()
+    whole = SpeechTranscriber(backend, max_workers=1, timeout=600, segment_seconds=float("inf"))
+
+    print(f"{'audio (s)':>10} {'segments':>9} {'split (ms)':>11} {'1 call (s)':>11} {'2 workers (s)':>14} {'4 workers (s)':>14}")
+    for seconds in (10, 60, 180):
+        samples, bursts = recording(seconds, rng)
+
+        start = time.perf_counter()
+        segments = split_on_silence(samples, SAMPLE_RATE)
+        split = time.perf_counter() - start
+
+        timings = []
+        for transcriber in (whole, SpeechTranscriber(backend, max_workers=2), SpeechTranscriber(backend, max_workers=4)):
+            start = time.perf_counter()
+            text = transcriber.transcribe(audio_data(samples))
+            timings.append(time.perf_counter() - start)
+            # No word is lost or cut in two by the segmentation
+            assert len(text.split()) == bursts, (len(text.split()), bursts)
+
+        print(f"{len(samples) / SAMPLE_RATE:>10.1f} {len(segments):>9} {split * 1000:>11.2f} "
+              f"{timings[0]:>11.2f} {timings[1]:>14.2f} {timings[2]:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
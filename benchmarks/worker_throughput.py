@@ -0,0 +1,99 @@
+"""
+Compare task throughput of the old single-request /process loop with N
+lease-based workers draining the same queue. Uses a throwaway SQLite database
+and a simulated per-task workload. Run from the repository root:
+
+    python benchmarks/worker_throughput.py --tasks 200 --workers 8 --work-ms 20
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.crud import create_task, get_queued_tasks, update_task_status
+from app.db.models import Base
+from app.db.schemas import task_result
+from app.worker import run_worker
+
+
+def make_database(path: str, tasks: int):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    for i in range(tasks):
+        create_task(db, user_id=f"user-{i % 10}")
+    db.close()
+    return session_factory
+
+
+def run_baseline(session_factory, work_seconds: float):
+    """The loop /process/ used to run: fetch all queued rows, then process them one by one."""
+    db = session_factory()
+    for task in get_queued_tasks(db):
+        update_task_status(db, task.id, "processing")
+        time.sleep(work_seconds)
+        update_task_status(db, task.id, "completed", result=task_result({}))
+    db.close()
+
+
+def run_workers(session_factory, workers: int, work_seconds: float):
+    processed = collections.Counter()
+    lock = threading.Lock()
+
+    def process(task):
+        with lock:
+            processed[task.id] += 1
+        time.sleep(work_seconds)
+        return {}
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(f"bench-{i}", stop),
+            kwargs={"process": process, "session_factory": session_factory, "exit_when_idle": True},
+        )
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--work-ms", type=float, default=20.0, help="Simulated processing time per task")
+    args = parser.parse_args()
+    work_seconds = args.work_ms / 1000.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = make_database(os.path.join(tmp, "baseline.db"), args.tasks)
+        started = time.perf_counter()
+        run_baseline(session_factory, work_seconds)
+        baseline = time.perf_counter() - started
+
+        session_factory = make_database(os.path.join(tmp, "workers.db"), args.tasks)
+        started = time.perf_counter()
+        processed = run_workers(session_factory, args.workers, work_seconds)
+        workers = time.perf_counter() - started
+
+    duplicates = sum(1 for count in processed.values() if count > 1)
+    print(f"baseline /process loop: {args.tasks / baseline:8.1f} tasks/s ({baseline:.2f}s)")
+    print(f"{args.workers} leased workers:     {args.tasks / workers:8.1f} tasks/s ({workers:.2f}s)")
+    print(f"tasks processed: {len(processed)}/{args.tasks}, processed more than once: {duplicates}")
+
+
+if __name__ == "__main__":
+    main()
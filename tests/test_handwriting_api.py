@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.handwriting_api import CircuitBreaker, HandwritingApiClient
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / "page.png"
+    path.write_bytes(b"png")
+    return str(path)
+
+
+def make_client(handler, **kwargs):
+    client = HandwritingApiClient(url="http://handwriting.test/classify", backoff=0, **kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._semaphore = asyncio.Semaphore(client.max_concurrency)
+    return client
+
+
+def test_transient_failures_are_retried(page):
+    statuses = iter([503, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json={"prediction": "dyslexic"} if status == 200 else None)
+
+    client = make_client(handler, retries=1)
+    try:
+        assert client.classify_page_sync(page) == {"prediction": "dyslexic"}
+        stats = client.stats()
+        assert (stats["retries"], stats["succeeded"], stats["circuit"]) == (1, 1, "closed")
+    finally:
+        client.close()
+
+
+def test_open_breaker_rejects_without_calling_the_api(page):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = make_client(handler, retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    try:
+        assert "error" in client.classify_page_sync(page)
+        assert "too many recent failures" in client.classify_page_sync(page)["error"]
+        assert len(calls) == 1
+        assert client.stats()["rejected"] == 1
+    finally:
+        client.close()
+
+
+def test_cancelled_trial_releases_the_trial_slot(page):
+    slow = [True]
+
+    async def handler(request):
+        if slow[0]:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"prediction": "typical"})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    client = make_client(handler, retries=0, breaker=breaker)
+    try:
+        # The caller gives up on the half-open trial
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(client.classify_page(page), 0.2))
+        time.sleep(0.05)
+        assert breaker.state in ("open", "half_open")
+        assert client.stats()["in_flight"] == 0
+
+        # Once the reset timeout passes again, a new trial is let through
+        slow[0] = False
+        time.sleep(0.06)
+        assert client.classify_page_sync(page) == {"prediction": "typical"}
+        assert breaker.state == "closed"
+    finally:
+        client.close()
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from app.services.queue_handler import FairTaskQueue, QueueFullError
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def blocker(queue, user_id):
+    """Submit a task that holds a worker until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def task():
+        started.set()
+        release.wait(5)
+
+    queue.submit(user_id, task)
+    assert started.wait(5)
+    return release
+
+
+def test_users_take_turns():
+    queue = FairTaskQueue(workers=1)
+    order = []
+    release = blocker(queue, "a")
+    for user_id, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("b", "b2"), ("c", "c1")]:
+        queue.submit(user_id, lambda name=name: order.append(name))
+
+    release.set()
+    wait_for(lambda: queue.stats()["completed"] == 7)
+
+    # "a" was running when the others arrived, so it goes to the back of the line
+    assert order == ["b1", "c1", "a1", "b2", "a2", "a3"]
+
+
+def test_tasks_of_one_user_never_run_concurrently():
+    queue = FairTaskQueue(workers=4)
+    running, overlaps = [0], []
+    lock = threading.Lock()
+
+    def task():
+        with lock:
+            running[0] += 1
+            overlaps.append(running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    for _ in range(10):
+        queue.submit("a", task)
+    wait_for(lambda: queue.stats()["completed"] == 10)
+
+    assert max(overlaps) == 1
+
+
+def test_idle_users_are_evicted():
+    queue = FairTaskQueue(workers=2)
+    release = blocker(queue, "a")
+    queue.submit("a", lambda: None)
+    queue.submit("b", lambda: 1 / 0)
+
+    wait_for(lambda: queue.stats()["failed"] == 1)
+    assert set(queue.stats()["users"]) == {"a"}
+    assert queue.stats()["users"]["a"]["queued"] == 1
+
+    release.set()
+    wait_for(lambda: queue.stats()["completed"] == 2)
+    wait_for(lambda: not queue.stats()["users"])
+    assert queue._user_queues == {}
+    assert queue.stats()["depth"] == 0
+
+
+def test_submit_beyond_max_depth_is_rejected():
+    queue = FairTaskQueue(workers=1, max_depth=2)
+    release = blocker(queue, "a")
+    queue.submit("a", lambda: None)
+    queue.submit("b", lambda: None)
+
+    with pytest.raises(QueueFullError):
+        queue.submit("c", lambda: None)
+    assert queue.stats()["rejected"] == 1
+
+    release.set()
+    wait_for(lambda: queue.stats()["depth"] == 0)
+    queue.submit("c", lambda: None)
@@ -0,0 +1,22 @@
+import json
+
+import numpy as np
+
+from app.db.schemas import task_result, to_json_compatible
+
+
+def test_non_finite_floats_become_none():
+    value = to_json_compatible({"mean": np.mean([]), "scores": [1.5, float("inf"), np.float32("-inf")]})
+    assert value == {"mean": None, "scores": [1.5, None, None]}
+
+
+def test_task_result_with_nan_probability_is_valid_json():
+    # A video shorter than one window has no scored windows, and np.mean([]) is NaN
+    result = task_result({"video_analysis": {"dyslexia_probability": np.mean([]), "frames_analyzed": 0}})
+    assert result == {"video_analysis": {"dyslexia_probability": None, "frames_analyzed": 0}}
+    json.dumps(result, allow_nan=False)
+
+
+def test_numpy_values_become_plain_types():
+    result = task_result({"video_analysis": {"dyslexia_probability": np.float32(0.25), "windows": np.arange(2)}})
+    assert result == {"video_analysis": {"dyslexia_probability": 0.25, "windows": [0, 1]}}
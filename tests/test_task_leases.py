@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.db import write_buffer
+from app.db.crud import claim_tasks, create_task, finish_tasks, get_task_by_id, release_tasks, requeue_expired_leases
+from app.db.engine import create_db_engine
+from app.db.models import Base
+from app.db.write_buffer import TaskUpdateBuffer
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "read_back"])
+def session_factory(request, tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+    # Exercise the path for databases without UPDATE ... RETURNING as well
+    engine.dialect.update_returning = request.param
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def count_queries(db):
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+def test_claim_takes_the_oldest_queued_tasks(db):
+    ids = [create_task(db, user_id="u").id for _ in range(5)]
+
+    claimed = claim_tasks(db, "worker-1", limit=3, lease_seconds=60)
+
+    assert [task.id for task in claimed] == ids[:3]
+    assert all(task.status == "processing" and task.lease_owner == "worker-1" for task in claimed)
+    assert all(task.attempts == 1 for task in claimed)
+    assert [task.id for task in claim_tasks(db, "worker-2", limit=3)] == ids[3:]
+    assert claim_tasks(db, "worker-3", limit=3) == []
+
+
+def test_claimed_tasks_are_not_reloaded(db):
+    for _ in range(4):
+        create_task(db, user_id="u", video_path="/tmp/v.mp4")
+    queries = count_queries(db)
+
+    claimed = claim_tasks(db, "worker-1", limit=4, lease_seconds=60)
+    paths = [(task.id, task.video_path, task.lease_expires_at) for task in claimed]
+
+    assert len(paths) == 4
+    # The UPDATE, and on databases without RETURNING one SELECT; never one per task
+    assert len(queries) <= 2, queries
+
+
+def test_claim_skips_tasks_that_are_not_queued(db):
+    done = create_task(db, user_id="u", status="completed", result={"handwriting_analysis": {}})
+    queued = create_task(db, user_id="u")
+
+    assert [task.id for task in claim_tasks(db, "worker-1", limit=5)] == [queued.id]
+    assert get_task_by_id(db, done.id).status == "completed"
+
+
+def test_release_does_not_count_an_attempt(db):
+    task_id = create_task(db, user_id="u").id
+    claim_tasks(db, "worker-1")
+
+    assert release_tasks(db, [task_id], "worker-1") == 1
+    task = get_task_by_id(db, task_id)
+    assert (task.status, task.lease_owner, task.attempts) == ("queued", None, 0)
+
+
+def test_expired_leases_are_requeued_until_attempts_run_out(db):
+    task_id = create_task(db, user_id="u").id
+
+    for attempt in range(1, 3):
+        claim_tasks(db, "worker-1", lease_seconds=-1)
+        assert requeue_expired_leases(db, max_attempts=2) == (1 if attempt < 2 else 0)
+
+    task = get_task_by_id(db, task_id)
+    assert task.status == "failed"
+    assert task.result == {"error": "Lease expired too many times"}
+    assert task.lease_owner is None
+
+
+def test_live_leases_are_not_requeued(db):
+    create_task(db, user_id="u")
+    claim_tasks(db, "worker-1", lease_seconds=60)
+
+    assert requeue_expired_leases(db) == 0
+
+
+def test_finish_skips_tasks_whose_lease_was_lost(db):
+    first, second = (create_task(db, user_id="u").id for _ in range(2))
+    claim_tasks(db, "worker-1", limit=2, lease_seconds=-1)
+    requeue_expired_leases(db)
+    claim_tasks(db, "worker-2", limit=1, lease_seconds=60)
+
+    assert finish_tasks(db, "worker-1", [(first, "completed", {}), (second, "completed", {})]) == 0
+    assert finish_tasks(db, "worker-2", [(first, "completed", {"video_analysis": {}})]) == 1
+    assert get_task_by_id(db, first).status == "completed"
+    assert get_task_by_id(db, second).status == "queued"
+
+
+def test_buffer_writes_a_full_batch_at_once(db, session_factory):
+    ids = [create_task(db, user_id="u").id for _ in range(3)]
+    claim_tasks(db, "worker-1", limit=3, lease_seconds=60)
+    written = []
+    buffer = TaskUpdateBuffer("worker-1", max_batch=3, max_delay=60, session_factory=session_factory, on_flush=written.append)
+
+    buffer.add(ids[0], "completed", {"video_analysis": {}})
+    buffer.add(ids[1], "failed", {"error": "boom"})
+    assert written == [] and get_task_by_id(db, ids[0]).status == "processing"
+    buffer.add(ids[2], "completed", {})
+    buffer.close()
+
+    assert [[task_id for task_id, _, _ in batch] for batch in written] == [ids]
+    assert buffer.flushed == 3
+    assert [get_task_by_id(db, task_id).status for task_id in ids] == ["completed", "failed", "completed"]
+    assert get_task_by_id(db, ids[0]).lease_owner is None
+
+
+def test_buffer_flushes_in_the_background_after_max_delay(db, session_factory):
+    task_id = create_task(db, user_id="u").id
+    claim_tasks(db, "worker-1", lease_seconds=60)
+    flushed = threading.Event()
+
+    with TaskUpdateBuffer("worker-1", max_delay=0.05, session_factory=session_factory, on_flush=lambda _: flushed.set()) as buffer:
+        buffer.add(task_id, "completed", {})
+        assert flushed.wait(5)
+
+    assert get_task_by_id(db, task_id).status == "completed"
+
+
+def test_buffer_does_not_report_a_failed_write(db, session_factory, monkeypatch):
+    task_id = create_task(db, user_id="u").id
+    claim_tasks(db, "worker-1", lease_seconds=60)
+    written = []
+
+    def fail(*args):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(write_buffer, "finish_tasks", fail)
+    buffer = TaskUpdateBuffer("worker-1", max_delay=60, session_factory=session_factory, on_flush=written.append)
+    buffer.add(task_id, "completed", {})
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    buffer.close()
+
+    assert written == [] and buffer.flushed == 0
+    assert get_task_by_id(db, task_id).status == "processing"
+
+
+def test_buffer_without_worker_writes_plain_status_updates(db, session_factory):
+    task_id = create_task(db, user_id="u").id
+
+    with TaskUpdateBuffer(max_delay=60, session_factory=session_factory) as buffer:
+        buffer.add(task_id, "completed", {"handwriting_analysis": {}})
+
+    assert get_task_by_id(db, task_id).result == {"handwriting_analysis": {}}
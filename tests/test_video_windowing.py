@@ -0,0 +1,91 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.services.video_pipeline import VideoPipeline, padded_window_start
+from app.services.video_processing import build_windows, num_features, time_steps
+
+
+def landmarks(frame):
+    # Deterministic stand-in for FaceMesh: per-channel means of the frame
+    return np.array([*frame.mean(axis=(0, 1)), frame[0, 0, 0]], dtype=np.float32)[:num_features]
+
+
+def score(windows):
+    return windows.mean(axis=(1, 2))
+
+
+def write_video(path, frames):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (32, 32))
+    for i in range(frames):
+        writer.write(np.full((32, 32, 3), (i * 7) % 256, dtype=np.uint8))
+    writer.release()
+
+
+def read_series(path):
+    cap = cv2.VideoCapture(str(path))
+    series = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        series.append(landmarks(frame))
+    cap.release()
+    return np.array(series, dtype=np.float32)
+
+
+@pytest.mark.parametrize("length, stride, pad_last, expected", [
+    (99, 100, False, 0),
+    (99, 100, True, 1),
+    (100, 100, True, 1),
+    (250, 100, False, 2),
+    (250, 100, True, 3),
+    (150, 25, False, 3),
+    (150, 25, True, 3),  # Full windows end on the last frame: nothing to pad
+    (160, 25, True, 4),
+])
+def test_build_windows_count(length, stride, pad_last, expected):
+    series = np.random.default_rng(0).random((length + time_steps, num_features), dtype=np.float32)
+    assert len(build_windows(series, length, stride=stride, pad_last=pad_last)) == expected
+
+
+def test_padded_window_start():
+    assert padded_window_start(0, 100, 25) is None
+    assert padded_window_start(40, 100, 25) == 0
+    assert padded_window_start(150, 100, 25) is None
+    assert padded_window_start(160, 100, 25) == 75
+
+
+def test_padded_window_repeats_last_frame():
+    series = np.arange(160 * num_features, dtype=np.float32).reshape(160, num_features)
+    last = build_windows(series.copy(), 160, stride=25, pad_last=True)[-1]
+    np.testing.assert_array_equal(last[:85], series[75:160])
+    np.testing.assert_array_equal(last[85:], np.repeat(series[-1:], 15, axis=0))
+
+
+@pytest.mark.parametrize("frames, stride, pad_last", [
+    (150, 25, True),
+    (160, 25, True),
+    (250, 100, True),
+    (250, 100, False),
+    (60, 100, True),
+])
+def test_pipeline_scores_the_same_windows_as_vectorized(tmp_path, frames, stride, pad_last):
+    path = tmp_path / "video.avi"
+    write_video(path, frames)
+    series = read_series(path)
+
+    expected = score(build_windows(series.copy(), len(series), stride=stride, pad_last=pad_last))
+    output = VideoPipeline(
+        str(path),
+        create_extractor=lambda: landmarks,
+        score_windows=score,
+        time_steps=time_steps,
+        num_features=num_features,
+        stride=stride,
+        pad_last=pad_last,
+        landmark_workers=2,
+    ).run()
+
+    assert len(output["window_probabilities"]) == len(expected)
+    np.testing.assert_allclose(output["window_probabilities"], expected, rtol=1e-6)